@@ -0,0 +1,114 @@
+"""
+Per-component rows of the complexes, built while COPY streams the complexes TSV.
+
+`complex_members` has one row per complex component with its position in the
+complex, so lookups by UniProt AC or gene symbol are indexed joins instead of
+splitting the `_`-joined `components` strings of every complex. Rows are
+numbered in file order, the `complex_id` of row `i` is `i + 1` as in the
+freshly loaded `complexes` table.
+
+`complexes.component_hash` is `component_hash(components)`, the same for any
+order of the components; `getComplexesByComponentSignature` looks complexes
+up by it.
+"""
+import io
+import time
+import hashlib
+import psycopg2
+from psycopg2 import sql
+
+from row_taps import RowTap
+
+MEMBERS_TABLE = "complex_members"
+MEMBERS_SCHEMA = """
+    complex_id INTEGER NOT NULL,
+    position SMALLINT NOT NULL,
+    uniprot TEXT NOT NULL,
+    genesymbol TEXT,
+    stoichiometry INTEGER
+"""
+NULL = "\\N"  # COPY text format
+MEMBERS_INDEXES = [
+    f"CREATE INDEX IF NOT EXISTS idx_{MEMBERS_TABLE}_complex_id ON {MEMBERS_TABLE} (complex_id);",
+    f"CREATE INDEX IF NOT EXISTS idx_{MEMBERS_TABLE}_uniprot ON {MEMBERS_TABLE} (uniprot);",
+    f"CREATE INDEX IF NOT EXISTS idx_{MEMBERS_TABLE}_genesymbol_upper ON {MEMBERS_TABLE} (UPPER(genesymbol));",
+]
+
+def component_hash(components):
+    """
+    Signed 64-bit hash of a component signature like `P12345_Q67890`, independent of the order.
+    Same as `componentHash` in src/features/complexes-browser/api/queries.ts.
+    """
+    signature = "_".join(sorted(c.strip() for c in components.split("_") if c.strip()))
+    return int.from_bytes(hashlib.md5(signature.encode("utf-8")).digest()[:8], "big", signed=True)
+
+class ComplexMembersBuilder(RowTap):
+    """Collects the components of each complex row and their hashes."""
+
+    def __init__(self, columns):
+        super().__init__(columns)
+        self.components_pos = self.position["components"]
+        self.genesymbols_pos = self.position.get("components_genesymbols")
+        self.stoichiometry_pos = self.position.get("stoichiometry")
+        self.members = io.StringIO()
+        self.hashes = io.StringIO()
+        self.n_complexes = 0
+        self.n_members = 0
+
+    def add_row(self, row):
+        self.n_complexes += 1
+        components = row[self.components_pos]
+        if not components:
+            return
+        uniprots = components.split("_")
+        genesymbols = row[self.genesymbols_pos].split("_") if self.genesymbols_pos is not None else []
+        stoichiometry = row[self.stoichiometry_pos].split(":") if self.stoichiometry_pos is not None else []
+        # Gene symbols and stoichiometry are aligned with the components, when complete
+        if len(genesymbols) != len(uniprots):
+            genesymbols = []
+        if len(stoichiometry) != len(uniprots):
+            stoichiometry = []
+
+        for position, uniprot in enumerate(uniprots):
+            genesymbol = genesymbols[position].strip() if genesymbols else ""
+            count = stoichiometry[position].strip() if stoichiometry else ""
+            self.members.write(
+                f"{self.n_complexes}\t{position}\t{uniprot.strip()}\t"
+                f"{genesymbol or NULL}\t{count if count.isdigit() else NULL}\n"
+            )
+        self.n_members += len(uniprots)
+        self.hashes.write(f"{self.n_complexes}\t{component_hash(components)}\n")
+
+    def store(self, conn, table_name="complexes"):
+        """Recreates the members table and fills `component_hash` of the loaded complexes."""
+        print(f"Writing {self.n_members:,} members of {self.n_complexes:,} complexes into '{MEMBERS_TABLE}'...")
+        start_time = time.time()
+        self.members.seek(0)
+        self.hashes.seek(0)
+
+        with conn.cursor() as cur:
+            try:
+                cur.execute(sql.SQL("DROP TABLE IF EXISTS {} CASCADE;").format(sql.Identifier(MEMBERS_TABLE)))
+                cur.execute(f"CREATE TABLE {MEMBERS_TABLE} ({MEMBERS_SCHEMA})")
+                cur.copy_expert(
+                    f"COPY {MEMBERS_TABLE} (complex_id, position, uniprot, genesymbol, stoichiometry) FROM STDIN",
+                    self.members,
+                )
+                for index_sql in MEMBERS_INDEXES:
+                    cur.execute(index_sql)
+
+                # Tables loaded before the column was added to the schema
+                cur.execute(sql.SQL("ALTER TABLE {} ADD COLUMN IF NOT EXISTS component_hash BIGINT").format(
+                    sql.Identifier(table_name)))
+                cur.execute("CREATE TEMP TABLE complex_hashes (id INTEGER PRIMARY KEY, hash BIGINT) ON COMMIT DROP")
+                cur.copy_expert("COPY complex_hashes (id, hash) FROM STDIN", self.hashes)
+                cur.execute(sql.SQL(
+                    "UPDATE {} c SET component_hash = h.hash FROM complex_hashes h WHERE c.id = h.id"
+                ).format(sql.Identifier(table_name)))
+                conn.commit()
+            except psycopg2.Error as e:
+                print(f"Error writing '{MEMBERS_TABLE}': {e}")
+                conn.rollback()
+                raise
+
+        print(f"Table '{MEMBERS_TABLE}' written in {time.time() - start_time:.2f} seconds")
@@ -0,0 +1,255 @@
+"""
+Per-substrate sorted arrays of the enzyme-substrate modification sites.
+
+The webservice loader feeds `SiteIndexBuilder` with the enz_sub TSV while COPY
+streams it into Postgres, and saves the arrays as .npy files:
+
+    substrates.npy     sorted substrate identifiers
+    genesymbols.npy    gene symbol of each substrate, '' if unknown
+    offsets.npy        int64, substrate i's sites are offsets[i]:offsets[i + 1]
+    site_offset.npy    int32, residue offset, sorted within each substrate (-1 if unknown)
+    site_residue.npy   uint8, ASCII code of the residue type (0 if unknown)
+    site_modification.npy  int16, index into modifications.npy
+    site_enzyme.npy    int32, index into enzymes.npy
+    site_row.npy       int32, enz_sub row, `id = row + 1` in the freshly loaded table
+    modifications.npy, enzymes.npy, enzyme_genesymbols.npy
+
+`SiteIndex` memory-maps the files: a substrate is found by binary search and
+the sites within a residue window by another one on its slice.
+"""
+import os
+import json
+import time
+from array import array
+
+import numpy as np
+
+from row_taps import RowTap
+
+class SiteIndexBuilder(RowTap):
+    """Collects the sites from chunks of TSV text and builds the sorted arrays."""
+
+    def __init__(self, columns, directory=None, meta=None):
+        super().__init__(columns)
+        position = self.position
+        self.directory = directory
+        self.meta = meta
+        self.enzyme_pos = position["enzyme"]
+        self.enzyme_symbol_pos = position.get("enzyme_genesymbol")
+        self.substrate_pos = position["substrate"]
+        self.substrate_symbol_pos = position.get("substrate_genesymbol")
+        self.residue_pos = position.get("residue_type")
+        self.offset_pos = position.get("residue_offset")
+        self.modification_pos = position.get("modification")
+        self.substrate_index = {}
+        self.substrate_symbols = []
+        self.enzyme_index = {}
+        self.enzyme_symbols = []
+        self.modification_index = {}
+        self.substrate = array('i')
+        self.enzyme = array('i')
+        self.offset = array('i')
+        self.residue = array('B')
+        self.modification = array('h')
+
+    @staticmethod
+    def _intern(index, symbols, identifier, genesymbol):
+        i = index.get(identifier)
+        if i is None:
+            i = index[identifier] = len(symbols)
+            symbols.append(genesymbol or "")
+        elif genesymbol and not symbols[i]:
+            symbols[i] = genesymbol
+        return i
+
+    def _value(self, row, pos):
+        return row[pos] if pos is not None else ""
+
+    def add_row(self, row):
+        self.substrate.append(self._intern(
+            self.substrate_index, self.substrate_symbols,
+            row[self.substrate_pos], self._value(row, self.substrate_symbol_pos),
+        ))
+        self.enzyme.append(self._intern(
+            self.enzyme_index, self.enzyme_symbols,
+            row[self.enzyme_pos], self._value(row, self.enzyme_symbol_pos),
+        ))
+        offset = self._value(row, self.offset_pos)
+        self.offset.append(int(offset) if offset.isdigit() else -1)
+        residue = self._value(row, self.residue_pos)
+        self.residue.append(ord(residue[0].upper()) if residue else 0)
+        modification = self._value(row, self.modification_pos)
+        self.modification.append(self.modification_index.setdefault(modification, len(self.modification_index)))
+
+    def build(self):
+        """Returns the arrays as a dict of name -> ndarray."""
+        substrates = np.array(list(self.substrate_index), dtype=str) if self.substrate_index else np.array([], dtype="<U1")
+        # Substrates in sorted order for binary search, sites by offset within each
+        rank = np.empty(len(substrates), dtype=np.int32)
+        rank[np.argsort(substrates, kind="stable")] = np.arange(len(substrates), dtype=np.int32)
+        substrate = rank[np.frombuffer(self.substrate, dtype=np.int32)]
+        offset = np.frombuffer(self.offset, dtype=np.int32)
+        residue = np.frombuffer(self.residue, dtype=np.uint8)
+        order = np.lexsort((residue, offset, substrate))
+        counts = np.bincount(substrate, minlength=len(substrates))
+        offsets = np.zeros(len(substrates) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        sorted_substrates = np.sort(substrates)
+        genesymbols = np.array(self.substrate_symbols, dtype=str) if self.substrate_symbols else np.array([], dtype="<U1")
+        return {
+            "substrates": sorted_substrates,
+            "genesymbols": genesymbols[np.argsort(substrates, kind="stable")],
+            "offsets": offsets,
+            "site_offset": offset[order].copy(),
+            "site_residue": residue[order].copy(),
+            "site_modification": np.frombuffer(self.modification, dtype=np.int16)[order].copy(),
+            "site_enzyme": np.frombuffer(self.enzyme, dtype=np.int32)[order].copy(),
+            "site_row": order.astype(np.int32),
+            "modifications": np.array(list(self.modification_index) or [""], dtype=str),
+            "enzymes": np.array(list(self.enzyme_index) or [""], dtype=str),
+            "enzyme_genesymbols": np.array(self.enzyme_symbols or [""], dtype=str),
+        }
+
+    def store(self, conn):
+        self.save(self.directory, self.meta)
+
+    def save(self, directory, meta=None):
+        """Writes the .npy files and meta.json into `directory`."""
+        start_time = time.time()
+        os.makedirs(directory, exist_ok=True)
+        arrays = self.build()
+        for name, values in arrays.items():
+            np.save(os.path.join(directory, f"{name}.npy"), values)
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "substrates": len(arrays["substrates"]),
+                "sites": len(arrays["site_row"]),
+                **(meta or {}),
+            }, f, indent=2)
+        print(f"Saved {len(arrays['site_row']):,} sites of {len(arrays['substrates']):,} substrates "
+              f"to '{directory}' in {time.time() - start_time:.2f} seconds")
+
+class SiteIndex:
+    """Memory-mapped site arrays with substrate, residue window and modification queries."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        load = lambda name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+        self.offsets = load("offsets")
+        self.site_offset = load("site_offset")
+        self.site_residue = load("site_residue")
+        self.site_modification = load("site_modification")
+        self.site_enzyme = load("site_enzyme")
+        self.site_row = load("site_row")
+        self.substrates = np.load(os.path.join(directory, "substrates.npy"))
+        self.genesymbols = np.load(os.path.join(directory, "genesymbols.npy"))
+        self.modifications = np.load(os.path.join(directory, "modifications.npy"))
+        self.enzymes = np.load(os.path.join(directory, "enzymes.npy"))
+        self.enzyme_genesymbols = np.load(os.path.join(directory, "enzyme_genesymbols.npy"))
+        self.modification_index = {m: i for i, m in enumerate(self.modifications.tolist())}
+        self.symbol_index = {}
+        for i, symbol in enumerate(self.genesymbols.tolist()):
+            if symbol:
+                self.symbol_index.setdefault(symbol.upper(), []).append(i)
+
+    def lookup(self, identifier):
+        """Substrate indices of an identifier or gene symbol (case-insensitive)."""
+        i = int(np.searchsorted(self.substrates, identifier))
+        found = [i] if i < len(self.substrates) and self.substrates[i] == identifier else []
+        return found + [j for j in self.symbol_index.get(identifier.upper(), ()) if j not in found]
+
+    def sites(self, substrate, start=None, end=None, residue=None, modification=None):
+        """
+        Site positions of a substrate, ordered by residue offset.
+
+        Args:
+            start, end: Inclusive residue offset window; sites without offset are
+                only returned without a window.
+            residue: Residue type, e.g. "S", or several like "STY".
+            modification: e.g. "phosphorylation".
+        """
+        positions = []
+        for i in self.lookup(substrate):
+            lo, hi = int(self.offsets[i]), int(self.offsets[i + 1])
+            offsets = self.site_offset[lo:hi]
+            if start is not None or end is not None:
+                lo, hi = (
+                    lo + int(np.searchsorted(offsets, max(start or 0, 0), side="left")),
+                    lo + int(np.searchsorted(offsets, end if end is not None else np.iinfo(np.int32).max, side="right")),
+                )
+            positions.append(np.arange(lo, hi, dtype=np.int64))
+        positions = np.concatenate(positions) if positions else np.array([], dtype=np.int64)
+        if residue:
+            positions = positions[np.isin(self.site_residue[positions], [ord(r) for r in residue.upper()])]
+        if modification:
+            code = self.modification_index.get(modification, -1)
+            positions = positions[self.site_modification[positions] == code]
+        return positions
+
+    def enzymes_at(self, substrate, residue, offset, modification=None):
+        """Enzyme identifiers modifying a substrate at one residue, e.g. ("P04637", "S", 15)."""
+        positions = self.sites(substrate, offset, offset, residue, modification)
+        return sorted({str(self.enzymes[e]) for e in np.asarray(self.site_enzyme[positions]).tolist()})
+
+    def row_ids(self, positions):
+        """`enz_sub.id` of site positions."""
+        return np.asarray(self.site_row[positions], dtype=np.int64) + 1
+
+    def describe(self, positions):
+        """Sites as dicts with the enzyme, residue and modification."""
+        result = []
+        for position in np.asarray(positions).tolist():
+            enzyme = int(self.site_enzyme[position])
+            residue = int(self.site_residue[position])
+            offset = int(self.site_offset[position])
+            result.append({
+                "id": int(self.site_row[position]) + 1,
+                "enzyme": str(self.enzymes[enzyme]),
+                "enzyme_genesymbol": str(self.enzyme_genesymbols[enzyme]) or None,
+                "residue_type": chr(residue) if residue else None,
+                "residue_offset": offset if offset >= 0 else None,
+                "modification": str(self.modifications[int(self.site_modification[position])]) or None,
+            })
+        return result
+
+def main():
+    """Builds the site arrays from a TSV, or queries built ones."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Per-substrate sorted enzyme-substrate sites")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Build the arrays from an enz_sub TSV")
+    build.add_argument("tsv")
+    build.add_argument("directory")
+    query = subparsers.add_parser("sites", help="Sites of a substrate")
+    query.add_argument("directory")
+    query.add_argument("substrate")
+    query.add_argument("--start", type=int)
+    query.add_argument("--end", type=int)
+    query.add_argument("--residue")
+    query.add_argument("--modification")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        with open(args.tsv, "r", encoding="utf-8") as f:
+            builder = SiteIndexBuilder(f.readline().rstrip("\n").split("\t"))
+            while True:
+                chunk = f.read(1 << 20)
+                if not chunk:
+                    break
+                builder.feed(chunk)
+        builder.finish()
+        builder.save(args.directory, {"source_file": os.path.basename(args.tsv)})
+    else:
+        index = SiteIndex(args.directory)
+        start_time = time.perf_counter()
+        positions = index.sites(args.substrate, args.start, args.end, args.residue, args.modification)
+        elapsed = time.perf_counter() - start_time
+        for site in index.describe(positions):
+            print(f"{site['enzyme_genesymbol'] or site['enzyme']}\t{site['residue_type']}{site['residue_offset']}\t"
+                  f"{site['modification']}\t{site['id']}")
+        print(f"{len(positions)} sites in {elapsed * 1000:.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+Multi-hop neighbourhoods and shortest paths over the interactions network.
+
+Works on the CSR arrays written by the webservice loader (see
+interaction_graph.py). Expansion is level-synchronous: each BFS level gathers
+the adjacency of the whole frontier with array operations, so a k-hop query
+costs k vectorized steps. Each query stops when its latency budget runs out
+and reports `truncated`.
+
+As a library:
+
+    engine = GraphEngine("omnipath_latest_build/interactions_csr")
+    engine.k_hop(["EGFR"], k=2, datasets=["omnipath"])
+    engine.shortest_paths("MAPK1", "MYC", sign="positive", directed=True)
+
+As a local HTTP endpoint:
+
+    python graph_engine.py serve --port 8765
+    curl 'localhost:8765/khop?ids=EGFR,TP53&k=2&datasets=omnipath'
+    curl 'localhost:8765/paths?source=MAPK1&target=MYC&sign=positive'
+"""
+import os
+import json
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+
+from interaction_graph import InteractionGraph, FLAG_COLUMNS, dataset_mask
+
+GRAPH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "omnipath_latest_build", "interactions_csr")
+DEFAULT_BUDGET_MS = {"khop": 50, "paths": 200}  # Per-query latency budgets of the HTTP endpoint
+MAX_BUDGET_MS = 2000  # Upper bound of the budget a request can ask for
+MAX_NODES = 5000  # Default cap of the nodes returned by k-hop queries
+MAX_PATHS = 10  # Default number of shortest paths returned
+DIRECTIONS = ("both", "out", "in")  # Edge directions followed by k-hop queries
+
+DIRECTED_BIT = 1 << FLAG_COLUMNS.index("is_directed")
+STIMULATION_BIT = 1 << FLAG_COLUMNS.index("is_stimulation")
+INHIBITION_BIT = 1 << FLAG_COLUMNS.index("is_inhibition")
+
+class GraphEngine(InteractionGraph):
+    """k-hop expansion and directed, sign-aware shortest paths on the CSR graph."""
+
+    def _expand(self, nodes, datasets=None, direction="both"):
+        """
+        Adjacency entries of `nodes` passing the filters.
+
+        Returns:
+            (owner, neighbor, edge) arrays, `owner` indexing into `nodes`.
+        """
+        positions = self._adjacency(nodes)
+        lengths = np.asarray(self.offsets[nodes + 1]) - np.asarray(self.offsets[nodes])
+        owner = np.repeat(np.arange(len(nodes)), lengths)
+        edges = np.asarray(self.adj_edges[positions])
+        keep = np.ones(len(positions), dtype=bool)
+        if direction != "both":
+            outgoing = np.asarray(self.outgoing[positions])
+            directed = (np.asarray(self.flags[edges]) & DIRECTED_BIT) != 0
+            keep &= directed & (outgoing if direction == "out" else ~outgoing)
+        if datasets:
+            keep &= (np.asarray(self.datasets[edges]) & dataset_mask(datasets)) != 0
+        return owner[keep], np.asarray(self.neighbors[positions[keep]]), edges[keep]
+
+    def k_hop(self, identifiers, k=2, datasets=None, direction="both", max_nodes=MAX_NODES, budget_ms=None):
+        """
+        Nodes within `k` hops of the seeds, with their distance and the edges traversed.
+
+        Args:
+            identifiers: Seed accessions or gene symbols.
+            datasets: Follow only edges in any of these datasets.
+            direction: "out" follows directed edges downstream, "in" upstream,
+                "both" any edge regardless of direction.
+            max_nodes: Stop expanding once this many nodes are reached.
+            budget_ms: Latency budget, the expansion stops at the level exceeding it.
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unknown direction '{direction}', expected one of {', '.join(DIRECTIONS)}")
+        start_time = time.perf_counter()
+        deadline = start_time + budget_ms / 1000 if budget_ms else None
+        hops = np.full(self.n_nodes, -1, dtype=np.int16)
+        frontier = self.lookup(identifiers)
+        hops[frontier] = 0
+        reached = [frontier]
+        edges = []
+        truncated = False
+
+        for level in range(1, k + 1):
+            if not len(frontier):
+                break
+            if deadline and time.perf_counter() > deadline:
+                truncated = True
+                break
+            _, neighbors, level_edges = self._expand(frontier, datasets, direction)
+            edges.append(level_edges)
+            new = np.unique(neighbors[hops[neighbors] < 0])
+            if sum(len(r) for r in reached) + len(new) > max_nodes:
+                new = new[:max(0, max_nodes - sum(len(r) for r in reached))]
+                truncated = True
+            hops[new] = level
+            reached.append(new)
+            frontier = new
+            if truncated:
+                break
+
+        nodes = np.concatenate(reached)
+        edges = np.unique(np.concatenate(edges)) if edges else np.array([], dtype=np.int64)
+        # Only edges between returned nodes
+        member = hops >= 0
+        edges = edges[member[self.edge_source[edges]] & member[self.edge_target[edges]]]
+        return {
+            "nodes": [
+                {"id": str(self.nodes[n]), "genesymbol": str(self.genesymbols[n]) or None, "hops": int(hops[n])}
+                for n in nodes.tolist()
+            ],
+            "edges": self.edge_ids(edges).tolist(),
+            "truncated": truncated,
+            "elapsed_ms": (time.perf_counter() - start_time) * 1000,
+        }
+
+    def shortest_paths(self, source, target, datasets=None, directed=True, sign=None,
+                       max_length=6, max_paths=MAX_PATHS, budget_ms=None):
+        """
+        Shortest paths from `source` to `target`.
+
+        Args:
+            source, target: Accessions or gene symbols.
+            datasets: Use only edges in any of these datasets.
+            directed: Follow directed edges from source to target, or any edge both ways.
+            sign: None, or "positive"/"negative" for paths whose product of edge signs
+                (stimulation +, inhibition -) is that; unsigned edges are skipped then.
+            max_length: Longest path searched.
+            max_paths: Number of equally short paths returned.
+            budget_ms: Latency budget, the search stops at the level exceeding it.
+        """
+        start_time = time.perf_counter()
+        deadline = start_time + budget_ms / 1000 if budget_ms else None
+        sources = self.lookup([source])
+        targets = self.lookup([target])
+        # States are node * 2 + parity, parity 1 after an odd number of inhibitions
+        target_parity = {None: (0, 1), "positive": (0,), "negative": (1,)}[sign]
+        target_states = np.concatenate([targets * 2 + p for p in target_parity])
+        visited = np.zeros(self.n_nodes * 2, dtype=bool)
+        frontier = np.unique(sources * 2)
+        visited[frontier] = True
+        levels = []  # Per level: (from_state, to_state, edge, edge sign) arrays
+        found = np.intersect1d(frontier, target_states)
+        truncated = False
+
+        for _ in range(max_length):
+            if len(found) or not len(frontier) or not len(targets):
+                break
+            if deadline and time.perf_counter() > deadline:
+                truncated = True
+                break
+            owner, neighbors, edges = self._expand(frontier // 2, datasets, "out" if directed else "both")
+            from_states = frontier[owner]
+            parity = from_states % 2
+            if sign:
+                flags = np.asarray(self.flags[edges])
+                stimulation = (flags & STIMULATION_BIT) != 0
+                inhibition = (flags & INHIBITION_BIT) != 0
+                # Edges both stimulating and inhibiting can be used with either sign
+                from_states = np.concatenate([from_states[stimulation], from_states[inhibition]])
+                to_states = np.concatenate([
+                    neighbors[stimulation] * 2 + parity[stimulation],
+                    neighbors[inhibition] * 2 + (1 - parity[inhibition]),
+                ])
+                edge_signs = np.concatenate([
+                    np.ones(stimulation.sum(), dtype=np.int8),
+                    -np.ones(inhibition.sum(), dtype=np.int8),
+                ])
+                edges = np.concatenate([edges[stimulation], edges[inhibition]])
+            else:
+                to_states = neighbors * 2
+                edge_signs = np.zeros(len(edges), dtype=np.int8)
+            new = ~visited[to_states]
+            levels.append((from_states[new], to_states[new], edges[new], edge_signs[new]))
+            frontier = np.unique(to_states[new])
+            visited[frontier] = True
+            found = np.intersect1d(frontier, target_states)
+
+        paths = self._backtrack(levels, found, max_paths) if len(found) else []
+        return {
+            "paths": paths,
+            "length": len(levels) if len(found) else None,
+            "truncated": truncated,
+            "elapsed_ms": (time.perf_counter() - start_time) * 1000,
+        }
+
+    def _backtrack(self, levels, found, max_paths):
+        """Enumerates up to `max_paths` paths ending in the `found` states of the last level."""
+        paths = []
+
+        def walk(level, state, steps):
+            if len(paths) >= max_paths:
+                return
+            if level < 0:
+                paths.append(self._format_path(state // 2, list(reversed(steps))))
+                return
+            from_states, to_states, edges, signs = levels[level]
+            for i in np.nonzero(to_states == state)[0].tolist():
+                walk(level - 1, int(from_states[i]), steps + [(int(edges[i]), int(signs[i]))])
+
+        for state in found.tolist():
+            walk(len(levels) - 1, state, [])
+        return paths
+
+    def _format_path(self, start, steps):
+        nodes = [start]
+        result = []
+        for edge, edge_sign in steps:
+            source, target = int(self.edge_source[edge]), int(self.edge_target[edge])
+            # Undirected traversal may walk an edge from target to source
+            nxt = target if source == nodes[-1] else source
+            nodes.append(nxt)
+            result.append({"id": edge + 1, "source": str(self.nodes[source]), "target": str(self.nodes[target]),
+                           "sign": {1: "+", -1: "-"}.get(edge_sign)})
+        return {
+            "nodes": [str(self.nodes[n]) for n in nodes],
+            "genesymbols": [str(self.genesymbols[n]) or None for n in nodes],
+            "edges": result,
+        }
+
+class GraphRequestHandler(BaseHTTPRequestHandler):
+    """JSON endpoints /khop, /paths and /health over a shared `GraphEngine`."""
+
+    engine = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            if url.path == "/health":
+                body = {"nodes": self.engine.n_nodes, "edges": len(self.engine.edge_source)}
+            elif url.path == "/khop":
+                body = self.engine.k_hop(
+                    split_list(params.get("ids")),
+                    k=int(params.get("k", 2)),
+                    datasets=split_list(params.get("datasets")),
+                    direction=params.get("direction", "both"),
+                    max_nodes=int(params.get("max_nodes", MAX_NODES)),
+                    budget_ms=budget(params, "khop"),
+                )
+            elif url.path == "/paths":
+                body = self.engine.shortest_paths(
+                    params["source"],
+                    params["target"],
+                    datasets=split_list(params.get("datasets")),
+                    directed=params.get("directed", "1") not in ("0", "false"),
+                    sign=params.get("sign") or None,
+                    max_length=int(params.get("max_length", 6)),
+                    max_paths=int(params.get("max_paths", MAX_PATHS)),
+                    budget_ms=budget(params, "paths"),
+                )
+            else:
+                self.send_json(404, {"error": f"Unknown endpoint: {url.path}"})
+                return
+        except (KeyError, ValueError) as e:
+            self.send_json(400, {"error": f"Invalid request: {e}"})
+            return
+        self.send_json(200, body)
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def split_list(value):
+    return [v for v in value.split(",") if v] if value else []
+
+def budget(params, endpoint):
+    """Requested budget in ms, capped at MAX_BUDGET_MS."""
+    return min(float(params.get("budget_ms", DEFAULT_BUDGET_MS[endpoint])), MAX_BUDGET_MS)
+
+def serve(directory=GRAPH_DIR, host="127.0.0.1", port=8765):
+    GraphRequestHandler.engine = GraphEngine(directory)
+    server = ThreadingHTTPServer((host, port), GraphRequestHandler)
+    print(f"Serving the graph in '{directory}' on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+    finally:
+        server.server_close()
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Multi-hop and shortest path queries over the interactions network")
+    parser.add_argument("--directory", default=GRAPH_DIR, help="Directory of the CSR arrays")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    server = subparsers.add_parser("serve", help="Run the local HTTP endpoint")
+    server.add_argument("--host", default="127.0.0.1")
+    server.add_argument("--port", type=int, default=8765)
+    khop = subparsers.add_parser("khop", help="Neighbourhood within k hops")
+    khop.add_argument("identifiers", nargs="+")
+    khop.add_argument("-k", type=int, default=2)
+    khop.add_argument("--datasets", nargs="+")
+    khop.add_argument("--direction", choices=DIRECTIONS, default="both")
+    paths = subparsers.add_parser("paths", help="Shortest paths between two proteins")
+    paths.add_argument("source")
+    paths.add_argument("target")
+    paths.add_argument("--datasets", nargs="+")
+    paths.add_argument("--undirected", action="store_true")
+    paths.add_argument("--sign", choices=["positive", "negative"])
+    paths.add_argument("--max-length", type=int, default=6)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.directory, args.host, args.port)
+        return
+
+    engine = GraphEngine(args.directory)
+    if args.command == "khop":
+        result = engine.k_hop(args.identifiers, args.k, args.datasets, args.direction)
+        print(f"{len(result['nodes'])} nodes, {len(result['edges'])} edges")
+    else:
+        result = engine.shortest_paths(args.source, args.target, args.datasets, not args.undirected,
+                                       args.sign, args.max_length)
+        for path in result["paths"]:
+            print(" -> ".join(g or n for n, g in zip(path["nodes"], path["genesymbols"])))
+    print(f"{result['elapsed_ms']:.2f} ms{' (truncated)' if result['truncated'] else ''}")
+
+if __name__ == "__main__":
+    main()
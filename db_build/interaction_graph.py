@@ -0,0 +1,302 @@
+"""
+Compressed sparse row (CSR) adjacency of the interactions network.
+
+The webservice loader feeds `CSRBuilder` with the interactions TSV while COPY
+streams it into Postgres, and saves the arrays as .npy files:
+
+    nodes.npy         node identifiers (UniProt AC, complex, miRNA, ...)
+    genesymbols.npy   gene symbol of each node, '' if unknown
+    offsets.npy       int64, node i's adjacency is offsets[i]:offsets[i + 1]
+    neighbors.npy     int32, the other end of each adjacency entry
+    adj_edges.npy     int32, edge index of each adjacency entry
+    outgoing.npy      bool, whether the node is the source of that edge
+    edge_source.npy   int32, source node of each edge
+    edge_target.npy   int32, target node of each edge
+    flags.npy         uint8, direction and sign bits, see FLAG_COLUMNS
+    datasets.npy      uint32, dataset bits, see DATASET_COLUMNS
+
+Edges are numbered in file order, edge `i` is the row with `id = i + 1` in the
+freshly loaded `interactions` table. `InteractionGraph` memory-maps the files
+and answers neighbour and induced subgraph queries with array slices.
+"""
+import os
+import json
+import time
+from array import array
+
+import numpy as np
+
+from row_taps import RowTap, TRUE_VALUES
+
+# Bit i of flags.npy
+FLAG_COLUMNS = [
+    "is_directed",
+    "is_stimulation",
+    "is_inhibition",
+    "consensus_direction",
+    "consensus_stimulation",
+    "consensus_inhibition",
+]
+# Bit i of datasets.npy
+DATASET_COLUMNS = [
+    "omnipath",
+    "kinaseextra",
+    "ligrecextra",
+    "pathwayextra",
+    "mirnatarget",
+    "dorothea",
+    "collectri",
+    "tf_target",
+    "lncrna_mrna",
+    "tf_mirna",
+    "small_molecule",
+    "dorothea_curated",
+    "dorothea_chipseq",
+    "dorothea_tfbs",
+    "dorothea_coexp",
+]
+
+def flag_mask(columns):
+    """Bit mask of flag columns."""
+    return sum(1 << FLAG_COLUMNS.index(column) for column in columns)
+
+def dataset_mask(datasets):
+    """Bit mask of dataset columns, e.g. ["omnipath", "kinaseextra"]."""
+    return sum(1 << DATASET_COLUMNS.index(dataset) for dataset in datasets)
+
+class CSRBuilder(RowTap):
+    """Collects the edges from chunks of TSV text and builds the CSR arrays."""
+
+    def __init__(self, columns, directory=None, meta=None):
+        super().__init__(columns)
+        position = self.position
+        self.directory = directory
+        self.meta = meta
+        self.source_pos = position["source"]
+        self.target_pos = position["target"]
+        self.source_symbol_pos = position.get("source_genesymbol")
+        self.target_symbol_pos = position.get("target_genesymbol")
+        self.flag_pos = [(1 << bit, position[c]) for bit, c in enumerate(FLAG_COLUMNS) if c in position]
+        self.dataset_pos = [(1 << bit, position[c]) for bit, c in enumerate(DATASET_COLUMNS) if c in position]
+        self.node_index = {}
+        self.genesymbols = []
+        self.edge_source = array('i')
+        self.edge_target = array('i')
+        self.flags = array('B')
+        self.datasets = array('I')
+
+    def _node(self, identifier, genesymbol):
+        index = self.node_index.get(identifier)
+        if index is None:
+            index = self.node_index[identifier] = len(self.genesymbols)
+            self.genesymbols.append(genesymbol or "")
+        elif genesymbol and not self.genesymbols[index]:
+            self.genesymbols[index] = genesymbol
+        return index
+
+    def add_row(self, row):
+        self.edge_source.append(self._node(
+            row[self.source_pos],
+            row[self.source_symbol_pos] if self.source_symbol_pos is not None else "",
+        ))
+        self.edge_target.append(self._node(
+            row[self.target_pos],
+            row[self.target_symbol_pos] if self.target_symbol_pos is not None else "",
+        ))
+        self.flags.append(sum(bit for bit, pos in self.flag_pos if row[pos].lower() in TRUE_VALUES))
+        self.datasets.append(sum(bit for bit, pos in self.dataset_pos if row[pos].lower() in TRUE_VALUES))
+
+    def build(self):
+        """Returns the arrays as a dict of name -> ndarray."""
+        n_nodes = len(self.genesymbols)
+        edge_source = np.frombuffer(self.edge_source, dtype=np.int32).copy()
+        edge_target = np.frombuffer(self.edge_target, dtype=np.int32).copy()
+        edge_ids = np.arange(len(edge_source), dtype=np.int32)
+
+        # Every edge appears in the adjacency of both of its ends
+        heads = np.concatenate([edge_source, edge_target])
+        order = np.argsort(heads, kind="stable")
+        offsets = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(heads, minlength=n_nodes), out=offsets[1:])
+
+        nodes = list(self.node_index)
+        return {
+            "nodes": np.array(nodes, dtype=str) if nodes else np.array([], dtype="<U1"),
+            "genesymbols": np.array(self.genesymbols, dtype=str) if nodes else np.array([], dtype="<U1"),
+            "offsets": offsets,
+            "neighbors": np.concatenate([edge_target, edge_source])[order],
+            "adj_edges": np.concatenate([edge_ids, edge_ids])[order],
+            "outgoing": np.concatenate([
+                np.ones(len(edge_ids), dtype=bool),
+                np.zeros(len(edge_ids), dtype=bool),
+            ])[order],
+            "edge_source": edge_source,
+            "edge_target": edge_target,
+            "flags": np.frombuffer(self.flags, dtype=np.uint8).copy(),
+            "datasets": np.frombuffer(self.datasets, dtype=np.uint32).copy(),
+        }
+
+    def store(self, conn):
+        self.save(self.directory, self.meta)
+
+    def save(self, directory, meta=None):
+        """Writes the .npy files and meta.json into `directory`."""
+        start_time = time.time()
+        os.makedirs(directory, exist_ok=True)
+        arrays = self.build()
+        for name, values in arrays.items():
+            np.save(os.path.join(directory, f"{name}.npy"), values)
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "nodes": len(arrays["nodes"]),
+                "edges": len(arrays["edge_source"]),
+                "flag_columns": FLAG_COLUMNS,
+                "dataset_columns": DATASET_COLUMNS,
+                **(meta or {}),
+            }, f, indent=2)
+        print(f"Saved CSR graph with {len(arrays['nodes']):,} nodes and {len(arrays['edge_source']):,} edges "
+              f"to '{directory}' in {time.time() - start_time:.2f} seconds")
+
+class InteractionGraph:
+    """Memory-mapped CSR graph with neighbour and induced subgraph queries."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        load = lambda name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+        self.offsets = load("offsets")
+        self.neighbors = load("neighbors")
+        self.adj_edges = load("adj_edges")
+        self.outgoing = load("outgoing")
+        self.edge_source = load("edge_source")
+        self.edge_target = load("edge_target")
+        self.flags = load("flags")
+        self.datasets = load("datasets")
+        self.nodes = np.load(os.path.join(directory, "nodes.npy"))
+        self.genesymbols = np.load(os.path.join(directory, "genesymbols.npy"))
+        self.node_index = {node: i for i, node in enumerate(self.nodes.tolist())}
+        self.symbol_index = {}
+        for i, symbol in enumerate(self.genesymbols.tolist()):
+            if symbol:
+                self.symbol_index.setdefault(symbol.upper(), []).append(i)
+
+    @property
+    def n_nodes(self):
+        return len(self.nodes)
+
+    def lookup(self, identifiers):
+        """Node indices of identifiers or gene symbols (case-insensitive), unknown ones are skipped."""
+        found = set()
+        for identifier in identifiers:
+            index = self.node_index.get(identifier)
+            if index is not None:
+                found.add(index)
+            found.update(self.symbol_index.get(identifier.upper(), ()))
+        return np.array(sorted(found), dtype=np.int64)
+
+    def _adjacency(self, nodes):
+        """Adjacency entry positions of `nodes`, as one index array."""
+        starts = np.asarray(self.offsets[nodes])
+        lengths = np.asarray(self.offsets[nodes + 1]) - starts
+        total = int(lengths.sum())
+        # Each node's run of positions: its start plus 0, 1, ... within the run
+        run_starts = np.cumsum(lengths) - lengths
+        return np.repeat(starts - run_starts, lengths) + np.arange(total, dtype=np.int64)
+
+    def _edge_filter(self, edges, datasets=None, flags=None):
+        keep = np.ones(len(edges), dtype=bool)
+        if datasets:
+            keep &= (self.datasets[edges] & dataset_mask(datasets)) != 0
+        if flags:
+            mask = flag_mask(flags)
+            keep &= (self.flags[edges] & mask) == mask
+        return keep
+
+    def neighbors_of(self, identifiers, datasets=None, flags=None, direction="both"):
+        """
+        Edges incident to the given proteins, like `searchProteinNeighbors`.
+
+        Args:
+            datasets: Keep edges in any of these datasets, e.g. ["omnipath"].
+            flags: Keep edges with all of these flags, e.g. ["is_directed"].
+            direction: "out" (queried node is the source), "in" or "both".
+
+        Returns:
+            Sorted unique edge indices; `edge_ids()` turns them into `interactions.id`.
+        """
+        positions = self._adjacency(self.lookup(identifiers))
+        if direction == "out":
+            positions = positions[self.outgoing[positions]]
+        elif direction == "in":
+            positions = positions[~self.outgoing[positions]]
+        edges = np.unique(self.adj_edges[positions])
+        return edges[self._edge_filter(edges, datasets, flags)]
+
+    def induced_subgraph(self, identifiers, datasets=None, flags=None, limit=None):
+        """Edges with both ends among the given proteins, like `getInteractionsAmongProteins`."""
+        nodes = self.lookup(identifiers)
+        member = np.zeros(self.n_nodes, dtype=bool)
+        member[nodes] = True
+        positions = self._adjacency(nodes)
+        # Outgoing entries only, so each edge is seen once
+        positions = positions[self.outgoing[positions] & member[self.neighbors[positions]]]
+        edges = np.sort(self.adj_edges[positions])
+        edges = edges[self._edge_filter(edges, datasets, flags)]
+        return edges[:limit] if limit is not None else edges
+
+    def edge_ids(self, edges):
+        """`interactions.id` of edge indices."""
+        return np.asarray(edges, dtype=np.int64) + 1
+
+    def describe(self, edges):
+        """Edges as dicts with the node identifiers and decoded flags."""
+        result = []
+        for edge in np.asarray(edges).tolist():
+            source, target = int(self.edge_source[edge]), int(self.edge_target[edge])
+            flags, datasets = int(self.flags[edge]), int(self.datasets[edge])
+            result.append({
+                "id": edge + 1,
+                "source": str(self.nodes[source]),
+                "target": str(self.nodes[target]),
+                "source_genesymbol": str(self.genesymbols[source]) or None,
+                "target_genesymbol": str(self.genesymbols[target]) or None,
+                **{column: bool(flags >> bit & 1) for bit, column in enumerate(FLAG_COLUMNS)},
+                "datasets": [column for bit, column in enumerate(DATASET_COLUMNS) if datasets >> bit & 1],
+            })
+        return result
+
+def main():
+    """Builds the graph from a TSV, or queries a built graph."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="CSR adjacency of the interactions network")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Build the arrays from an interactions TSV")
+    build.add_argument("tsv")
+    build.add_argument("directory")
+    query = subparsers.add_parser("neighbors", help="Neighbour edges of proteins")
+    query.add_argument("directory")
+    query.add_argument("identifiers", nargs="+")
+    query.add_argument("--datasets", nargs="+")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        with open(args.tsv, "r", encoding="utf-8") as f:
+            builder = CSRBuilder(f.readline().rstrip("\n").split("\t"))
+            while True:
+                chunk = f.read(1 << 20)
+                if not chunk:
+                    break
+                builder.feed(chunk)
+        builder.finish()
+        builder.save(args.directory, {"source_file": os.path.basename(args.tsv)})
+    else:
+        graph = InteractionGraph(args.directory)
+        start_time = time.perf_counter()
+        edges = graph.neighbors_of(args.identifiers, datasets=args.datasets)
+        elapsed = time.perf_counter() - start_time
+        for edge in graph.describe(edges[:20]):
+            print(edge)
+        print(f"{len(edges)} edges in {elapsed * 1e6:.0f} µs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Ligand-receptor pairs of the cell-cell communication network.
+
+Materializes the join of `interactions` with the transmitter and receiver rows
+of `intercell` into one indexed table: a post-translational interaction is a
+pair if its source is a transmitter and its target a receiver. Transcriptional,
+post-transcriptional and miRNA edges are not ligand-receptor binding and are
+left out. Undirected interactions are used in both orientations. Each pair carries the intercell categories and highest
+consensus scores of both ends, and the sources and signs of the interaction.
+The table can be exported to Parquet (needs pyarrow).
+"""
+import os
+import sys
+import time
+import psycopg2
+from psycopg2 import sql
+
+PAIRS_TABLE = "ligand_receptor_pairs"
+PAIRS_PARQUET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "omnipath_latest_build", f"{PAIRS_TABLE}.parquet")
+
+PAIRS_QUERY = f"""
+    CREATE TABLE {PAIRS_TABLE} AS
+    WITH transmitters AS (
+        SELECT uniprot,
+               array_agg(DISTINCT category ORDER BY category) AS categories,
+               max(consensus_score) AS consensus_score
+        FROM intercell
+        WHERE transmitter AND uniprot IS NOT NULL
+        GROUP BY uniprot
+    ),
+    receivers AS (
+        SELECT uniprot,
+               array_agg(DISTINCT category ORDER BY category) AS categories,
+               max(consensus_score) AS consensus_score
+        FROM intercell
+        WHERE receiver AND uniprot IS NOT NULL
+        GROUP BY uniprot
+    ),
+    edges AS (
+        SELECT id, source AS ligand, target AS receptor,
+               source_genesymbol AS ligand_genesymbol, target_genesymbol AS receptor_genesymbol,
+               is_directed, is_stimulation, is_inhibition, sources, resource_ids,
+               curation_effort, omnipath, ligrecextra
+        FROM interactions
+        WHERE "type" = 'post_translational'
+        UNION ALL
+        SELECT id, target, source, target_genesymbol, source_genesymbol,
+               is_directed, is_stimulation, is_inhibition, sources, resource_ids,
+               curation_effort, omnipath, ligrecextra
+        FROM interactions
+        WHERE "type" = 'post_translational' AND NOT is_directed AND source != target
+    )
+    SELECT e.id AS interaction_id,
+           e.ligand, e.ligand_genesymbol, e.receptor, e.receptor_genesymbol,
+           t.categories AS ligand_categories, r.categories AS receptor_categories,
+           t.consensus_score AS ligand_consensus_score, r.consensus_score AS receptor_consensus_score,
+           e.is_directed, e.is_stimulation, e.is_inhibition,
+           e.sources, e.resource_ids, e.curation_effort, e.omnipath, e.ligrecextra
+    FROM edges e
+    JOIN transmitters t ON t.uniprot = e.ligand
+    JOIN receivers r ON r.uniprot = e.receptor
+    ORDER BY e.ligand, e.receptor, e.id
+"""
+PAIRS_INDEXES = [
+    f"CREATE INDEX IF NOT EXISTS idx_{PAIRS_TABLE}_ligand ON {PAIRS_TABLE} (ligand);",
+    f"CREATE INDEX IF NOT EXISTS idx_{PAIRS_TABLE}_receptor ON {PAIRS_TABLE} (receptor);",
+    f"CREATE INDEX IF NOT EXISTS idx_{PAIRS_TABLE}_ligand_genesymbol ON {PAIRS_TABLE} (ligand_genesymbol);",
+    f"CREATE INDEX IF NOT EXISTS idx_{PAIRS_TABLE}_receptor_genesymbol ON {PAIRS_TABLE} (receptor_genesymbol);",
+    f"CREATE INDEX IF NOT EXISTS idx_{PAIRS_TABLE}_interaction_id ON {PAIRS_TABLE} (interaction_id);",
+    f"CREATE INDEX IF NOT EXISTS idx_{PAIRS_TABLE}_ligand_categories ON {PAIRS_TABLE} USING GIN (ligand_categories);",
+    f"CREATE INDEX IF NOT EXISTS idx_{PAIRS_TABLE}_receptor_categories ON {PAIRS_TABLE} USING GIN (receptor_categories);",
+]
+PARQUET_BATCH_SIZE = 50000
+
+def build_pairs_table(conn):
+    """Recreates the pairs table from the loaded `interactions` and `intercell` tables."""
+    print(f"Building '{PAIRS_TABLE}'...")
+    start_time = time.time()
+
+    with conn.cursor() as cur:
+        try:
+            cur.execute(sql.SQL("DROP TABLE IF EXISTS {} CASCADE;").format(sql.Identifier(PAIRS_TABLE)))
+            cur.execute(PAIRS_QUERY)
+            for index_sql in PAIRS_INDEXES:
+                cur.execute(index_sql)
+            cur.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(PAIRS_TABLE)))
+            cur.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(PAIRS_TABLE)))
+            row_count = cur.fetchone()[0]
+            conn.commit()
+        except psycopg2.Error as e:
+            print(f"Error building '{PAIRS_TABLE}': {e}")
+            conn.rollback()
+            raise
+
+    print(f"Built {row_count:,} ligand-receptor pairs in {time.time() - start_time:.2f} seconds")
+    return row_count
+
+def export_pairs_parquet(conn, path=PAIRS_PARQUET, batch_size=PARQUET_BATCH_SIZE):
+    """Streams the pairs table into a zstd-compressed Parquet file, one row group per batch."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    print(f"Exporting '{PAIRS_TABLE}' to {path}...")
+    start_time = time.time()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    string_list = pa.list_(pa.string())
+    schema = pa.schema([
+        ("interaction_id", pa.int32()),
+        ("ligand", pa.string()),
+        ("ligand_genesymbol", pa.string()),
+        ("receptor", pa.string()),
+        ("receptor_genesymbol", pa.string()),
+        ("ligand_categories", string_list),
+        ("receptor_categories", string_list),
+        ("ligand_consensus_score", pa.int32()),
+        ("receptor_consensus_score", pa.int32()),
+        ("is_directed", pa.bool_()),
+        ("is_stimulation", pa.bool_()),
+        ("is_inhibition", pa.bool_()),
+        ("sources", pa.string()),
+        ("resource_ids", string_list),
+        ("curation_effort", pa.int32()),
+        ("omnipath", pa.bool_()),
+        ("ligrecextra", pa.bool_()),
+    ])
+    column_list = ", ".join(f'"{name}"' for name in schema.names)
+    rows_written = 0
+
+    # Named cursor, so the rows are fetched in batches from the server
+    with conn.cursor(name=f"{PAIRS_TABLE}_export") as cur, \
+            pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        cur.execute(f"SELECT {column_list} FROM {PAIRS_TABLE} ORDER BY ligand, receptor, interaction_id")
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            columns = list(zip(*rows))
+            writer.write_batch(pa.RecordBatch.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema,
+            ))
+            rows_written += len(rows)
+    conn.commit()
+
+    print(f"Exported {rows_written:,} pairs in {time.time() - start_time:.2f} seconds")
+
+def main():
+    """Main execution function."""
+    import argparse
+    from webservice_loader import check_environment, get_db_connection
+
+    parser = argparse.ArgumentParser(description="Build the ligand-receptor pairs table from intercell and interactions")
+    parser.add_argument("--parquet", nargs="?", const=PAIRS_PARQUET, metavar="FILE",
+                        help="Also export the table to Parquet (needs pyarrow)")
+    parser.add_argument("--export-only", action="store_true", help="Only export the existing table to Parquet")
+    args = parser.parse_args()
+
+    check_environment()
+    conn = get_db_connection()
+    try:
+        if not args.export_only:
+            build_pairs_table(conn)
+        if args.parquet or args.export_only:
+            export_pairs_parquet(conn, args.parquet or PAIRS_PARQUET)
+    except KeyboardInterrupt:
+        print("\nOperation cancelled by user.")
+        sys.exit(1)
+    finally:
+        conn.close()
+        print("Database connection closed.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Parquet copies of the webservice tables, written while COPY streams the TSVs.
+
+`ParquetTap` converts the rows to the column types of the table schema in
+TABLE_CONFIG and writes them to `<directory>/<table>/part-0.parquet`. With a
+"partition" column, one file is written per value instead, in hive-style
+directories like `annotations/source=SIGNOR/`. Strings are dictionary-encoded,
+pages are zstd-compressed, and min/max statistics are kept for the `id` and
+the "statistics" columns only. The `id` column numbers the rows as the
+SERIAL column of the freshly loaded table does. Needs pyarrow.
+
+    "parquet": {"partition": "source", "statistics": ["uniprot", "genesymbol"]}
+"""
+import os
+import re
+import time
+import shutil
+from urllib.parse import quote
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from row_taps import RowTap, TRUE_VALUES
+
+ROW_GROUP_SIZE = 100000  # Rows per row group of each file
+MAX_BUFFERED_ROWS = 500000  # Across partitions, the largest buffer is written out above this
+
+SQL_TYPES = [
+    (re.compile(r"^(SERIAL|INTEGER|SMALLINT)\b"), pa.int32()),
+    (re.compile(r"^BIGINT\b"), pa.int64()),
+    (re.compile(r"^BOOLEAN\b"), pa.bool_()),
+    (re.compile(r"^(TEXT|VARCHAR|JSONB)\b"), pa.string()),
+]
+
+def arrow_schema(table_schema, columns):
+    """Arrow schema of the `id` and TSV `columns`, from the column types of a TABLE_CONFIG schema."""
+    types = {}
+    for line in table_schema.strip().splitlines():
+        name, _, sql_type = line.strip().rstrip(",").partition(" ")
+        name = name.strip('"')
+        sql_type = sql_type.upper()
+        if sql_type.endswith("[]"):
+            continue
+        types[name] = next((arrow_type for pattern, arrow_type in SQL_TYPES if pattern.match(sql_type)), pa.string())
+    return pa.schema([("id", pa.int32())] + [(column, types.get(column, pa.string())) for column in columns])
+
+def _converter(arrow_type):
+    if pa.types.is_boolean(arrow_type):
+        return lambda value: value.lower() in TRUE_VALUES if value else None
+    if pa.types.is_integer(arrow_type):
+        return lambda value: int(value) if value else None
+    return lambda value: value if value else None
+
+class ParquetTap(RowTap):
+    """Buffers typed columns and writes them out as row groups, per partition."""
+
+    def __init__(self, columns, table, table_schema, directory, partition=None, statistics=()):
+        super().__init__(columns)
+        self.table = table
+        self.schema = arrow_schema(table_schema, columns)
+        self.converters = [_converter(field.type) for field in self.schema][1:]
+        self.directory = os.path.join(directory, table)
+        # Written next to the previous export, which is replaced once the load succeeds
+        self.staging = f"{self.directory}.partial"
+        shutil.rmtree(self.staging, ignore_errors=True)
+        self.partition_pos = self.position[partition] if partition else None
+        self.partition = partition
+        self.statistics = ["id", *(column for column in statistics if column in self.position)]
+        self.buffers = {}
+        self.writers = {}
+        self.n_rows = 0
+        self.n_buffered = 0
+
+    def add_row(self, row):
+        self.n_rows += 1
+        key = row[self.partition_pos] if self.partition_pos is not None else None
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            buffer = self.buffers[key] = [[] for _ in self.schema]
+        buffer[0].append(self.n_rows)
+        for values, convert, value in zip(buffer[1:], self.converters, row):
+            values.append(convert(value))
+        self.n_buffered += 1
+        if len(buffer[0]) >= ROW_GROUP_SIZE:
+            self._flush(key)
+        elif self.n_buffered >= MAX_BUFFERED_ROWS:
+            self._flush(max(self.buffers, key=lambda k: len(self.buffers[k][0])))
+
+    def _path(self, key):
+        if self.partition is None:
+            return os.path.join(self.staging, "part-0.parquet")
+        value = quote(key, safe="") if key else "__HIVE_DEFAULT_PARTITION__"
+        return os.path.join(self.staging, f"{self.partition}={value}", "part-0.parquet")
+
+    def _flush(self, key):
+        buffer = self.buffers.pop(key)
+        writer = self.writers.get(key)
+        if writer is None:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            writer = self.writers[key] = pq.ParquetWriter(
+                path,
+                self.schema,
+                compression="zstd",
+                use_dictionary=True,
+                write_statistics=self.statistics,
+            )
+        writer.write_batch(pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(buffer, self.schema)],
+            schema=self.schema,
+        ))
+        self.n_buffered -= len(buffer[0])
+
+    def store(self, conn):
+        """Writes the remaining rows, closes the files and replaces the previous export."""
+        start_time = time.time()
+        for key in list(self.buffers):
+            self._flush(key)
+        for writer in self.writers.values():
+            writer.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+        if self.writers:
+            os.replace(self.staging, self.directory)
+        print(f"Wrote {self.n_rows:,} rows of '{self.table}' into {len(self.writers)} Parquet file(s) "
+              f"in '{self.directory}' in {time.time() - start_time:.2f} seconds")
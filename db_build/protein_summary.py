@@ -0,0 +1,241 @@
+"""
+Per-protein record counts across all webservice tables.
+
+While COPY streams each table, `ProteinSummaryTap` counts the records of every
+UniProt AC (or other entity identifier) in it and saves the counts of that
+table as a partial JSON file. `build_protein_summary` merges the partials of
+all tables into `protein_summary`, so the summary card and tab badges of a
+protein page come from one primary key lookup. Reloading a single table
+replaces only its partial.
+
+Counts are kept as `name` or `name:detail` keys, e.g. `interactions_out` and
+`interactions_out:omnipath`, or `annotations:SIGNOR`.
+"""
+import io
+import os
+import json
+import time
+from collections import Counter, defaultdict
+
+import psycopg2
+from psycopg2 import sql
+
+from row_taps import RowTap, TRUE_VALUES
+
+SUMMARY_TABLE = "protein_summary"
+SUMMARY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "omnipath_latest_build", SUMMARY_TABLE)
+SUMMARY_TABLES = ["interactions", "annotations", "complexes", "enz_sub", "intercell"]
+
+# Dataset flag columns of the interactions, same as interaction_graph.DATASET_COLUMNS
+INTERACTION_DATASETS = [
+    "omnipath", "kinaseextra", "ligrecextra", "pathwayextra", "mirnatarget",
+    "dorothea", "collectri", "tf_target", "lncrna_mrna", "tf_mirna", "small_molecule",
+    "dorothea_curated", "dorothea_chipseq", "dorothea_tfbs", "dorothea_coexp",
+]
+
+SUMMARY_SCHEMA = """
+    uniprot TEXT PRIMARY KEY,
+    genesymbol TEXT,
+    interactions INTEGER NOT NULL DEFAULT 0,
+    interactions_out INTEGER NOT NULL DEFAULT 0,
+    interactions_in INTEGER NOT NULL DEFAULT 0,
+    interactions_out_by_dataset JSONB NOT NULL DEFAULT '{}',
+    interactions_in_by_dataset JSONB NOT NULL DEFAULT '{}',
+    annotations INTEGER NOT NULL DEFAULT 0,
+    annotations_by_resource JSONB NOT NULL DEFAULT '{}',
+    complexes INTEGER NOT NULL DEFAULT 0,
+    enzsub INTEGER NOT NULL DEFAULT 0,
+    enzsub_as_enzyme INTEGER NOT NULL DEFAULT 0,
+    enzsub_as_substrate INTEGER NOT NULL DEFAULT 0,
+    intercell INTEGER NOT NULL DEFAULT 0,
+    intercell_categories TEXT[] NOT NULL DEFAULT '{}'
+"""
+SUMMARY_COLUMNS = [
+    "uniprot", "genesymbol",
+    "interactions", "interactions_out", "interactions_in",
+    "interactions_out_by_dataset", "interactions_in_by_dataset",
+    "annotations", "annotations_by_resource",
+    "complexes", "enzsub", "enzsub_as_enzyme", "enzsub_as_substrate",
+    "intercell", "intercell_categories",
+]
+SUMMARY_INDEXES = [
+    f"CREATE INDEX IF NOT EXISTS idx_{SUMMARY_TABLE}_genesymbol ON {SUMMARY_TABLE} (genesymbol);",
+]
+
+class ProteinSummaryTap(RowTap):
+    """Counts the records of each protein in the rows of one table."""
+
+    def __init__(self, columns, table, directory=SUMMARY_DIR):
+        super().__init__(columns)
+        self.table = table
+        self.directory = directory
+        self.counts = defaultdict(Counter)
+        self.categories = defaultdict(set)
+        self.genesymbols = {}
+        self.add_row = getattr(self, f"_add_{table}")
+        self.datasets = [(d, self.position[d]) for d in INTERACTION_DATASETS if d in self.position]
+        self._last_record = {}
+
+    def _column(self, row, column):
+        pos = self.position.get(column)
+        return row[pos] if pos is not None else ""
+
+    def _protein(self, identifier, genesymbol):
+        if genesymbol and identifier not in self.genesymbols:
+            self.genesymbols[identifier] = genesymbol
+        return self.counts[identifier]
+
+    def _add_interactions(self, row):
+        source, target = self._column(row, "source"), self._column(row, "target")
+        datasets = [d for d, pos in self.datasets if row[pos].lower() in TRUE_VALUES]
+        for identifier, genesymbol, side in (
+            (source, self._column(row, "source_genesymbol"), "out"),
+            (target, self._column(row, "target_genesymbol"), "in"),
+        ):
+            if not identifier:
+                continue
+            counts = self._protein(identifier, genesymbol)
+            counts[f"interactions_{side}"] += 1
+            for dataset in datasets:
+                counts[f"interactions_{side}:{dataset}"] += 1
+            if side == "out" or identifier != source:
+                counts["interactions"] += 1
+
+    def _add_annotations(self, row):
+        uniprot = self._column(row, "uniprot")
+        if not uniprot:
+            return
+        source = self._column(row, "source")
+        record = self._column(row, "record_id")
+        # The label rows of one record are adjacent, a new record id starts a new record
+        if self._last_record.get((uniprot, source)) == record:
+            return
+        self._last_record[(uniprot, source)] = record
+        counts = self._protein(uniprot, self._column(row, "genesymbol"))
+        counts["annotations"] += 1
+        counts[f"annotations:{source}"] += 1
+
+    def _add_complexes(self, row):
+        components = [c.strip() for c in self._column(row, "components").split("_")]
+        genesymbols = self._column(row, "components_genesymbols").split("_")
+        if len(genesymbols) != len(components):
+            genesymbols = [""] * len(components)
+        for uniprot, genesymbol in dict(zip(components, genesymbols)).items():
+            if uniprot:
+                self._protein(uniprot, genesymbol.strip())["complexes"] += 1
+
+    def _add_enz_sub(self, row):
+        enzyme, substrate = self._column(row, "enzyme"), self._column(row, "substrate")
+        if enzyme:
+            counts = self._protein(enzyme, self._column(row, "enzyme_genesymbol"))
+            counts["enzsub_as_enzyme"] += 1
+            counts["enzsub"] += 1
+        if substrate:
+            counts = self._protein(substrate, self._column(row, "substrate_genesymbol"))
+            counts["enzsub_as_substrate"] += 1
+            if substrate != enzyme:
+                counts["enzsub"] += 1
+
+    def _add_intercell(self, row):
+        uniprot = self._column(row, "uniprot")
+        if not uniprot:
+            return
+        self._protein(uniprot, self._column(row, "genesymbol"))["intercell"] += 1
+        category = self._column(row, "category")
+        if category:
+            self.categories[uniprot].add(category)
+
+    def store(self, conn):
+        """Saves the counts of this table as its partial."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{self.table}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "table": self.table,
+                "counts": self.counts,
+                "categories": {uniprot: sorted(c) for uniprot, c in self.categories.items()},
+                "genesymbols": self.genesymbols,
+            }, f, separators=(",", ":"))
+        print(f"Saved protein summary counts of {len(self.counts):,} entities in '{self.table}' to {path}")
+
+def merge_partials(directory=SUMMARY_DIR):
+    """Summary rows from the partials of all tables found in `directory`."""
+    counts = defaultdict(Counter)
+    categories = defaultdict(set)
+    genesymbols = {}
+
+    for table in SUMMARY_TABLES:
+        path = os.path.join(directory, f"{table}.json")
+        if not os.path.exists(path):
+            print(f"Warning: no protein summary counts of '{table}', load it to include them")
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            partial = json.load(f)
+        for uniprot, table_counts in partial["counts"].items():
+            counts[uniprot].update(table_counts)
+        for uniprot, table_categories in partial["categories"].items():
+            categories[uniprot].update(table_categories)
+        for uniprot, genesymbol in partial["genesymbols"].items():
+            genesymbols.setdefault(uniprot, genesymbol)
+
+    rows = []
+    for uniprot in sorted(counts):
+        entity_counts = counts[uniprot]
+        by_detail = defaultdict(dict)
+        for key, count in entity_counts.items():
+            name, _, detail = key.partition(":")
+            if detail:
+                by_detail[name][detail] = count
+        rows.append({
+            "uniprot": uniprot,
+            "genesymbol": genesymbols.get(uniprot),
+            **{column: entity_counts.get(column, 0) for column in (
+                "interactions", "interactions_out", "interactions_in", "annotations", "complexes",
+                "enzsub", "enzsub_as_enzyme", "enzsub_as_substrate", "intercell",
+            )},
+            "interactions_out_by_dataset": by_detail["interactions_out"],
+            "interactions_in_by_dataset": by_detail["interactions_in"],
+            "annotations_by_resource": by_detail["annotations"],
+            "intercell_categories": sorted(categories.get(uniprot, ())),
+        })
+    return rows
+
+def copy_value(value):
+    """Formats a value for COPY text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, dict):
+        value = json.dumps(value, separators=(",", ":"))
+    elif isinstance(value, list):
+        return "{%s}" % ",".join(
+            '"%s"' % v.replace("\\", "\\\\\\\\").replace('"', '\\\\"') for v in value
+        )
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+def write_summary_table(conn, rows):
+    """Recreates the summary table and loads the rows with COPY."""
+    print(f"Writing {len(rows):,} rows into '{SUMMARY_TABLE}'...")
+    start_time = time.time()
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(copy_value(row[column]) for column in SUMMARY_COLUMNS))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    with conn.cursor() as cur:
+        try:
+            cur.execute(sql.SQL("DROP TABLE IF EXISTS {} CASCADE;").format(sql.Identifier(SUMMARY_TABLE)))
+            cur.execute(f"CREATE TABLE {SUMMARY_TABLE} ({SUMMARY_SCHEMA})")
+            cur.copy_expert(f"COPY {SUMMARY_TABLE} ({', '.join(SUMMARY_COLUMNS)}) FROM STDIN", buffer)
+            for index_sql in SUMMARY_INDEXES:
+                cur.execute(index_sql)
+            conn.commit()
+        except psycopg2.Error as e:
+            print(f"Error writing '{SUMMARY_TABLE}': {e}")
+            conn.rollback()
+            raise
+
+    print(f"Table '{SUMMARY_TABLE}' written in {time.time() - start_time:.2f} seconds")
+
+def build_protein_summary(conn, directory=SUMMARY_DIR):
+    write_summary_table(conn, merge_partials(directory))
@@ -0,0 +1,150 @@
+"""
+Replays the app's query shapes against the Postgres database built by the loaders.
+
+Samples are proteins drawn from the loaded interactions (see
+query_shapes.make_samples), so every lookup hits real identifiers. Each shape
+is run once per sample for the client-side latency (p50/p95/p99, including
+fetching the rows), then once more under EXPLAIN (ANALYZE, BUFFERS) for the
+shared buffers hit and read per query. Save a run with --output and pass it
+as --baseline after a schema or index change to see the difference.
+"""
+import sys
+import json
+import time
+
+from query_shapes import QUERY_SHAPES, render, make_samples, percentile
+from webservice_loader import check_environment, get_db_connection
+
+BENCHMARK_SAMPLES = 200  # Samples run per query shape
+SAMPLE_SEED = 0  # Seeds the sampling, so runs before and after a change use the same proteins
+
+def sample_proteins(conn):
+    """(uniprot, genesymbol) pairs of the interacting proteins, sampled from by `make_samples`."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT source, source_genesymbol FROM interactions WHERE source IS NOT NULL
+            UNION
+            SELECT target, target_genesymbol FROM interactions WHERE target IS NOT NULL
+        """)
+        proteins = cur.fetchall()
+    conn.commit()
+    return proteins
+
+def existing_tables(conn, tables):
+    with conn.cursor() as cur:
+        cur.execute("SELECT t FROM unnest(%s::text[]) t WHERE to_regclass(t) IS NOT NULL", (list(tables),))
+        found = {row[0] for row in cur.fetchall()}
+    conn.commit()
+    return found
+
+def plan_buffers(plan):
+    """Shared buffers (hit, read) of an EXPLAIN (FORMAT JSON) result, planning included."""
+    node = plan["Plan"]
+    planning = plan.get("Planning", {})
+    return (
+        node.get("Shared Hit Blocks", 0) + planning.get("Shared Hit Blocks", 0),
+        node.get("Shared Read Blocks", 0) + planning.get("Shared Read Blocks", 0),
+    )
+
+def run_shape(conn, shape, samples):
+    """Latencies in ms, row counts and buffers (hit, read) of a shape over the samples."""
+    latencies, rows, hits, reads = [], [], [], []
+    with conn.cursor() as cur:
+        cur.execute(*render(shape, samples[0]))  # Warm up the plan and connection
+        cur.fetchall()
+        for sample in samples:
+            query, params = render(shape, sample)
+            start = time.perf_counter()
+            cur.execute(query, params)
+            rows.append(len(cur.fetchall()))
+            latencies.append((time.perf_counter() - start) * 1000)
+        for sample in samples:
+            query, params = render(shape, sample)
+            cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query, params)
+            plan = cur.fetchone()[0]
+            hit, read = plan_buffers((json.loads(plan) if isinstance(plan, str) else plan)[0])
+            hits.append(hit)
+            reads.append(read)
+    conn.commit()
+    latencies.sort()
+    n = len(samples)
+    return {
+        "samples": n,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "mean_ms": sum(latencies) / n,
+        "rows": sum(rows) / n,
+        "buffers_hit": sum(hits) / n,
+        "buffers_read": sum(reads) / n,
+    }
+
+def run_benchmark(conn, shapes=None, n_samples=BENCHMARK_SAMPLES, seed=SAMPLE_SEED):
+    """Results of each query shape, by name."""
+    samples = make_samples(sample_proteins(conn), n_samples, seed)
+    if not samples:
+        print("No proteins to sample, load 'interactions' first")
+        return {}
+
+    tables = existing_tables(conn, {t for shape in QUERY_SHAPES.values() for t in shape["tables"]})
+    results = {}
+    for name, shape in QUERY_SHAPES.items():
+        if shapes and name not in shapes:
+            continue
+        missing = set(shape["tables"]) - tables
+        if missing:
+            print(f"Skipping '{name}', missing {', '.join(sorted(missing))}")
+            continue
+        print(f"Running '{name}' ({shape['app']}) on {len(samples)} samples...")
+        results[name] = run_shape(conn, shape, samples)
+    return results
+
+def print_results(results, baseline=None):
+    print(f"\n{'='*60}")
+    print("Query shapes: latency in ms, shared buffers per query")
+    print(f"{'='*60}")
+    print(f"{'shape':<20} {'p50':>8} {'p95':>8} {'p99':>8} {'rows':>8} {'hit':>8} {'read':>8}")
+    for name, r in results.items():
+        print(f"{name:<20} {r['p50_ms']:>8.3f} {r['p95_ms']:>8.3f} {r['p99_ms']:>8.3f} "
+              f"{r['rows']:>8.1f} {r['buffers_hit']:>8.1f} {r['buffers_read']:>8.1f}")
+        before = (baseline or {}).get(name)
+        if before:
+            change = lambda key: (r[key] - before[key]) / before[key] * 100 if before[key] else float("nan")
+            print(f"{'  vs baseline':<20} {change('p50_ms'):>+7.1f}% {change('p95_ms'):>+7.1f}% {change('p99_ms'):>+7.1f}% "
+                  f"{'':>8} {r['buffers_hit'] - before['buffers_hit']:>+8.1f} {r['buffers_read'] - before['buffers_read']:>+8.1f}")
+
+def main():
+    """Main execution function."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay the app's query shapes against the loaded database")
+    parser.add_argument("--shapes", nargs="+", choices=list(QUERY_SHAPES), help="Only these shapes")
+    parser.add_argument("--samples", type=int, default=BENCHMARK_SAMPLES, help="Samples run per shape")
+    parser.add_argument("--seed", type=int, default=SAMPLE_SEED, help="Seed of the protein sampling")
+    parser.add_argument("--output", metavar="FILE", help="Save the results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="Compare with the results saved by an earlier run")
+    args = parser.parse_args()
+
+    check_environment()
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    conn = get_db_connection()
+    try:
+        results = run_benchmark(conn, args.shapes, args.samples, args.seed)
+    except KeyboardInterrupt:
+        print("\nOperation cancelled by user.")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+    print_results(results, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"samples": args.samples, "seed": args.seed, "results": results}, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
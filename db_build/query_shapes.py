@@ -0,0 +1,141 @@
+"""
+The SQL shapes the web app issues, for benchmarking the databases built by the loaders.
+
+Each shape mirrors a query function in src/ (noted in "app") and is written
+once for all engines: `{name}` placeholders take a value of the sample (a list
+expands into an IN list), `{ilike}` is ILIKE or its SQLite equivalent.
+`render()` turns a shape and a sample into SQL and parameters for one engine.
+"""
+import re
+import random
+
+QUERY_SHAPES = {
+    "search_identifiers": {
+        "app": "searchIdentifiers",
+        "tables": ["uniprot_identifiers"],
+        "sql": """
+            SELECT uniprot_accession, identifier_value, identifier_type, taxon_id, ambiguity
+            FROM uniprot_identifiers
+            WHERE identifier_value {ilike} {prefix}
+            ORDER BY CASE WHEN identifier_value {ilike} {query} THEN 1 ELSE 2 END,
+                     ambiguity ASC NULLS LAST, identifier_value
+            LIMIT 1
+        """,
+    },
+    "protein_neighbors": {
+        "app": "searchProteinNeighbors",
+        "tables": ["interactions"],
+        "sql": """
+            SELECT * FROM interactions
+            WHERE source IN {accessions} OR target IN {accessions}
+               OR source_genesymbol IN {genesymbols} OR target_genesymbol IN {genesymbols}
+        """,
+    },
+    "interactions_among": {
+        "app": "getInteractionsAmongProteins",
+        "tables": ["interactions"],
+        "sql": """
+            SELECT * FROM interactions
+            WHERE source IN {proteins} AND target IN {proteins}
+            LIMIT 1000
+        """,
+    },
+    "annotations": {
+        "app": "getProteinAnnotations",
+        "tables": ["annotations"],
+        "sql": """
+            SELECT uniprot, genesymbol, entity_type, source, label, value, record_id
+            FROM annotations
+            WHERE uniprot IN {accessions} OR genesymbol IN {genesymbols}
+        """,
+    },
+    "enz_sub": {
+        "app": "getEnzSubData",
+        "tables": ["enz_sub"],
+        "sql": """
+            SELECT * FROM enz_sub
+            WHERE enzyme IN {accessions} OR substrate IN {accessions}
+               OR enzyme_genesymbol IN {genesymbols} OR substrate_genesymbol IN {genesymbols}
+        """,
+    },
+    "enz_sub_among": {
+        "app": "getEnzSubDataAmongProteins",
+        "tables": ["enz_sub"],
+        "sql": """
+            SELECT * FROM enz_sub
+            WHERE (enzyme IN {proteins} OR enzyme_genesymbol IN {protein_genesymbols})
+              AND (substrate IN {proteins} OR substrate_genesymbol IN {protein_genesymbols})
+        """,
+    },
+    "intercell": {
+        "app": "getIntercellData",
+        "tables": ["intercell"],
+        "sql": """
+            SELECT * FROM intercell
+            WHERE uniprot IN {accessions} OR genesymbol IN {genesymbols}
+        """,
+    },
+    "complexes": {
+        "app": "getComplexesData",
+        "tables": ["complexes", "complex_members"],
+        "sql": """
+            SELECT * FROM complexes
+            WHERE id IN (
+                SELECT complex_id FROM complex_members
+                WHERE uniprot IN {accessions} OR upper(genesymbol) IN {genesymbols}
+            )
+        """,
+    },
+}
+
+PLACEHOLDERS = {"postgres": "%s", "sqlite": "?"}
+ILIKE = {"postgres": "ILIKE", "sqlite": "LIKE"}  # SQLite's LIKE is case-insensitive
+PROTEINS_PER_SAMPLE = 5  # Size of the protein set of the "among" shapes
+
+def render(shape, sample, dialect="postgres"):
+    """SQL and parameters of a shape for one sample, in the parameter style of `dialect`."""
+    placeholder = PLACEHOLDERS[dialect]
+    params = []
+
+    def substitute(match):
+        name = match.group(1)
+        if name == "ilike":
+            return ILIKE[dialect]
+        value = sample[name]
+        if isinstance(value, list):
+            params.extend(value)
+            return "(%s)" % ", ".join([placeholder] * len(value))
+        params.append(value)
+        return placeholder
+
+    return re.sub(r"\{(\w+)\}", substitute, shape["sql"]), params
+
+def make_samples(proteins, n, seed=0):
+    """
+    Samples for the shapes from (uniprot, genesymbol) pairs of proteins in the database.
+
+    A sample searches one protein by accession and gene symbol (also as the
+    identifier search query, matched as prefix and exactly like the app does),
+    and `PROTEINS_PER_SAMPLE` proteins for the "among" shapes.
+    """
+    rng = random.Random(seed)
+    proteins = sorted({(uniprot, genesymbol or uniprot) for uniprot, genesymbol in proteins if uniprot})
+    samples = []
+    for _ in range(n if proteins else 0):
+        uniprot, genesymbol = rng.choice(proteins)
+        group = rng.sample(proteins, min(PROTEINS_PER_SAMPLE, len(proteins)))
+        samples.append({
+            "accessions": [uniprot],
+            "genesymbols": [genesymbol.upper()],
+            "query": genesymbol,
+            "prefix": genesymbol + "%",
+            "proteins": [u for u, _ in group],
+            "protein_genesymbols": [g.upper() for _, g in group],
+        })
+    return samples
+
+def percentile(values, q):
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, max(0, int(round(q / 100 * len(values) + 0.5)) - 1))]
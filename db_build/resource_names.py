@@ -0,0 +1,77 @@
+"""
+Resolves the source labels of the loaded tables to canonical resource ids.
+
+Labels like `PAZAR_DoRothEA` (PAZAR data imported via DoRothEA) resolve to
+their primary resource, labels matching a `descriptions` key resolve to that
+key, and `RESOURCE_ALIASES` covers the names that differ otherwise.
+"""
+import os
+import sys
+
+RESOURCE_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "data")
+sys.path.insert(0, RESOURCE_DATA_DIR)
+
+from descriptions import descriptions  # noqa: E402
+
+# Source label -> descriptions key or canonical id, for names no rule can match
+RESOURCE_ALIASES = {
+    "Lit-BM-17": "HuRI Lit-BM",
+    "SignaLink": "SignaLink3",
+    "Havugimana2012": "Havugimana",
+    "hu.MAP": "Humap",
+    "hu.MAP2": "Humap",
+    "hu.MAP3": "Humap",
+    "GO": "GeneOntology",
+    "GOA": "GeneOntology",
+    "HTRI": "HTRIdb",
+    "HPRD-phos": "HPRD",
+    "Ramilowski": "Ramilowski2015",
+    "miRDeathDB": "miRDeatdhDB",
+    "ENCODE-distal": "ENCODE",
+    "ENCODE-proximal": "ENCODE",
+    "DoRothEA-A": "DoRothEA",
+    "DoRothEA-reviews": "DoRothEA",
+    "CellChatDB-cofactors": "CellChatDB",
+}
+
+def clean_source_name(label):
+    """
+    Strips the secondary resource from labels like `PAZAR_DoRothEA`.
+    Same rule as `cleanSourceName` in src/utils/database-data.ts.
+    """
+    before, sep, after = label.partition('_')
+    if sep and before and after[:1].isalpha():
+        return before
+    return label
+
+class ResourceNameResolver:
+    """Maps source labels to `(resource id, descriptions key or None)`, memoized per label."""
+
+    def __init__(self, resource_keys=None, aliases=None):
+        resource_keys = list(descriptions if resource_keys is None else resource_keys)
+        aliases = RESOURCE_ALIASES if aliases is None else aliases
+        self.aliases = {name.lower(): target for name, target in aliases.items()}
+        self.index = {}
+        for key in resource_keys:
+            self.index.setdefault(key.lower(), key)
+        for key in resource_keys:
+            self.index.setdefault(clean_source_name(key).lower(), key)
+        self._resolved = {}
+
+    def resolve(self, label):
+        resolved = self._resolved.get(label)
+        if resolved is None:
+            resolved = self._resolved[label] = self._resolve(label)
+        return resolved
+
+    def _resolve(self, label):
+        cleaned = clean_source_name(label)
+        for name in (label, cleaned):
+            name = self.aliases.get(name.lower(), name)
+            key = self.index.get(name.lower())
+            if key is not None:
+                return key, key
+        return self.aliases.get(cleaned.lower(), cleaned), None
+
+    def resource_id(self, label):
+        return self.resolve(label)[0]
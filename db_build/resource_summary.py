@@ -0,0 +1,233 @@
+import io
+import os
+import sys
+import json
+import time
+import psycopg2
+from psycopg2 import sql
+
+from resource_names import RESOURCE_DATA_DIR, ResourceNameResolver, clean_source_name, descriptions
+
+SUMMARY_TABLE = "resource_summary"
+SUMMARY_JSON = os.path.join(RESOURCE_DATA_DIR, "resource_summary.json")
+LICENSE_FILE = os.path.join(RESOURCE_DATA_DIR, "resources_by_license.json")
+MAINTENANCE_FILE = os.path.join(RESOURCE_DATA_DIR, "resources_by_maintenance_category.json")
+DB_STATS_FILE = os.path.join(RESOURCE_DATA_DIR, "db-stats.json")
+
+# Per-source record counts of the loaded tables, read from the `<table>_source_counts`
+# materialized views built by webservice_loader.py
+DATASETS = ["interactions", "enz_sub", "complexes", "annotations", "intercell"]
+
+SUMMARY_SCHEMA = f"""
+    resource_id TEXT PRIMARY KEY,
+    label TEXT NOT NULL,
+    description_key TEXT,
+    full_name TEXT,
+    "type" TEXT,
+    subtype TEXT,
+    license TEXT,
+    license_url TEXT,
+    commercial_use BOOLEAN,
+    license_category TEXT,
+    maintenance TEXT,
+    {", ".join(f"{dataset}_records INTEGER NOT NULL DEFAULT 0" for dataset in DATASETS)},
+    total_records BIGINT NOT NULL DEFAULT 0,
+    source_labels TEXT[] NOT NULL
+"""
+SUMMARY_COLUMNS = [
+    "resource_id", "label", "description_key", "full_name", "type", "subtype",
+    "license", "license_url", "commercial_use", "license_category", "maintenance",
+    *(f"{dataset}_records" for dataset in DATASETS),
+    "total_records", "source_labels",
+]
+
+# --- Source counts ---
+
+def query_source_counts(conn):
+    """Returns {dataset: {source label: record count}} from the source count views."""
+    counts = {}
+    with conn.cursor() as cur:
+        for dataset in DATASETS:
+            view = f"{dataset}_source_counts"
+            cur.execute("SELECT to_regclass(%s)", (view,))
+            if cur.fetchone()[0] is None:
+                print(f"Error: Materialized view '{view}' not found, "
+                      f"create it with `python webservice_loader.py --refresh-views --table {dataset}`")
+                sys.exit(1)
+            cur.execute(sql.SQL("SELECT source, records FROM {}").format(sql.Identifier(view)))
+            counts[dataset] = dict(cur.fetchall())
+            print(f"  {dataset}: {len(counts[dataset])} sources")
+    conn.commit()
+    return counts
+
+def read_source_counts(stats_file):
+    """Returns the same counts as `query_source_counts`, from a db-stats.json file."""
+    with open(stats_file, 'r', encoding='utf-8') as f:
+        stats = json.load(f)
+    return {
+        dataset: {row["source"]: row["record_count"] for row in stats.get(dataset, [])}
+        for dataset in DATASETS
+    }
+
+# --- License and maintenance categories ---
+
+def load_category_map(path):
+    """{category: [resource names]} file -> {lower case name: category}."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        categories = json.load(f)
+    mapping = {}
+    for category, names in categories.items():
+        for name in names:
+            mapping[name.lower()] = category
+            mapping.setdefault(clean_source_name(name).lower(), category)
+    return mapping
+
+# --- Summary ---
+
+def build_summary(source_counts):
+    """
+    Joins the per-source counts with `descriptions`, one row per canonical resource.
+
+    Variants of the same resource (`DoRothEA`, `DoRothEA-A`, `DoRothEA-reviews`, ...)
+    overlap, so each dataset keeps the highest count among them, as the home page does.
+    """
+    resolver = ResourceNameResolver()
+    license_categories = load_category_map(LICENSE_FILE)
+    maintenance = load_category_map(MAINTENANCE_FILE)
+    rows = {}
+
+    for dataset, counts in source_counts.items():
+        for label, count in counts.items():
+            resource_id, key = resolver.resolve(label)
+            row = rows.get(resource_id)
+            if row is None:
+                row = rows[resource_id] = {
+                    "resource_id": resource_id,
+                    "description_key": key,
+                    "source_labels": set(),
+                    **{f"{d}_records": 0 for d in DATASETS},
+                }
+            row["source_labels"].add(label)
+            column = f"{dataset}_records"
+            row[column] = max(row[column], count)
+
+    # Resources without records still get their metadata
+    for key in descriptions:
+        resource_id, _ = resolver.resolve(key)
+        rows.setdefault(resource_id, {
+            "resource_id": resource_id,
+            "description_key": key,
+            "source_labels": set(),
+            **{f"{d}_records": 0 for d in DATASETS},
+        })
+
+    summary = []
+    for resource_id in sorted(rows, key=str.lower):
+        row = rows[resource_id]
+        entry = descriptions.get(row["description_key"]) or {}
+        license = entry.get("license") or {}
+        names = [resource_id.lower(), *(label.lower() for label in sorted(row["source_labels"]))]
+        row.update({
+            "label": entry.get("label", resource_id),
+            "full_name": entry.get("full_name"),
+            "type": entry.get("type"),
+            "subtype": entry.get("subtype"),
+            "license": license.get("name"),
+            "license_url": license.get("url"),
+            "commercial_use": license.get("commercial_use"),
+            "license_category": next((license_categories[n] for n in names if n in license_categories), None),
+            "maintenance": next((maintenance[n] for n in names if n in maintenance), None),
+            "total_records": sum(row[f"{d}_records"] for d in DATASETS),
+            "source_labels": sorted(row["source_labels"]),
+        })
+        summary.append({column: row[column] for column in SUMMARY_COLUMNS})
+
+    return summary
+
+def copy_value(value):
+    """Formats a value for COPY text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, list):
+        return "{%s}" % ",".join(
+            '"%s"' % v.replace("\\", "\\\\\\\\").replace('"', '\\\\"') for v in value
+        )
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+def write_summary_table(conn, summary):
+    """Recreates the summary table and loads the rows with COPY."""
+    print(f"Writing {len(summary)} rows into '{SUMMARY_TABLE}'...")
+    start_time = time.time()
+    buffer = io.StringIO()
+    for row in summary:
+        buffer.write("\t".join(copy_value(row[column]) for column in SUMMARY_COLUMNS))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    with conn.cursor() as cur:
+        try:
+            cur.execute(sql.SQL("DROP TABLE IF EXISTS {} CASCADE;").format(sql.Identifier(SUMMARY_TABLE)))
+            cur.execute(f"CREATE TABLE {SUMMARY_TABLE} ({SUMMARY_SCHEMA})")
+            column_list = ", ".join(sql.Identifier(column).as_string(cur) for column in SUMMARY_COLUMNS)
+            cur.copy_expert(f"COPY {SUMMARY_TABLE} ({column_list}) FROM STDIN", buffer)
+            conn.commit()
+        except psycopg2.Error as e:
+            print(f"Error writing '{SUMMARY_TABLE}': {e}")
+            conn.rollback()
+            raise
+
+    print(f"Table '{SUMMARY_TABLE}' written in {time.time() - start_time:.2f} seconds")
+
+def write_summary_json(summary, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, separators=(",", ":"))
+    print(f"Summary written to {path}")
+
+def main():
+    """Main execution function."""
+    import argparse
+    from webservice_loader import check_environment, get_db_connection
+
+    parser = argparse.ArgumentParser(description="Join resource descriptions with per-source record counts")
+    parser.add_argument("--from-stats", nargs="?", const=DB_STATS_FILE, metavar="FILE",
+                        help="Take the counts from a db-stats.json file instead of the database; "
+                             "only the JSON is written")
+    parser.add_argument("--output", default=SUMMARY_JSON, help="Path of the JSON output")
+    parser.add_argument("--skip-table", action="store_true",
+                        help=f"Don't write the '{SUMMARY_TABLE}' table")
+
+    args = parser.parse_args()
+
+    conn = None
+    try:
+        if args.from_stats:
+            print(f"Reading source counts from {args.from_stats}...")
+            source_counts = read_source_counts(args.from_stats)
+        else:
+            check_environment()
+            conn = get_db_connection()
+            print("Querying source counts...")
+            source_counts = query_source_counts(conn)
+
+        summary = build_summary(source_counts)
+        described = sum(row["description_key"] is not None for row in summary)
+        print(f"{len(summary)} resources, {described} with descriptions")
+
+        if conn and not args.skip_table:
+            write_summary_table(conn, summary)
+        write_summary_json(summary, args.output)
+
+    except KeyboardInterrupt:
+        print("\nOperation cancelled by user.")
+        sys.exit(1)
+    finally:
+        if conn:
+            conn.close()
+            print("Database connection closed.")
+
+if __name__ == "__main__":
+    main()
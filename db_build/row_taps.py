@@ -0,0 +1,66 @@
+"""
+Consumers of the table rows streamed to COPY by the webservice loader.
+
+`TapReader` wraps the TSV file handed to COPY and passes every chunk read to
+the taps, so derived artifacts (the CSR graph, complex members, ...) are built
+from the same single read of the file. A tap subclasses `RowTap`, implements
+`add_row()` and `store()`, and is registered in the loader's `TAPS`.
+"""
+import io
+import csv
+
+TRUE_VALUES = {"true", "t", "1", "yes"}
+
+class RowTap:
+    """Parses chunks of TSV text into rows, `add_row()` gets each one as a list of strings."""
+
+    def __init__(self, columns):
+        self.position = {column: i for i, column in enumerate(columns)}
+        self._partial = ""
+
+    def feed(self, text):
+        """Parses the complete lines of a chunk, keeps the last partial line for the next one."""
+        text = self._partial + text
+        last_newline = text.rfind("\n")
+        if last_newline < 0:
+            self._partial = text
+            return
+        self._partial = text[last_newline + 1:]
+        self._parse(text[:last_newline + 1])
+
+    def finish(self):
+        if self._partial:
+            self._parse(self._partial)
+            self._partial = ""
+
+    def _parse(self, text):
+        # Same quoting rules as the loader's COPY ... WITH CSV DELIMITER E'\t'
+        for row in csv.reader(io.StringIO(text), delimiter="\t"):
+            if row:
+                self.add_row(row)
+
+    def add_row(self, row):
+        raise NotImplementedError
+
+    def store(self, conn):
+        """Writes the results once COPY has committed."""
+        raise NotImplementedError
+
+class TapReader:
+    """File wrapper passing everything read through it to a callback, so COPY and the taps share one pass."""
+
+    def __init__(self, f, callback):
+        self.f = f
+        self.callback = callback
+
+    def read(self, size=-1):
+        data = self.f.read(size)
+        if data:
+            self.callback(data)
+        return data
+
+    def readline(self, size=-1):
+        data = self.f.readline(size)
+        if data:
+            self.callback(data)
+        return data
@@ -0,0 +1,473 @@
+"""
+Self-contained SQLite snapshot of the webservice and UniProt tables, for offline and edge serving.
+
+`build` reads the same inputs as the loaders, the TSVs of TABLE_CONFIG and the
+UniProt exports, and writes one file with the tables, the indexes of
+TABLE_CONFIG and the ones the app's searches need:
+
+    interactions, annotations, complexes, enz_sub, intercell   (TABLE_CONFIG)
+    complex_members, resource_names, protein_summary
+    uniprot_proteins, uniprot_protein_details, uniprot_identifiers
+
+Column types map to SQLite ones: booleans are stored as 0/1, JSONB as text and
+`resource_ids` as a JSON array (query it with `json_each`). GIN indexes are
+left out. `uniprot_identifiers.identifier_value` uses NOCASE collation, so the
+prefix LIKE of the identifier search is an index range scan.
+
+`benchmark` runs the app's query shapes (see query_shapes.py) against the
+snapshot and the Postgres database with the same samples.
+"""
+import os
+import re
+import sys
+import csv
+import json
+import time
+import sqlite3
+from collections import Counter
+
+from row_taps import TRUE_VALUES
+from complex_members import ComplexMembersBuilder, MEMBERS_TABLE, MEMBERS_INDEXES, NULL
+from protein_summary import SUMMARY_TABLE, SUMMARY_COLUMNS, SUMMARY_INDEXES, SUMMARY_DIR, merge_partials
+from query_shapes import QUERY_SHAPES, render, make_samples, percentile
+from resource_names import ResourceNameResolver
+from webservice_loader import DATA_DIR, TABLE_CONFIG, RESOURCE_NAMES_TABLE
+from uniprot_simple_loader import (
+    INPUT_FILES, PROTEIN_COLUMNS, HOT_COLUMNS, DETAIL_COLUMNS,
+    PROTEINS_TABLE, DETAILS_TABLE, IDENTIFIERS_TABLE, extract_identifiers,
+)
+
+SNAPSHOT_PATH = os.path.join(DATA_DIR, "omnipath_snapshot.sqlite")
+BATCH_SIZE = 50000  # Rows per executemany
+BENCHMARK_SAMPLES = 200  # Samples run per query shape by the benchmark command
+
+csv.field_size_limit(sys.maxsize)
+
+SQLITE_TYPES = [
+    (re.compile(r"^SERIAL PRIMARY KEY"), "INTEGER PRIMARY KEY"),
+    (re.compile(r"^(SERIAL|INTEGER|SMALLINT|BIGINT|BOOLEAN)\b"), "INTEGER"),
+]
+
+UNIPROT_SCHEMAS = {
+    PROTEINS_TABLE: """
+        id INTEGER PRIMARY KEY,
+        entry TEXT NOT NULL,
+        entry_name TEXT,
+        protein_names TEXT,
+        length INTEGER,
+        mass INTEGER,
+        gene_names_primary TEXT,
+        gene_names_synonym TEXT,
+        organism_id INTEGER NOT NULL,
+        ec_number TEXT,
+        alphafolddb TEXT
+    """,
+    DETAILS_TABLE: "protein_id INTEGER PRIMARY KEY, organism_id INTEGER NOT NULL, "
+                   + ", ".join(f"{col} TEXT" for col in DETAIL_COLUMNS),
+    IDENTIFIERS_TABLE: """
+        id INTEGER PRIMARY KEY,
+        protein_id INTEGER NOT NULL,
+        uniprot_accession TEXT NOT NULL,
+        identifier_value TEXT NOT NULL COLLATE NOCASE,
+        identifier_type TEXT NOT NULL,
+        taxon_id INTEGER NOT NULL,
+        ambiguity INTEGER
+    """,
+}
+UNIPROT_INDEXES = [
+    f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{PROTEINS_TABLE}_entry ON {PROTEINS_TABLE} (entry, organism_id);",
+    f"CREATE INDEX IF NOT EXISTS idx_{IDENTIFIERS_TABLE}_protein_id ON {IDENTIFIERS_TABLE} (protein_id);",
+    # Uses the column's NOCASE collation, so it serves the case-insensitive prefix LIKE
+    f"CREATE INDEX IF NOT EXISTS idx_{IDENTIFIERS_TABLE}_value_prefix ON {IDENTIFIERS_TABLE} (identifier_value);",
+]
+
+def sqlite_columns(table_schema):
+    """(column, SQLite definition, converter) for the columns of a TABLE_CONFIG schema."""
+    columns = []
+    for line in table_schema.strip().splitlines():
+        name, _, sql_type = line.strip().rstrip(",").partition(" ")
+        name = name.strip('"')
+        sql_type = sql_type.upper()
+        if name == "resource_ids":
+            columns.append((name, "TEXT", None))  # JSON array, filled from the source column
+            continue
+        definition = next((t for pattern, t in SQLITE_TYPES if pattern.match(sql_type)), "TEXT")
+        if sql_type.startswith("BOOLEAN"):
+            convert = lambda value: int(value.lower() in TRUE_VALUES) if value else None
+        elif definition == "INTEGER":
+            convert = lambda value: int(value) if value else None
+        else:
+            convert = lambda value: value if value else None
+        columns.append((name, definition, convert))
+    return columns
+
+def sqlite_indexes(indexes):
+    """The index statements of a table that SQLite supports."""
+    return [index_sql for index_sql in indexes if "USING GIN" not in index_sql.upper()]
+
+def quote(name):
+    return f'"{name}"'
+
+def create_table(conn, table_name, columns):
+    conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+    conn.execute(f"CREATE TABLE {table_name} ({', '.join(f'{quote(n)} {d}' for n, d, _ in columns)})")
+
+def insert_rows(conn, table_name, column_names, rows):
+    """Inserts an iterable of row tuples in batches, returns the row count."""
+    insert_sql = (f"INSERT INTO {table_name} ({', '.join(map(quote, column_names))}) "
+                  f"VALUES ({', '.join('?' * len(column_names))})")
+    count = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            conn.executemany(insert_sql, batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        conn.executemany(insert_sql, batch)
+        count += len(batch)
+    return count
+
+class SnapshotMembersBuilder(ComplexMembersBuilder):
+    """Writes the complex members and component hashes into the snapshot instead of Postgres."""
+
+    def store(self, conn, table_name="complexes"):
+        parse = lambda line: [None if value == NULL else value for value in line.rstrip("\n").split("\t")]
+        self.members.seek(0)
+        self.hashes.seek(0)
+        conn.execute(f"DROP TABLE IF EXISTS {MEMBERS_TABLE}")
+        conn.execute(f"CREATE TABLE {MEMBERS_TABLE} (complex_id INTEGER NOT NULL, position INTEGER NOT NULL, "
+                     f"uniprot TEXT NOT NULL, genesymbol TEXT, stoichiometry INTEGER)")
+        insert_rows(conn, MEMBERS_TABLE, ["complex_id", "position", "uniprot", "genesymbol", "stoichiometry"],
+                    map(parse, self.members))
+        for index_sql in MEMBERS_INDEXES:
+            conn.execute(index_sql)
+        conn.executemany(f"UPDATE {table_name} SET component_hash = ? WHERE id = ?",
+                         ((int(h), int(i)) for i, h in map(parse, self.hashes)))
+        print(f"  {self.n_members:,} members of {self.n_complexes:,} complexes in '{MEMBERS_TABLE}'")
+
+def load_table(conn, config, resolver):
+    """Creates a TABLE_CONFIG table in the snapshot and loads its TSV from DATA_DIR."""
+    table_name = config["table"]
+    file_path = os.path.join(DATA_DIR, config["file"])
+    if not os.path.exists(file_path):
+        print(f"Warning: File not found at '{file_path}', skipping '{table_name}'")
+        return False
+
+    start_time = time.time()
+    columns = sqlite_columns(config["schema"])
+    create_table(conn, table_name, columns)
+    converters = {name: convert for name, _, convert in columns}
+
+    with open(file_path, "r", encoding="utf-8", newline="") as f:
+        # Same quoting rules as the loader's COPY ... WITH CSV DELIMITER E'\t'
+        reader = csv.reader(f, delimiter="\t")
+        header = next(reader)
+        convert = [converters[column] for column in header]
+        members = SnapshotMembersBuilder(header) if table_name == "complexes" else None
+        source = config.get("source", {})
+        source_pos = header.index(source["column"]) if source.get("separator") else None
+        labels = Counter()
+
+        def rows():
+            for row in reader:
+                if not row:
+                    continue
+                if members:
+                    members.add_row(row)
+                values = tuple(c(value) for c, value in zip(convert, row))
+                if source_pos is None:
+                    yield values
+                    continue
+                sources = [label for label in row[source_pos].split(source["separator"]) if label]
+                labels.update(sources)
+                resource_ids = sorted({resolver.resource_id(label) for label in sources})
+                yield values + ((json.dumps(resource_ids) if row[source_pos] else None),)
+
+        names = header + (["resource_ids"] if source_pos is not None else [])
+        row_count = insert_rows(conn, table_name, names, rows())
+
+    if source:
+        if source_pos is None:
+            labels.update(label for (label,) in conn.execute(
+                f"SELECT {quote(source['column'])} FROM {table_name} WHERE {quote(source['column'])} IS NOT NULL"))
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {RESOURCE_NAMES_TABLE} (source_label, resource_id, description_key) VALUES (?, ?, ?)",
+            [(label, *resolver.resolve(label)) for label in labels],
+        )
+    if members:
+        members.store(conn)
+    for index_sql in sqlite_indexes(config.get("indexes", [])):
+        conn.execute(index_sql)
+    conn.commit()
+    print(f"  {row_count:,} rows in '{table_name}' in {time.time() - start_time:.2f} seconds")
+    return True
+
+def load_uniprot(conn, input_files, details=True):
+    """Loads the UniProt exports into the protein, details and identifier tables."""
+    start_time = time.time()
+    for table_name, schema in UNIPROT_SCHEMAS.items():
+        conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+        if details or table_name != DETAILS_TABLE:
+            conn.execute(f"CREATE TABLE {table_name} ({schema})")
+
+    column_index = {col: i for i, (_, col) in enumerate(PROTEIN_COLUMNS)}
+    hot_positions = [column_index[col] for col in HOT_COLUMNS]
+    detail_positions = [column_index[col] for col in DETAIL_COLUMNS]
+    integer_positions = (column_index["length"], column_index["mass"])
+    organism_pos = column_index["organism_id"]
+    proteins, identifiers = [], []
+    protein_id = 0
+    n_proteins = n_identifiers = 0
+    seen = set()  # Entries of overlapping exports are loaded from the first one, as by the loader
+
+    def flush():
+        conn.executemany(
+            f"INSERT INTO {PROTEINS_TABLE} (id, {', '.join(HOT_COLUMNS)}) VALUES ({', '.join('?' * (len(HOT_COLUMNS) + 1))})",
+            [p[0] for p in proteins],
+        )
+        if details:
+            conn.executemany(
+                f"INSERT INTO {DETAILS_TABLE} (protein_id, organism_id, {', '.join(DETAIL_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * (len(DETAIL_COLUMNS) + 2))})",
+                [p[1] for p in proteins],
+            )
+        conn.executemany(
+            f"INSERT INTO {IDENTIFIERS_TABLE} (protein_id, uniprot_accession, identifier_value, identifier_type, taxon_id) "
+            f"VALUES (?, ?, ?, ?, ?)",
+            identifiers,
+        )
+        proteins.clear()
+        identifiers.clear()
+
+    for input_file in input_files:
+        print(f"  Reading '{os.path.basename(input_file)}'...")
+        with open(input_file, "r", encoding="utf-8") as f:
+            header = f.readline().rstrip("\r\n").split("\t")
+            positions = [header.index(col) if col in header else None for col, _ in PROTEIN_COLUMNS]
+            for line in f:
+                fields = line.rstrip("\r\n").split("\t")
+                row = [fields[pos] if pos is not None and pos < len(fields) else "" for pos in positions]
+                entry, taxon = row[0], row[organism_pos].strip()
+                if not entry or not taxon.isdigit() or entry in seen:
+                    continue
+                seen.add(entry)
+                for i in integer_positions:
+                    row[i] = int(row[i]) if row[i].isdigit() else None
+                row = [value if value != "" else None for value in row]
+                row[organism_pos] = taxon = int(taxon)
+                protein_id += 1
+                proteins.append((
+                    [protein_id] + [row[i] for i in hot_positions],
+                    [protein_id, taxon] + [row[i] for i in detail_positions],
+                ))
+                found = extract_identifiers(
+                    entry,
+                    row[column_index["gene_names_primary"]] or "",
+                    row[column_index["gene_names_synonym"]] or "",
+                    row[column_index["protein_names"]] or "",
+                )
+                identifiers.extend((protein_id, entry, value, id_type, taxon) for value, id_type in found)
+                n_proteins += 1
+                n_identifiers += len(found)
+                if len(identifiers) >= BATCH_SIZE:
+                    flush()
+    flush()
+
+    # Same normalization as compute_identifier_ambiguity, Python's lower() matches Postgres' on Unicode
+    conn.create_function("py_lower", 1, lambda value: value.lower() if value is not None else None, deterministic=True)
+    conn.execute(f"""
+        CREATE TEMP TABLE identifier_ambiguity AS
+        SELECT taxon_id, py_lower(identifier_value) AS normalized_value,
+               COUNT(DISTINCT uniprot_accession) AS accessions
+        FROM {IDENTIFIERS_TABLE}
+        GROUP BY taxon_id, py_lower(identifier_value)
+    """)
+    conn.execute("CREATE INDEX temp.idx_identifier_ambiguity ON identifier_ambiguity (taxon_id, normalized_value)")
+    conn.execute(f"""
+        UPDATE {IDENTIFIERS_TABLE} SET ambiguity = (
+            SELECT a.accessions FROM identifier_ambiguity a
+            WHERE a.taxon_id = {IDENTIFIERS_TABLE}.taxon_id
+              AND a.normalized_value = py_lower({IDENTIFIERS_TABLE}.identifier_value)
+        )
+    """)
+    conn.execute("DROP TABLE identifier_ambiguity")
+    for index_sql in UNIPROT_INDEXES:
+        conn.execute(index_sql)
+    conn.commit()
+    print(f"  {n_proteins:,} proteins and {n_identifiers:,} identifiers in {time.time() - start_time:.2f} seconds")
+
+def load_protein_summary(conn):
+    """Writes `protein_summary` from the partials saved by the last webservice load, if any."""
+    if not os.path.isdir(SUMMARY_DIR):
+        print(f"Warning: no protein summary counts in '{SUMMARY_DIR}', skipping '{SUMMARY_TABLE}'")
+        return
+    rows = merge_partials(SUMMARY_DIR)
+    conn.execute(f"DROP TABLE IF EXISTS {SUMMARY_TABLE}")
+    conn.execute(f"CREATE TABLE {SUMMARY_TABLE} (uniprot TEXT PRIMARY KEY, genesymbol TEXT, "
+                 + ", ".join(f"{column} {'TEXT' if column.endswith(('_by_dataset', '_by_resource', '_categories')) else 'INTEGER'}"
+                             for column in SUMMARY_COLUMNS[2:]) + ")")
+    insert_rows(conn, SUMMARY_TABLE, SUMMARY_COLUMNS, (
+        tuple(json.dumps(row[c], separators=(",", ":")) if isinstance(row[c], (dict, list)) else row[c]
+              for c in SUMMARY_COLUMNS)
+        for row in rows
+    ))
+    for index_sql in SUMMARY_INDEXES:
+        conn.execute(index_sql)
+    conn.commit()
+    print(f"  {len(rows):,} rows in '{SUMMARY_TABLE}'")
+
+def build_snapshot(path=SNAPSHOT_PATH, input_files=INPUT_FILES, tables=None, details=True):
+    """Builds the snapshot into `<path>.partial` and replaces `path` once complete."""
+    print(f"Building snapshot '{path}'...")
+    start_time = time.time()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    staging = f"{path}.partial"
+    if os.path.exists(staging):
+        os.remove(staging)
+
+    conn = sqlite3.connect(staging)
+    try:
+        # Nothing to recover if the build fails, the staging file is discarded
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA cache_size = -262144")
+        conn.execute(f"""
+            CREATE TABLE {RESOURCE_NAMES_TABLE} (
+                source_label TEXT PRIMARY KEY,
+                resource_id TEXT NOT NULL,
+                description_key TEXT
+            )
+        """)
+        conn.execute(f"CREATE INDEX idx_{RESOURCE_NAMES_TABLE}_resource_id ON {RESOURCE_NAMES_TABLE} (resource_id);")
+        resolver = ResourceNameResolver()
+
+        for table_key, config in TABLE_CONFIG.items():
+            if tables and table_key not in tables:
+                continue
+            print(f"Loading '{config['table']}'...")
+            load_table(conn, config, resolver)
+
+        present = [f for f in input_files if os.path.exists(f)]
+        for missing in sorted(set(input_files) - set(present)):
+            print(f"Warning: UniProt export not found at '{missing}'")
+        if present:
+            print("Loading UniProt proteins and identifiers...")
+            load_uniprot(conn, present, details)
+
+        print("Loading protein summary...")
+        load_protein_summary(conn)
+
+        print("Analyzing...")
+        conn.execute("ANALYZE")
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    os.replace(staging, path)
+    print(f"Snapshot of {os.path.getsize(path) / 1024 / 1024:.1f} MB built in {time.time() - start_time:.2f} seconds")
+
+def open_snapshot(path=SNAPSHOT_PATH):
+    """Read-only connection to a snapshot, as used for serving."""
+    return sqlite3.connect(f"file:{path}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+
+def snapshot_tables(conn):
+    return {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+def time_shape(execute, shape, samples, dialect):
+    """Sorted latencies in ms and row counts of a shape over the samples."""
+    latencies, counts = [], []
+    for sample in samples:
+        query, params = render(shape, sample, dialect)
+        start = time.perf_counter()
+        rows = execute(query, params)
+        latencies.append((time.perf_counter() - start) * 1000)
+        counts.append(len(rows))
+    return sorted(latencies), counts
+
+def benchmark(path=SNAPSHOT_PATH, n_samples=BENCHMARK_SAMPLES, seed=0, postgres=True):
+    """Runs the app's query shapes against the snapshot and, with `postgres`, the Postgres database."""
+    conn = open_snapshot(path)
+    tables = snapshot_tables(conn)
+    proteins = conn.execute("""
+        SELECT source, source_genesymbol FROM interactions
+        UNION SELECT target, target_genesymbol FROM interactions
+    """).fetchall() if "interactions" in tables else []
+    samples = make_samples(proteins, n_samples, seed)
+    if not samples:
+        print("No proteins to sample in the snapshot's interactions")
+        return
+
+    def run_sqlite(query, params):
+        return conn.execute(query, params).fetchall()
+
+    pg_conn = None
+    if postgres:
+        from webservice_loader import check_environment, get_db_connection
+        check_environment()
+        pg_conn = get_db_connection()
+        pg_conn.autocommit = True
+
+    def run_postgres(query, params):
+        with pg_conn.cursor() as cur:
+            cur.execute(query, params)
+            return cur.fetchall()
+
+    print(f"\n{'='*60}")
+    print(f"Query shapes over {len(samples)} samples (ms)")
+    print(f"{'='*60}")
+    print(f"{'shape':<20} {'engine':<9} {'p50':>8} {'p95':>8} {'mean':>8}")
+    try:
+        for name, shape in QUERY_SHAPES.items():
+            if not set(shape["tables"]) <= tables:
+                print(f"{name:<20} skipped, snapshot has no {', '.join(sorted(set(shape['tables']) - tables))}")
+                continue
+            engines = [("sqlite", run_sqlite, "sqlite")]
+            if pg_conn:
+                engines.append(("postgres", run_postgres, "postgres"))
+            results = {}
+            for engine, execute, dialect in engines:
+                execute(*render(shape, samples[0], dialect))  # Warm up
+                latencies, counts = time_shape(execute, shape, samples, dialect)
+                results[engine] = counts
+                print(f"{name:<20} {engine:<9} {percentile(latencies, 50):>8.3f} {percentile(latencies, 95):>8.3f} "
+                      f"{sum(latencies) / len(latencies):>8.3f}")
+            if len(results) == 2 and results["sqlite"] != results["postgres"]:
+                differing = sum(a != b for a, b in zip(results["sqlite"], results["postgres"]))
+                print(f"{'':<20} warning: row counts differ for {differing} samples")
+    finally:
+        conn.close()
+        if pg_conn:
+            pg_conn.close()
+
+def main():
+    """Builds the snapshot or benchmarks it against Postgres."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Self-contained SQLite snapshot for offline and edge serving")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Build the snapshot from the TSVs and UniProt exports")
+    build.add_argument("--output", default=SNAPSHOT_PATH)
+    build.add_argument("--input", nargs="+", default=INPUT_FILES, help="UniProt TSV exports")
+    build.add_argument("--table", nargs="+", choices=list(TABLE_CONFIG), help="Only these TABLE_CONFIG tables")
+    build.add_argument("--no-details", action="store_true", help="Leave out the large UniProt detail columns")
+    bench = subparsers.add_parser("benchmark", help="Time the app's query shapes on the snapshot and Postgres")
+    bench.add_argument("--snapshot", default=SNAPSHOT_PATH)
+    bench.add_argument("--samples", type=int, default=BENCHMARK_SAMPLES)
+    bench.add_argument("--seed", type=int, default=0)
+    bench.add_argument("--snapshot-only", action="store_true", help="Don't run the shapes on Postgres")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "build":
+            build_snapshot(args.output, args.input, args.table, details=not args.no_details)
+        else:
+            benchmark(args.snapshot, args.samples, args.seed, postgres=not args.snapshot_only)
+    except KeyboardInterrupt:
+        print("\nOperation cancelled by user.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
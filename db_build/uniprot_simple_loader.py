@@ -1,10 +1,14 @@
+import io
 import os
+import re
 import sys
-import csv
 import time
+import queue
+import threading
+import collections
+from concurrent.futures import ProcessPoolExecutor
 import psycopg2
 from psycopg2 import sql
-from psycopg2.extras import execute_values
 from dotenv import load_dotenv
 from urllib.parse import urlparse
 
@@ -29,21 +33,88 @@ if DATABASE_URL:
 else:
     DB_HOST = DB_PORT = DB_USER = DB_PASSWORD = DB_NAME = None
 
-INPUT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "uniprotkb_taxonomy_id_9606_OR_taxonomy_2025_07_18.tsv")
-BATCH_SIZE = 1000  # Insert rows in batches for better performance
+# UniProt exports to load, can be overridden with --input
+INPUT_FILES = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "uniprotkb_taxonomy_id_9606_OR_taxonomy_2025_07_18.tsv"),
+]
+CHUNK_SIZE = 16 * 1024 * 1024  # Bytes of TSV parsed per worker task
+PARSE_WORKERS = max(1, (os.cpu_count() or 2) - 1)  # Processes parsing chunks
+COPY_CONNECTIONS = 2  # Connections writing parsed chunks with COPY
+QUEUE_DEPTH = 2  # Parsed chunks buffered per worker/connection
+BENCHMARK_SAMPLES = 500  # Random accessions looked up by the benchmark command
+IDENTIFIER_BATCH_SIZE = 50000  # Proteins per COPY when repopulating the identifiers
 
 # Table names
 PROTEINS_TABLE = "uniprot_proteins"
 IDENTIFIERS_TABLE = "uniprot_identifiers"
+DETAILS_TABLE = "uniprot_protein_details"
+CHECKPOINTS_TABLE = "uniprot_load_checkpoints"
+
+# TSV header to column mapping
+PROTEIN_COLUMNS = [
+    ('Entry', 'entry'),
+    ('Entry Name', 'entry_name'),
+    ('Protein names', 'protein_names'),
+    ('Length', 'length'),
+    ('Mass', 'mass'),
+    ('Sequence', 'sequence'),
+    ('Gene Names (primary)', 'gene_names_primary'),
+    ('Gene Names (synonym)', 'gene_names_synonym'),
+    ('Organism (ID)', 'organism_id'),
+    ('Involvement in disease', 'involvement_in_disease'),
+    ('Mutagenesis', 'mutagenesis'),
+    ('Subcellular location [CC]', 'subcellular_location'),
+    ('Post-translational modification', 'post_translational_modification'),
+    ('PubMed ID', 'pubmed_id'),
+    ('Function [CC]', 'function_cc'),
+    ('Ensembl', 'ensembl'),
+    ('KEGG', 'kegg'),
+    ('Pathway', 'pathway'),
+    ('Activity regulation', 'activity_regulation'),
+    ('Keywords', 'keywords'),
+    ('EC number', 'ec_number'),
+    ('Gene Ontology (GO)', 'gene_ontology'),
+    ('Transmembrane', 'transmembrane'),
+    ('Protein families', 'protein_families'),
+    ('RefSeq', 'refseq'),
+    ('AlphaFoldDB', 'alphafolddb'),
+    ('PDB', 'pdb'),
+    ('ChEMBL', 'chembl'),
+    ('PhosphoSitePlus', 'phosphositeplus'),
+    ('SIGNOR', 'signor'),
+    ('PathwayCommons', 'pathwaycommons'),
+    ('IntAct', 'intact'),
+    ('BioGRID', 'biogrid'),
+    ('ComplexPortal', 'complexportal'),
+]
+# Narrow columns kept in the proteins table, everything else is stored
+# in the details table so name and ID lookups don't read TOASTed text
+HOT_COLUMNS = [
+    'entry', 'entry_name', 'protein_names', 'length', 'mass',
+    'gene_names_primary', 'gene_names_synonym', 'organism_id',
+    'ec_number', 'alphafolddb',
+]
+DETAIL_COLUMNS = [col for _, col in PROTEIN_COLUMNS if col not in HOT_COLUMNS]
+_COLUMN_INDEX = {col: i for i, (_, col) in enumerate(PROTEIN_COLUMNS)}
+HOT_POSITIONS = [_COLUMN_INDEX[col] for col in HOT_COLUMNS]
+DETAIL_POSITIONS = [_COLUMN_INDEX[col] for col in DETAIL_COLUMNS]
+INTEGER_COLUMNS = (_COLUMN_INDEX['length'], _COLUMN_INDEX['mass'])
+ORGANISM_COLUMN = _COLUMN_INDEX['organism_id']
+GENE_PRIMARY_COLUMN = _COLUMN_INDEX['gene_names_primary']
+GENE_SYNONYM_COLUMN = _COLUMN_INDEX['gene_names_synonym']
+PROTEIN_NAMES_COLUMN = _COLUMN_INDEX['protein_names']
+PROTEIN_ALTERNATIVE_RE = re.compile(r'\(([^)]+)\)')
 
 # --- Check Environment Variables ---
-if not DATABASE_URL:
-    print(f"Error: DATABASE_URL{'_PROD' if NODE_ENV == 'production' else '_DEV'} is not set in .env file.")
-    print(f"Current NODE_ENV: {NODE_ENV}")
-    sys.exit(1)
+# Called by the commands connecting to the database, so the configuration can be imported without one
+def check_environment():
+    if not DATABASE_URL:
+        print(f"Error: DATABASE_URL{'_PROD' if NODE_ENV == 'production' else '_DEV'} is not set in .env file.")
+        print(f"Current NODE_ENV: {NODE_ENV}")
+        sys.exit(1)
 
-print(f"Environment: {NODE_ENV}")
-print(f"Connecting to: {DB_HOST}:{DB_PORT}/{DB_NAME} as {DB_USER}")
+    print(f"Environment: {NODE_ENV}")
+    print(f"Connecting to: {DB_HOST}:{DB_PORT}/{DB_NAME} as {DB_USER}")
 
 # --- Database Operations ---
 
@@ -62,7 +133,7 @@ def get_db_connection():
         print(f"Error connecting to the database: {e}")
         sys.exit(1)
 
-def setup_database(conn):
+def setup_database(conn, sequence_compression=None):
     """Creates the tables without indexes."""
     print(f"Setting up database tables...")
     with conn.cursor() as cur:
@@ -74,62 +145,21 @@ def setup_database(conn):
             # Drop existing tables if they exist with wrong schema
             print("Dropping existing tables if they exist...")
             cur.execute(sql.SQL("DROP TABLE IF EXISTS {} CASCADE;").format(sql.Identifier(IDENTIFIERS_TABLE)))
+            cur.execute(sql.SQL("DROP TABLE IF EXISTS {} CASCADE;").format(sql.Identifier(DETAILS_TABLE)))
             cur.execute(sql.SQL("DROP TABLE IF EXISTS {} CASCADE;").format(sql.Identifier(PROTEINS_TABLE)))
             
-            # Create main proteins table with all columns
-            print(f"Creating table '{PROTEINS_TABLE}'...")
-            cur.execute(sql.SQL("""
-                CREATE TABLE IF NOT EXISTS {} (
-                    id SERIAL PRIMARY KEY,
-                    entry VARCHAR(30) UNIQUE NOT NULL,
-                    entry_name TEXT,
-                    protein_names TEXT,
-                    length INTEGER,
-                    mass INTEGER,
-                    sequence TEXT,
-                    gene_names_primary TEXT,
-                    gene_names_synonym TEXT,
-                    organism_id TEXT,
-                    involvement_in_disease TEXT,
-                    mutagenesis TEXT,
-                    subcellular_location TEXT,
-                    post_translational_modification TEXT,
-                    pubmed_id TEXT,
-                    function_cc TEXT,
-                    ensembl TEXT,
-                    kegg TEXT,
-                    pathway TEXT,
-                    activity_regulation TEXT,
-                    keywords TEXT,
-                    ec_number TEXT,
-                    gene_ontology TEXT,
-                    transmembrane TEXT,
-                    protein_families TEXT,
-                    refseq TEXT,
-                    alphafolddb VARCHAR(30),
-                    pdb TEXT,
-                    chembl TEXT,
-                    phosphositeplus TEXT,
-                    signor TEXT,
-                    pathwaycommons TEXT,
-                    intact TEXT,
-                    biogrid TEXT,
-                    complexportal TEXT
-                );
-            """).format(sql.Identifier(PROTEINS_TABLE)))
+            # Create narrow proteins table with names and short IDs
+            create_proteins_table(cur)
+            
+            # Create details table with the large text columns
+            create_details_table(cur, sequence_compression)
             
             # Create identifiers table for ID mapping
-            print(f"Creating table '{IDENTIFIERS_TABLE}'...")
-            cur.execute(sql.SQL("""
-                CREATE TABLE IF NOT EXISTS {} (
-                    id SERIAL PRIMARY KEY,
-                    protein_id INTEGER REFERENCES {} (id) ON DELETE CASCADE,
-                    uniprot_accession VARCHAR(30) NOT NULL,
-                    identifier_value TEXT NOT NULL,
-                    identifier_type VARCHAR(50) NOT NULL,
-                    taxon_id TEXT
-                );
-            """).format(sql.Identifier(IDENTIFIERS_TABLE), sql.Identifier(PROTEINS_TABLE)))
+            create_identifiers_table(cur)
+            
+            # Create the ingestion checkpoints table
+            cur.execute(sql.SQL("DROP TABLE IF EXISTS {};").format(sql.Identifier(CHECKPOINTS_TABLE)))
+            create_checkpoints_table(cur)
             
             conn.commit()
             print("Database tables created.")
@@ -139,227 +169,648 @@ def setup_database(conn):
             conn.rollback()
             sys.exit(1)
 
+def create_proteins_table(cur):
+    """Creates the narrow proteins table with names and short IDs, partitioned by taxon."""
+    print(f"Creating table '{PROTEINS_TABLE}'...")
+    cur.execute(sql.SQL("""
+        CREATE TABLE IF NOT EXISTS {} (
+            id SERIAL,
+            entry VARCHAR(30) NOT NULL,
+            entry_name TEXT,
+            protein_names TEXT,
+            length INTEGER,
+            mass INTEGER,
+            gene_names_primary TEXT,
+            gene_names_synonym TEXT,
+            organism_id INTEGER NOT NULL,
+            ec_number TEXT,
+            alphafolddb VARCHAR(30),
+            PRIMARY KEY (organism_id, id),
+            UNIQUE (organism_id, entry)
+        ) PARTITION BY LIST (organism_id);
+    """).format(sql.Identifier(PROTEINS_TABLE)))
+
+def create_details_table(cur, sequence_compression=None):
+    """Creates the details table holding the large, rarely read protein columns.
+
+    `sequence_compression` ('pglz' or 'lz4') sets the TOAST compression of
+    the sequence column.
+    """
+    print(f"Creating table '{DETAILS_TABLE}'...")
+    cur.execute(sql.SQL("""
+        CREATE TABLE IF NOT EXISTS {} (
+            protein_id INTEGER NOT NULL,
+            organism_id INTEGER NOT NULL,
+            sequence TEXT {},
+            involvement_in_disease TEXT,
+            mutagenesis TEXT,
+            subcellular_location TEXT,
+            post_translational_modification TEXT,
+            pubmed_id TEXT,
+            function_cc TEXT,
+            ensembl TEXT,
+            kegg TEXT,
+            pathway TEXT,
+            activity_regulation TEXT,
+            keywords TEXT,
+            gene_ontology TEXT,
+            transmembrane TEXT,
+            protein_families TEXT,
+            refseq TEXT,
+            pdb TEXT,
+            chembl TEXT,
+            phosphositeplus TEXT,
+            signor TEXT,
+            pathwaycommons TEXT,
+            intact TEXT,
+            biogrid TEXT,
+            complexportal TEXT,
+            PRIMARY KEY (organism_id, protein_id),
+            FOREIGN KEY (organism_id, protein_id) REFERENCES {} (organism_id, id) ON DELETE CASCADE
+        ) PARTITION BY LIST (organism_id);
+    """).format(
+        sql.Identifier(DETAILS_TABLE),
+        sql.SQL("COMPRESSION {}").format(sql.SQL(sequence_compression)) if sequence_compression else sql.SQL(""),
+        sql.Identifier(PROTEINS_TABLE),
+    ))
+
+def create_identifiers_table(cur):
+    """Creates the identifiers table, partitioned by taxon like the proteins table."""
+    print(f"Creating table '{IDENTIFIERS_TABLE}'...")
+    cur.execute(sql.SQL("""
+        CREATE TABLE IF NOT EXISTS {} (
+            id SERIAL,
+            protein_id INTEGER NOT NULL,
+            uniprot_accession VARCHAR(30) NOT NULL,
+            identifier_value TEXT NOT NULL,
+            identifier_type VARCHAR(50) NOT NULL,
+            taxon_id INTEGER NOT NULL,
+            ambiguity INTEGER NOT NULL DEFAULT 1,
+            PRIMARY KEY (taxon_id, id),
+            FOREIGN KEY (taxon_id, protein_id) REFERENCES {} (organism_id, id) ON DELETE CASCADE
+        ) PARTITION BY LIST (taxon_id);
+    """).format(sql.Identifier(IDENTIFIERS_TABLE), sql.Identifier(PROTEINS_TABLE)))
+
+def partition_name(table, taxon):
+    """Name of the per-taxon partition of a table."""
+    return f"{table}_{taxon}"
+
+def create_partitions(cur, taxon, tables=(PROTEINS_TABLE, DETAILS_TABLE, IDENTIFIERS_TABLE)):
+    """Creates the partitions holding one taxon."""
+    for table in tables:
+        cur.execute(sql.SQL("CREATE TABLE IF NOT EXISTS {} PARTITION OF {} FOR VALUES IN ({});").format(
+            sql.Identifier(partition_name(table, taxon)),
+            sql.Identifier(table),
+            sql.Literal(int(taxon)),
+        ))
+
 def populate_identifiers(conn):
-    """Populates the identifiers table using SQL queries from the proteins table."""
+    """Populates the identifiers table from the proteins table.
+
+    Proteins are streamed through `extract_identifiers`, the same rules the
+    ingestion applies while parsing, and the identifiers are written with COPY.
+    """
     print("Populating identifiers table...")
     start_time = time.time()
+    counts = collections.Counter()
+    identifier_columns = sql.SQL(', ').join(map(sql.Identifier, [
+        'protein_id', 'uniprot_accession', 'identifier_value', 'identifier_type', 'taxon_id'
+    ]))
+    
+    try:
+        with conn.cursor(name='identifier_proteins') as proteins, conn.cursor() as cur:
+            proteins.itersize = IDENTIFIER_BATCH_SIZE
+            proteins.execute(sql.SQL("""
+                SELECT id, entry, organism_id, gene_names_primary, gene_names_synonym, protein_names
+                FROM {} WHERE entry IS NOT NULL AND entry != ''
+            """).format(sql.Identifier(PROTEINS_TABLE)))
+            while True:
+                rows = proteins.fetchmany(IDENTIFIER_BATCH_SIZE)
+                if not rows:
+                    break
+                buf = []
+                for protein_id, entry, taxon, gene_primary, gene_synonyms, protein_names in rows:
+                    for value, id_type in extract_identifiers(entry, gene_primary or '', gene_synonyms or '', protein_names or ''):
+                        buf.append('%u\t%s\t%s\t%s\t%u\n' % (
+                            protein_id, copy_escape(entry), copy_escape(value), id_type, taxon,
+                        ))
+                        counts[id_type] += 1
+                cur.copy_expert(sql.SQL("COPY {} ({}) FROM STDIN").format(
+                    sql.Identifier(IDENTIFIERS_TABLE), identifier_columns,
+                ).as_string(conn), io.StringIO(''.join(buf)))
+                print(f"  Identifiers: {sum(counts.values())}...")
+        conn.commit()
+        
+    except psycopg2.Error as e:
+        print(f"Error during identifier population: {e}")
+        conn.rollback()
+        sys.exit(1)
+    
+    end_time = time.time()
+    print(f"Identifiers populated successfully:")
+    print(f"  UniProt IDs: {counts['uniprot_accession']}")
+    print(f"  Primary gene names: {counts['gene_primary']}")
+    print(f"  Gene synonyms: {counts['gene_synonym']}")
+    print(f"  Primary protein names: {counts['protein_primary']}")
+    print(f"  Parenthetical protein names: {counts['protein_alternative']}")
+    print(f"  Total identifiers: {sum(counts.values())}")
+    print(f"  Time taken: {end_time - start_time:.2f} seconds")
+
+def compute_identifier_ambiguity(conn):
+    """Stores for every identifier how many accessions share its normalized value.
+
+    Values are normalized to lower case and counted within each taxon
+    partition, so the search can rank unambiguous matches first without
+    fetching the alternatives. Identifiers are loaded with an ambiguity of 1,
+    only the rows of values shared by several accessions are updated.
+    """
+    print("Computing identifier ambiguity counts...")
+    start_time = time.time()
     
     with conn.cursor() as cur:
         try:
-            # 1. UniProt IDs (entry column)
-            print("  Adding UniProt IDs...")
-            cur.execute(sql.SQL("""
-                INSERT INTO {} (protein_id, uniprot_accession, identifier_value, identifier_type, taxon_id)
-                SELECT id, entry, entry, 'uniprot_accession', organism_id FROM {}
-                WHERE entry IS NOT NULL AND entry != ''
-            """).format(sql.Identifier(IDENTIFIERS_TABLE), sql.Identifier(PROTEINS_TABLE)))
-            uniprot_count = cur.rowcount
-            
-            # 2. Primary gene names
-            print("  Adding primary gene names...")
-            cur.execute(sql.SQL("""
-                INSERT INTO {} (protein_id, uniprot_accession, identifier_value, identifier_type, taxon_id)
-                SELECT id, entry, gene_names_primary, 'gene_primary', organism_id FROM {}
-                WHERE gene_names_primary IS NOT NULL AND gene_names_primary != ''
-            """).format(sql.Identifier(IDENTIFIERS_TABLE), sql.Identifier(PROTEINS_TABLE)))
-            gene_primary_count = cur.rowcount
-            
-            # 3. Gene synonyms (split space-separated)
-            print("  Adding gene synonyms...")
-            cur.execute(sql.SQL("""
-                INSERT INTO {} (protein_id, uniprot_accession, identifier_value, identifier_type, taxon_id)
-                SELECT id, entry, trim(synonym), 'gene_synonym', organism_id
-                FROM (
-                    SELECT id, entry, organism_id, unnest(string_to_array(gene_names_synonym, ' ')) as synonym
-                    FROM {}
-                    WHERE gene_names_synonym IS NOT NULL AND gene_names_synonym != ''
-                ) subq
-                WHERE trim(synonym) != ''
-            """).format(sql.Identifier(IDENTIFIERS_TABLE), sql.Identifier(PROTEINS_TABLE)))
-            gene_synonym_count = cur.rowcount
-            
-            # 4. Protein names (extract primary name and parenthetical names)
-            print("  Adding protein names...")
-            # First, add the primary protein name (everything before first parenthesis)
-            cur.execute(sql.SQL("""
-                INSERT INTO {} (protein_id, uniprot_accession, identifier_value, identifier_type, taxon_id)
-                SELECT id, entry,
-                       CASE 
-                           WHEN position('(' in protein_names) > 0 THEN 
-                               trim(substring(protein_names from 1 for position('(' in protein_names) - 1))
-                           ELSE trim(protein_names)
-                       END,
-                       'protein_primary', organism_id
-                FROM {}
-                WHERE protein_names IS NOT NULL AND protein_names != ''
-                AND CASE 
-                        WHEN position('(' in protein_names) > 0 THEN 
-                            trim(substring(protein_names from 1 for position('(' in protein_names) - 1))
-                        ELSE trim(protein_names)
-                    END != ''
-            """).format(sql.Identifier(IDENTIFIERS_TABLE), sql.Identifier(PROTEINS_TABLE)))
-            protein_primary_count = cur.rowcount
-            
-            # Then, add parenthetical protein names
-            cur.execute(sql.SQL("""
-                INSERT INTO {} (protein_id, uniprot_accession, identifier_value, identifier_type, taxon_id)
-                SELECT id, entry,
-                       trim(regexp_replace(match[1], '^\\s*|\\s*$', '', 'g')),
-                       'protein_alternative', organism_id
-                FROM (
-                    SELECT id, entry, organism_id, regexp_split_to_array(protein_names, '\\([^)]+\\)') as parts,
-                           regexp_matches(protein_names, '\\(([^)]+)\\)', 'g') as match
-                    FROM {}
-                    WHERE protein_names IS NOT NULL AND protein_names != ''
-                    AND protein_names ~ '\\([^)]+\\)'
-                ) subq
-                WHERE trim(regexp_replace(match[1], '^\\s*|\\s*$', '', 'g')) != ''
-            """).format(sql.Identifier(IDENTIFIERS_TABLE), sql.Identifier(PROTEINS_TABLE)))
-            protein_paren_count = cur.rowcount
-            
-            conn.commit()
-            
-            end_time = time.time()
-            total_identifiers = uniprot_count + gene_primary_count + gene_synonym_count + protein_primary_count + protein_paren_count
-            
-            print(f"Identifiers populated successfully:")
-            print(f"  UniProt IDs: {uniprot_count}")
-            print(f"  Primary gene names: {gene_primary_count}")
-            print(f"  Gene synonyms: {gene_synonym_count}")
-            print(f"  Primary protein names: {protein_primary_count}")
-            print(f"  Parenthetical protein names: {protein_paren_count}")
-            print(f"  Total identifiers: {total_identifiers}")
-            print(f"  Time taken: {end_time - start_time:.2f} seconds")
+            cur.execute("SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = %s::regclass", (IDENTIFIERS_TABLE,))
+            partitions = [row[0] for row in cur.fetchall()]
+            for partition in partitions:
+                cur.execute(sql.SQL("""
+                    UPDATE {0} i SET ambiguity = c.accessions
+                    FROM (
+                        SELECT lower(identifier_value) AS normalized_value,
+                               COUNT(DISTINCT uniprot_accession) AS accessions
+                        FROM {0}
+                        GROUP BY lower(identifier_value)
+                        HAVING COUNT(DISTINCT uniprot_accession) > 1
+                    ) c
+                    WHERE lower(i.identifier_value) = c.normalized_value
+                      AND i.ambiguity IS DISTINCT FROM c.accessions
+                """).format(sql.Identifier(partition)))
+                cur.execute(sql.SQL("SELECT COUNT(DISTINCT lower(identifier_value)) FILTER (WHERE ambiguity > 1) FROM {}").format(
+                    sql.Identifier(partition)))
+                print(f"  {partition}: {cur.fetchone()[0]} values map to more than one accession")
+                conn.commit()
             
         except psycopg2.Error as e:
-            print(f"Error during identifier population: {e}")
+            print(f"Error computing identifier ambiguity: {e}")
             conn.rollback()
             sys.exit(1)
-
-def ingest_proteins(conn):
-    """Reads the input file and inserts protein data into the database."""
-    print(f"Starting protein data ingestion from '{INPUT_FILE}'...")
-    start_time = time.time()
-    rows_processed = 0
-    proteins_inserted = 0
     
-    # Batch for proteins
-    proteins_batch = []
-    
-    # Check if file exists
-    if not os.path.exists(INPUT_FILE):
-        print(f"Error: Input file not found at '{INPUT_FILE}'")
-        sys.exit(1)
+    # Reclaim the dead copies of the updated rows for reuse and refresh the statistics
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            for partition in partitions:
+                cur.execute(sql.SQL("VACUUM ANALYZE {};").format(sql.Identifier(partition)))
+    finally:
+        conn.autocommit = False
     
+    end_time = time.time()
+    print(f"Identifier ambiguity computed in {end_time - start_time:.2f} seconds")
+
+def create_checkpoints_table(cur):
+    """Creates the table recording every committed chunk of the ingestion."""
+    cur.execute(sql.SQL("""
+        CREATE TABLE IF NOT EXISTS {} (
+            input_file TEXT NOT NULL,
+            file_index INTEGER NOT NULL,
+            n_files INTEGER NOT NULL,
+            chunk_size BIGINT NOT NULL,
+            chunk_start BIGINT NOT NULL,
+            chunk_end BIGINT NOT NULL,
+            first_row BIGINT NOT NULL,
+            line_count INTEGER NOT NULL,
+            rows_processed INTEGER NOT NULL,
+            proteins INTEGER NOT NULL,
+            identifiers INTEGER NOT NULL,
+            rows_skipped INTEGER NOT NULL,
+            committed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (input_file, chunk_start)
+        );
+    """).format(sql.Identifier(CHECKPOINTS_TABLE)))
+
+def load_checkpoints(conn, input_files, chunk_size):
+    """Reads the committed chunks of a previous run.
+
+    Returns the offset and row number to resume each file from (the end of
+    its last contiguously committed chunk), the chunks committed beyond that
+    point by other connections, and the counters accumulated so far.
+    """
     with conn.cursor() as cur:
-        try:
-            with open(INPUT_FILE, 'r', encoding='utf-8') as infile:
-                reader = csv.DictReader(infile, delimiter='\t')
-                
-                for row in reader:
-                    rows_processed += 1
-                    
-                    # Extract entry (UniProt accession)
-                    entry = row['Entry']
-                    if not entry:
-                        continue
-                    
-                    # Prepare main protein record with all columns
-                    protein_data = (
-                        entry,
-                        row.get('Entry Name', ''),
-                        row.get('Protein names', ''),
-                        int(row['Length']) if row.get('Length', '').isdigit() else None,
-                        int(row['Mass']) if row.get('Mass', '').isdigit() else None,
-                        row.get('Sequence', ''),
-                        row.get('Gene Names (primary)', ''),
-                        row.get('Gene Names (synonym)', ''),
-                        row.get('Organism (ID)', ''),
-                        row.get('Involvement in disease', ''),
-                        row.get('Mutagenesis', ''),
-                        row.get('Subcellular location [CC]', ''),
-                        row.get('Post-translational modification', ''),
-                        row.get('PubMed ID', ''),
-                        row.get('Function [CC]', ''),
-                        row.get('Ensembl', ''),
-                        row.get('KEGG', ''),
-                        row.get('Pathway', ''),
-                        row.get('Activity regulation', ''),
-                        row.get('Keywords', ''),
-                        row.get('EC number', ''),
-                        row.get('Gene Ontology (GO)', ''),
-                        row.get('Transmembrane', ''),
-                        row.get('Protein families', ''),
-                        row.get('RefSeq', ''),
-                        row.get('AlphaFoldDB', ''),
-                        row.get('PDB', ''),
-                        row.get('ChEMBL', ''),
-                        row.get('PhosphoSitePlus', ''),
-                        row.get('SIGNOR', ''),
-                        row.get('PathwayCommons', ''),
-                        row.get('IntAct', ''),
-                        row.get('BioGRID', ''),
-                        row.get('ComplexPortal', '')
-                    )
-                    proteins_batch.append(protein_data)
-                    proteins_inserted += 1
-                    
-                    # Insert batches when full
-                    if len(proteins_batch) >= BATCH_SIZE:
-                        insert_proteins_batch(cur, proteins_batch)
-                        conn.commit()
-                        
-                        print(f"  Processed: {rows_processed}, Proteins: {proteins_inserted}...")
-                        
-                        # Clear batch
-                        proteins_batch = []
-                
-                # Insert any remaining rows in the last batch
-                if proteins_batch:
-                    insert_proteins_batch(cur, proteins_batch)
-                    conn.commit()
-                    
-                    print(f"  Processed: {rows_processed}, Proteins: {proteins_inserted}...")
-                
-                end_time = time.time()
-                print("-" * 50)
-                print("Protein data ingestion finished.")
-                print(f"Total rows processed: {rows_processed}")
-                print(f"Total proteins inserted: {proteins_inserted}")
-                print(f"Time taken: {end_time - start_time:.2f} seconds")
-                
-        except psycopg2.Error as e:
-            print(f"\nError during protein insertion: {e}")
-            print("Rolling back last transaction...")
-            conn.rollback()
-            sys.exit(1)
-        except Exception as e:
-            print(f"\nAn unexpected error occurred: {e}")
-            conn.rollback()
+        cur.execute(sql.SQL("""
+            SELECT input_file, file_index, n_files, chunk_size, chunk_start, chunk_end,
+                   first_row, line_count, rows_processed, proteins, identifiers, rows_skipped
+            FROM {} ORDER BY input_file, chunk_start
+        """).format(sql.Identifier(CHECKPOINTS_TABLE)))
+        checkpoints = cur.fetchall()
+    conn.commit()
+
+    resume_from = {}
+    committed = set()
+    totals = {'rows_processed': 0, 'proteins_inserted': 0, 'identifiers_inserted': 0, 'rows_skipped': 0}
+
+    for (input_file, file_index, n_files, saved_chunk_size, start, end,
+         first_row, line_count, rows, proteins, identifiers, skipped) in checkpoints:
+        # Protein ids and chunk boundaries depend on these, they must not change
+        if (n_files != len(input_files) or file_index >= len(input_files)
+                or input_files[file_index] != input_file or saved_chunk_size != chunk_size):
+            print(f"Error: Checkpoints in '{CHECKPOINTS_TABLE}' were written with different input files or chunk size.")
+            print("Resume with the same --input files, in the same order, and the same --chunk-size.")
             sys.exit(1)
+        totals['rows_processed'] += rows
+        totals['proteins_inserted'] += proteins
+        totals['identifiers_inserted'] += identifiers
+        totals['rows_skipped'] += skipped
 
-def insert_proteins_batch(cursor, proteins_data):
-    """Inserts a batch of protein data."""
-    if not proteins_data:
-        return
+        if input_file not in resume_from:
+            with open(input_file, 'rb') as f:
+                resume_from[input_file] = (len(f.readline()), 0)
+        offset, _ = resume_from[input_file]
+        if start == offset:
+            resume_from[input_file] = (end, first_row + line_count)
+        else:
+            committed.add((input_file, start))
+
+    # Chunks contiguous with the resume point were absorbed into it
+    committed = {
+        (input_file, start) for input_file, start in committed
+        if start > resume_from[input_file][0]
+    }
+    return resume_from, committed, totals
+
+def plan_chunks(input_file, chunk_size, offset=None, first_row=0):
+    """Yields line-aligned byte ranges of the input file as (start, end, first_row, line_count).
+
+    Planning starts after the header, or at `offset` when resuming.
+    """
+    with open(input_file, 'rb') as f:
+        header_length = len(f.readline())  # Skip header
+        if offset is None:
+            offset = header_length
+        f.seek(offset)
+        while True:
+            block = f.read(chunk_size)
+            if not block:
+                break
+            # Extend the range to the end of the current line
+            if not block.endswith(b'\n'):
+                block += f.readline()
+            line_count = block.count(b'\n') + (0 if block.endswith(b'\n') else 1)
+            yield offset, offset + len(block), first_row, line_count
+            offset += len(block)
+            first_row += line_count
+
+def plan_input_files(input_files, chunk_size, resume_from=None, committed=()):
+    """Yields parse tasks for all input files, interleaved round-robin.
+
+    Interleaving keeps chunks of every export in flight at the same time,
+    so the per-taxon partitions of separate exports load in parallel.
+    When resuming, each file is planned from its checkpoint and chunks
+    already committed are left out.
+    """
+    resume_from = resume_from or {}
+    positions = []
+    for input_file in input_files:
+        with open(input_file, 'r', encoding='utf-8') as infile:
+            header = infile.readline().rstrip('\r\n').split('\t')
+        for col in ('Entry', 'Organism (ID)'):
+            if col not in header:
+                print(f"Error: Column '{col}' not found in '{input_file}'")
+                sys.exit(1)
+        positions.append([header.index(col) if col in header else None for col, _ in PROTEIN_COLUMNS])
+
+    def file_tasks(file_index, input_file):
+        offset, first_row = resume_from.get(input_file, (None, 0))
+        for start, end, first_row, line_count in plan_chunks(input_file, chunk_size, offset, first_row):
+            if (input_file, start) not in committed:
+                yield file_index, input_file, start, end, first_row, line_count, positions[file_index], len(input_files)
+
+    plans = [file_tasks(file_index, input_file) for file_index, input_file in enumerate(input_files)]
+    while plans:
+        for plan in list(plans):
+            task = next(plan, None)
+            if task is None:
+                plans.remove(plan)
+            else:
+                yield task
+
+def copy_escape(value):
+    """Escapes a value for PostgreSQL COPY text format."""
+    if value is None:
+        return '\\N'
+    value = str(value)
+    if '\\' in value:
+        value = value.replace('\\', '\\\\')
+    return value
+
+def extract_identifiers(entry, gene_primary, gene_synonyms, protein_names):
+    """Returns the distinct (identifier_value, identifier_type) pairs for one protein.
+
+    The only extraction rules: used while parsing the input files and by
+    populate_identifiers to rebuild the table from the loaded proteins.
+    """
+    found = [(entry, 'uniprot_accession')]
+    if gene_primary:
+        found.append((gene_primary, 'gene_primary'))
+    for synonym in gene_synonyms.split(' '):
+        if synonym.strip():
+            found.append((synonym.strip(), 'gene_synonym'))
+    if protein_names:
+        primary = protein_names.split('(', 1)[0].strip()
+        if primary:
+            found.append((primary, 'protein_primary'))
+        for alternative in PROTEIN_ALTERNATIVE_RE.findall(protein_names):
+            if alternative.strip():
+                found.append((alternative.strip(), 'protein_alternative'))
+    # Keep the first occurrence of each pair, in extraction order
+    return list(dict.fromkeys(found))
+
+def find_duplicate_entries(input_files):
+    """Returns, per file index, the accessions already present in an earlier input file.
+
+    Overlapping exports (e.g. all reviewed entries and a single organism)
+    share entries. Only the first copy in --input order is loaded, the
+    workers skip the later ones. Only the Entry column is read.
+    """
+    seen = set()
+    duplicates = {}
+    for file_index, input_file in enumerate(input_files):
+        with open(input_file, 'r', encoding='utf-8') as f:
+            header = f.readline().rstrip('\r\n').split('\t')
+            if 'Entry' not in header:
+                print(f"Error: Column 'Entry' not found in '{input_file}'")
+                sys.exit(1)
+            entry_pos = header.index('Entry')
+            found = set()
+            for line in f:
+                entry = line.rstrip('\r\n').split('\t')[entry_pos]
+                if entry in seen:
+                    found.add(entry)
+                elif entry:
+                    seen.add(entry)
+        if found:
+            duplicates[file_index] = frozenset(found)
+            print(f"  {os.path.basename(input_file)}: {len(found)} entries already in an earlier input, skipping them")
+    return duplicates
+
+_duplicate_entries = {}
+
+def init_parse_worker(duplicate_entries):
+    """Hands the duplicates to a worker process once, instead of with every task."""
+    global _duplicate_entries
+    _duplicate_entries = duplicate_entries
+
+def parse_chunk(task):
+    """Parses one byte range of an input file into per-taxon COPY buffers.
+
+    Runs in a worker process. Protein ids are derived from the file index and
+    line number, so chunks can be parsed and written in any order.
+    """
+    file_index, input_file, start, end, first_row, line_count, positions, n_files = task
+    with open(input_file, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start).decode('utf-8')
+
+    # taxon -> (protein lines, detail lines, identifier lines)
+    buffers = collections.defaultdict(lambda: ([], [], []))
+    rows_processed = 0
+    proteins_parsed = 0
+    identifiers_parsed = 0
+    rows_skipped = 0
+    n_fields = len(positions)
+    duplicates = _duplicate_entries.get(file_index, ())
+
+    for line_no, line in enumerate(data.split('\n')):
+        line = line.rstrip('\r')
+        if not line:
+            continue
+        rows_processed += 1
+        fields = line.split('\t')
+        if len(fields) < n_fields:
+            fields.extend([''] * (n_fields - len(fields)))
+        row = [fields[pos] if pos is not None else '' for pos in positions]
+
+        entry = row[0]
+        taxon = row[ORGANISM_COLUMN].strip()
+        if not entry or not taxon.isdigit() or entry in duplicates:
+            rows_skipped += 1
+            continue
+
+        for i in INTEGER_COLUMNS:
+            row[i] = int(row[i]) if row[i].isdigit() else None
+        taxon = int(taxon)
+        row[ORGANISM_COLUMN] = taxon
+
+        protein_id = (first_row + line_no) * n_files + file_index + 1
+        proteins_buf, details_buf, identifiers_buf = buffers[taxon]
+        proteins_buf.append(
+            '\t'.join([str(protein_id)] + [copy_escape(row[i]) for i in HOT_POSITIONS]) + '\n'
+        )
+        details_buf.append(
+            '\t'.join([str(protein_id), str(taxon)] + [copy_escape(row[i]) for i in DETAIL_POSITIONS]) + '\n'
+        )
+        proteins_parsed += 1
+
+        for value, id_type in extract_identifiers(
+            entry,
+            row[GENE_PRIMARY_COLUMN],
+            row[GENE_SYNONYM_COLUMN],
+            row[PROTEIN_NAMES_COLUMN],
+        ):
+            identifiers_buf.append('%u\t%s\t%s\t%s\t%u\n' % (
+                protein_id,
+                copy_escape(entry),
+                copy_escape(value),
+                id_type,
+                taxon,
+            ))
+            identifiers_parsed += 1
+
+    return {
+        'file_index': file_index,
+        'input_file': input_file,
+        'start': start,
+        'end': end,
+        'first_row': first_row,
+        'line_count': line_count,
+        'rows_processed': rows_processed,
+        'proteins': proteins_parsed,
+        'identifiers': identifiers_parsed,
+        'rows_skipped': rows_skipped,
+        'buffers': {
+            taxon: tuple(''.join(buf) for buf in taxon_buffers)
+            for taxon, taxon_buffers in buffers.items()
+        },
+    }
+
+def ensure_partitions(conn, taxa, state):
+    """Creates missing taxon partitions in their own transaction."""
+    with state['lock']:
+        missing = sorted(set(taxa) - state['partitions'])
+        if not missing:
+            return
+        with conn.cursor() as cur:
+            for taxon in missing:
+                print(f"  Creating partitions for taxon {taxon}...")
+                create_partitions(cur, taxon)
+        conn.commit()
+        state['partitions'].update(missing)
+
+def copy_writer(conn, work_queue, state):
+    """Consumes parsed chunks from the queue and COPYs them on its own connection.
+
+    Each taxon is copied straight into its leaf partitions, skipping
+    partition routing on the server. The chunk's checkpoint is written in
+    the same transaction as its rows.
+    """
+    protein_columns = sql.SQL(', ').join(map(sql.Identifier, ['id'] + HOT_COLUMNS))
+    detail_columns = sql.SQL(', ').join(map(sql.Identifier, ['protein_id', 'organism_id'] + DETAIL_COLUMNS))
+    identifier_columns = sql.SQL(', ').join(map(sql.Identifier, [
+        'protein_id', 'uniprot_accession', 'identifier_value', 'identifier_type', 'taxon_id'
+    ]))
+
+    try:
+        with conn.cursor() as cur:
+            while True:
+                item = work_queue.get()
+                if item is None:
+                    break
+                if state['error']:
+                    continue  # Drain the queue after a failure
+                try:
+                    ensure_partitions(conn, item['buffers'].keys(), state)
+                    for taxon, (proteins_buf, details_buf, identifiers_buf) in item['buffers'].items():
+                        cur.copy_expert(sql.SQL("COPY {} ({}) FROM STDIN").format(
+                            sql.Identifier(partition_name(PROTEINS_TABLE, taxon)), protein_columns,
+                        ).as_string(conn), io.StringIO(proteins_buf))
+                        cur.copy_expert(sql.SQL("COPY {} ({}) FROM STDIN").format(
+                            sql.Identifier(partition_name(DETAILS_TABLE, taxon)), detail_columns,
+                        ).as_string(conn), io.StringIO(details_buf))
+                        cur.copy_expert(sql.SQL("COPY {} ({}) FROM STDIN").format(
+                            sql.Identifier(partition_name(IDENTIFIERS_TABLE, taxon)), identifier_columns,
+                        ).as_string(conn), io.StringIO(identifiers_buf))
+                    cur.execute(sql.SQL("""
+                        INSERT INTO {} (input_file, file_index, n_files, chunk_size, chunk_start, chunk_end,
+                                        first_row, line_count, rows_processed, proteins, identifiers, rows_skipped)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    """).format(sql.Identifier(CHECKPOINTS_TABLE)), (
+                        item['input_file'], item['file_index'], state['n_files'], state['chunk_size'],
+                        item['start'], item['end'], item['first_row'], item['line_count'],
+                        item['rows_processed'], item['proteins'], item['identifiers'], item['rows_skipped'],
+                    ))
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    state['error'] = f"chunk at bytes {item['start']}-{item['end']} of '{os.path.basename(item['input_file'])}': {e}"
+                    continue
+                with state['lock']:
+                    state['rows_processed'] += item['rows_processed']
+                    state['proteins_inserted'] += item['proteins']
+                    state['identifiers_inserted'] += item['identifiers']
+                    state['rows_skipped'] += item['rows_skipped']
+                    print(f"  Processed: {state['rows_processed']}, Proteins: {state['proteins_inserted']}...")
+    finally:
+        conn.close()
+
+def ingest_proteins(conn, input_files=INPUT_FILES, workers=PARSE_WORKERS, connections=COPY_CONNECTIONS, chunk_size=CHUNK_SIZE, resume=False):
+    """Parses the input files in a process pool and COPYs proteins and identifiers.
+
+    The files are split into line-aligned byte ranges which are parsed by
+    `workers` processes. Parsed chunks are handed off in plan order through
+    bounded queues to `connections` writer threads, so at most a few chunks
+    are held in memory at any time. Rows land in per-taxon partitions, which
+    are created as new taxa are encountered.
+
+    Entries present in several input files are loaded from the first of
+    them only, see `find_duplicate_entries`.
+
+    Every committed chunk is checkpointed. With `resume`, each file is read
+    from the end of its last committed chunk instead of from the start.
+    """
+    input_files = [os.path.abspath(input_file) for input_file in input_files]
+    print(f"{'Resuming' if resume else 'Starting'} protein data ingestion from {len(input_files)} file(s)...")
+    for input_file in input_files:
+        print(f"  {input_file}")
+    print(f"  Parse workers: {workers}, COPY connections: {connections}, chunk size: {chunk_size} bytes")
+    start_time = time.time()
     
-    columns = [
-        'entry', 'entry_name', 'protein_names', 'length', 'mass', 'sequence',
-        'gene_names_primary', 'gene_names_synonym', 'organism_id',
-        'involvement_in_disease', 'mutagenesis', 'subcellular_location',
-        'post_translational_modification', 'pubmed_id', 'function_cc',
-        'ensembl', 'kegg', 'pathway', 'activity_regulation', 'keywords',
-        'ec_number', 'gene_ontology', 'transmembrane', 'protein_families',
-        'refseq', 'alphafolddb', 'pdb', 'chembl', 'phosphositeplus',
-        'signor', 'pathwaycommons', 'intact', 'biogrid', 'complexportal'
+    # Check if files exist
+    for input_file in input_files:
+        if not os.path.exists(input_file):
+            print(f"Error: Input file not found at '{input_file}'")
+            sys.exit(1)
+
+    # Entries must be unique per taxon, load each accession from its first input only
+    duplicate_entries = find_duplicate_entries(input_files) if len(input_files) > 1 else {}
+
+    state = {
+        'lock': threading.Lock(),
+        'error': None,
+        'partitions': set(),
+        'n_files': len(input_files),
+        'chunk_size': chunk_size,
+        'rows_processed': 0,
+        'proteins_inserted': 0,
+        'identifiers_inserted': 0,
+        'rows_skipped': 0,
+    }
+    resume_from, committed = {}, set()
+    if resume:
+        resume_from, committed, totals = load_checkpoints(conn, input_files, chunk_size)
+        state.update(totals)
+        for input_file in input_files:
+            offset, first_row = resume_from.get(input_file, (None, 0))
+            print(f"  {os.path.basename(input_file)}: resuming at byte {offset or 0}, row {first_row}")
+        print(f"  Already loaded: {state['proteins_inserted']} proteins, "
+              f"{len(committed)} chunk(s) committed past the resume points")
+    work_queue = queue.Queue(maxsize=connections * QUEUE_DEPTH)
+    writers = [
+        threading.Thread(target=copy_writer, args=(get_db_connection(), work_queue, state), daemon=True)
+        for _ in range(connections)
     ]
-    
-    query = sql.SQL("INSERT INTO {} ({}) VALUES %s ON CONFLICT (entry) DO UPDATE SET entry = EXCLUDED.entry").format(
-        sql.Identifier(PROTEINS_TABLE),
-        sql.SQL(', ').join(map(sql.Identifier, columns))
-    )
-    
-    execute_values(cursor, query, proteins_data)
+    for writer in writers:
+        writer.start()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_parse_worker, initargs=(duplicate_entries,)) as pool:
+            pending = collections.deque()
+            for task in plan_input_files(input_files, chunk_size, resume_from, committed):
+                if state['error']:
+                    break
+                pending.append(pool.submit(parse_chunk, task))
+                # Bound the number of chunks in flight, handing off in plan order
+                if len(pending) >= workers * QUEUE_DEPTH:
+                    work_queue.put(pending.popleft().result())
+            while pending and not state['error']:
+                work_queue.put(pending.popleft().result())
+            for future in pending:
+                future.cancel()
+    except Exception as e:
+        state['error'] = f"parsing failed: {e}"
+    finally:
+        for _ in writers:
+            work_queue.put(None)
+        for writer in writers:
+            writer.join()
+
+    if state['error']:
+        print(f"\nError during protein ingestion: {state['error']}")
+        print(f"Committed chunks are checkpointed in '{CHECKPOINTS_TABLE}', run again with --resume to continue.")
+        sys.exit(1)
+
+    # Protein ids were assigned explicitly, move the sequence past them
+    with conn.cursor() as cur:
+        cur.execute(sql.SQL("SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {}").format(
+            sql.Identifier(PROTEINS_TABLE)), (PROTEINS_TABLE,))
+        conn.commit()
+
+    end_time = time.time()
+    print("-" * 50)
+    print("Protein data ingestion finished.")
+    print(f"Total rows processed: {state['rows_processed']}")
+    print(f"Total proteins inserted: {state['proteins_inserted']}")
+    print(f"Total identifiers inserted: {state['identifiers_inserted']}")
+    print(f"Rows skipped (no entry or taxon, or in an earlier input): {state['rows_skipped']}")
+    print(f"Taxon partitions: {', '.join(str(t) for t in sorted(state['partitions']))}")
+    print(f"Time taken: {end_time - start_time:.2f} seconds")
 
 def create_indexes(conn):
     """Creates indexes on the tables after data loading."""
@@ -407,13 +858,282 @@ def create_indexes(conn):
             conn.rollback()
             sys.exit(1)
 
+def repartition_proteins(conn, sequence_compression=None):
+    """Migrates an unpartitioned wide proteins table to the per-taxon hot/cold layout.
+
+    Tables built before the per-taxon partitions have a plain `id` primary
+    key and a TEXT `organism_id`, which the details table can't reference.
+    The rows are copied into the partitioned proteins and details tables,
+    keeping their ids; rows without a numeric taxon are skipped. The
+    identifiers referencing the old table are rebuilt from the new one.
+    """
+    legacy_table = f"{PROTEINS_TABLE}_unpartitioned"
+    hot = [col for col in HOT_COLUMNS if col != 'organism_id']
+    print(f"Moving unpartitioned '{PROTEINS_TABLE}' into per-taxon partitions...")
+    start_time = time.time()
+    
+    with conn.cursor() as cur:
+        try:
+            cur.execute("""
+                SELECT column_name FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = %s
+            """, (PROTEINS_TABLE,))
+            existing = {row[0] for row in cur.fetchall()}
+            cold = [col for col in DETAIL_COLUMNS if col in existing]
+            
+            cur.execute(sql.SQL("DROP TABLE IF EXISTS {} CASCADE;").format(sql.Identifier(IDENTIFIERS_TABLE)))
+            cur.execute(sql.SQL("DROP TABLE IF EXISTS {} CASCADE;").format(sql.Identifier(DETAILS_TABLE)))
+            cur.execute(sql.SQL("ALTER TABLE {} RENAME TO {};").format(
+                sql.Identifier(PROTEINS_TABLE), sql.Identifier(legacy_table)))
+            create_proteins_table(cur)
+            create_details_table(cur, sequence_compression)
+            create_identifiers_table(cur)
+            
+            # Only rows with a numeric taxon have a partition to go to
+            has_taxon = sql.SQL("entry IS NOT NULL AND entry != '' AND organism_id ~ '^\\s*[0-9]+\\s*$'")
+            cur.execute(sql.SQL("SELECT DISTINCT trim(organism_id)::integer FROM {} WHERE {}").format(
+                sql.Identifier(legacy_table), has_taxon))
+            for (taxon,) in cur.fetchall():
+                create_partitions(cur, taxon)
+            
+            print(f"  Copying proteins into '{PROTEINS_TABLE}' and {len(cold)} columns into '{DETAILS_TABLE}'...")
+            cur.execute(sql.SQL("""
+                INSERT INTO {} (id, organism_id, {})
+                SELECT id, trim(organism_id)::integer, {} FROM {} WHERE {}
+            """).format(
+                sql.Identifier(PROTEINS_TABLE),
+                sql.SQL(', ').join(map(sql.Identifier, hot)),
+                sql.SQL(', ').join(map(sql.Identifier, hot)),
+                sql.Identifier(legacy_table),
+                has_taxon,
+            ))
+            print(f"  Copied {cur.rowcount} proteins.")
+            cur.execute(sql.SQL("""
+                INSERT INTO {} (protein_id, organism_id, {})
+                SELECT id, trim(organism_id)::integer, {} FROM {} WHERE {}
+            """).format(
+                sql.Identifier(DETAILS_TABLE),
+                sql.SQL(', ').join(map(sql.Identifier, cold)),
+                sql.SQL(', ').join(map(sql.Identifier, cold)),
+                sql.Identifier(legacy_table),
+                has_taxon,
+            ))
+            cur.execute(sql.SQL("SELECT COUNT(*) FROM {} WHERE NOT ({})").format(
+                sql.Identifier(legacy_table), has_taxon))
+            skipped = cur.fetchone()[0]
+            if skipped:
+                print(f"  Skipped {skipped} rows without entry or numeric taxon.")
+            
+            # New proteins get ids after the copied ones
+            cur.execute(sql.SQL("SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {}").format(
+                sql.Identifier(PROTEINS_TABLE)), (PROTEINS_TABLE,))
+            cur.execute(sql.SQL("DROP TABLE {} CASCADE;").format(sql.Identifier(legacy_table)))
+            conn.commit()
+            
+        except psycopg2.Error as e:
+            print(f"Error moving '{PROTEINS_TABLE}' into partitions: {e}")
+            conn.rollback()
+            sys.exit(1)
+    
+    populate_identifiers(conn)
+    compute_identifier_ambiguity(conn)
+    create_indexes(conn)
+    
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            cur.execute(sql.SQL("ANALYZE {};").format(sql.Identifier(PROTEINS_TABLE)))
+            cur.execute(sql.SQL("ANALYZE {};").format(sql.Identifier(DETAILS_TABLE)))
+    finally:
+        conn.autocommit = False
+    
+    end_time = time.time()
+    print(f"Proteins moved into partitions in {end_time - start_time:.2f} seconds")
+
+def split_protein_details(conn, sequence_compression=None):
+    """Migrates a wide proteins table to the hot/cold layout in place.
+
+    Copies the large columns into the details table, drops them from the
+    proteins table and rewrites it so the freed space is reclaimed. An
+    unpartitioned table is moved into per-taxon partitions instead, see
+    `repartition_proteins`.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", (PROTEINS_TABLE,))
+        row = cur.fetchone()
+    conn.commit()
+    if row is None:
+        print(f"Error: table '{PROTEINS_TABLE}' does not exist, load the proteins first.")
+        sys.exit(1)
+    if row[0] == 'r':
+        repartition_proteins(conn, sequence_compression)
+        return
+    
+    print(f"Splitting detail columns out of '{PROTEINS_TABLE}'...")
+    start_time = time.time()
+    
+    with conn.cursor() as cur:
+        try:
+            cur.execute("""
+                SELECT column_name FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = %s
+            """, (PROTEINS_TABLE,))
+            existing = {row[0] for row in cur.fetchall()}
+            cold = [col for col in DETAIL_COLUMNS if col in existing]
+            if not cold:
+                print("  Nothing to split, the proteins table is already narrow.")
+                return
+            
+            cur.execute(sql.SQL("DROP TABLE IF EXISTS {} CASCADE;").format(sql.Identifier(DETAILS_TABLE)))
+            create_details_table(cur, sequence_compression)
+            cur.execute(sql.SQL("SELECT DISTINCT organism_id FROM {}").format(sql.Identifier(PROTEINS_TABLE)))
+            for (taxon,) in cur.fetchall():
+                create_partitions(cur, taxon, tables=(DETAILS_TABLE,))
+            
+            print(f"  Copying {len(cold)} columns into '{DETAILS_TABLE}'...")
+            cur.execute(sql.SQL("""
+                INSERT INTO {} (protein_id, organism_id, {})
+                SELECT id, organism_id, {} FROM {}
+            """).format(
+                sql.Identifier(DETAILS_TABLE),
+                sql.SQL(', ').join(map(sql.Identifier, cold)),
+                sql.SQL(', ').join(map(sql.Identifier, cold)),
+                sql.Identifier(PROTEINS_TABLE),
+            ))
+            print(f"  Copied {cur.rowcount} rows.")
+            
+            print(f"  Dropping detail columns from '{PROTEINS_TABLE}'...")
+            cur.execute(sql.SQL("ALTER TABLE {} {};").format(
+                sql.Identifier(PROTEINS_TABLE),
+                sql.SQL(', ').join(sql.SQL("DROP COLUMN {}").format(sql.Identifier(col)) for col in cold),
+            ))
+            conn.commit()
+            
+        except psycopg2.Error as e:
+            print(f"Error splitting protein details: {e}")
+            conn.rollback()
+            sys.exit(1)
+    
+    # Dropped columns keep their space until the table is rewritten
+    print(f"  Rewriting '{PROTEINS_TABLE}' to reclaim space...")
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = %s::regclass", (PROTEINS_TABLE,))
+            partitions = [row[0] for row in cur.fetchall()] or [PROTEINS_TABLE]
+            for partition in partitions:
+                cur.execute(sql.SQL("VACUUM FULL ANALYZE {};").format(sql.Identifier(partition)))
+            cur.execute(sql.SQL("ANALYZE {};").format(sql.Identifier(DETAILS_TABLE)))
+    finally:
+        conn.autocommit = False
+    
+    end_time = time.time()
+    print(f"Protein details split in {end_time - start_time:.2f} seconds")
+
+def table_statio(cur, tables):
+    """Returns summed (heap, index, toast) blocks read or hit for tables and their partitions."""
+    cur.execute("SELECT pg_stat_force_next_flush()")
+    cur.execute("""
+        SELECT COALESCE(SUM(s.heap_blks_read + s.heap_blks_hit), 0),
+               COALESCE(SUM(COALESCE(s.idx_blks_read, 0) + COALESCE(s.idx_blks_hit, 0)), 0),
+               COALESCE(SUM(COALESCE(s.toast_blks_read, 0) + COALESCE(s.toast_blks_hit, 0)), 0)
+        FROM pg_statio_user_tables s
+        WHERE s.relid = ANY(%s::regclass[])
+           OR s.relid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = ANY(%s::regclass[]))
+    """, (list(tables), list(tables)))
+    return cur.fetchone()
+
+def benchmark_protein_reads(conn, samples=BENCHMARK_SAMPLES):
+    """Measures pages read per protein lookup for the summary and the detail query shapes.
+
+    Counts heap, index and TOAST blocks from pg_statio so that detoasting
+    of the large text columns is included. Run it before and after `split`
+    to see the reads saved by the narrow proteins table.
+    """
+    print(f"Benchmarking protein lookups on {samples} random accessions...")
+    
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass(%s) IS NOT NULL", (DETAILS_TABLE,))
+        has_details = cur.fetchone()[0]
+        cur.execute(sql.SQL("SELECT entry FROM {} ORDER BY random() LIMIT %s").format(
+            sql.Identifier(PROTEINS_TABLE)), (samples,))
+        entries = [row[0] for row in cur.fetchall()]
+        conn.commit()
+        
+        summary_columns = sql.SQL(', ').join(sql.SQL("p.{}").format(sql.Identifier(col)) for col in HOT_COLUMNS)
+        if has_details:
+            tables = [PROTEINS_TABLE, DETAILS_TABLE]
+            shapes = [
+                ("summary (proteins)", sql.SQL("SELECT {} FROM {} p WHERE p.entry = %s").format(
+                    summary_columns, sql.Identifier(PROTEINS_TABLE))),
+                ("full card (proteins + details)", sql.SQL("""
+                    SELECT p.*, d.* FROM {} p
+                    LEFT JOIN {} d ON d.organism_id = p.organism_id AND d.protein_id = p.id
+                    WHERE p.entry = %s
+                """).format(sql.Identifier(PROTEINS_TABLE), sql.Identifier(DETAILS_TABLE))),
+            ]
+        else:
+            tables = [PROTEINS_TABLE]
+            shapes = [
+                ("summary (wide proteins)", sql.SQL("SELECT {} FROM {} p WHERE p.entry = %s").format(
+                    summary_columns, sql.Identifier(PROTEINS_TABLE))),
+                ("full card (wide proteins)", sql.SQL("SELECT p.* FROM {} p WHERE p.entry = %s").format(
+                    sql.Identifier(PROTEINS_TABLE))),
+            ]
+        
+        for table in tables:
+            cur.execute("""
+                SELECT COALESCE(SUM(pg_total_relation_size(inhrelid)), pg_total_relation_size(%s::regclass))
+                FROM pg_inherits WHERE inhparent = %s::regclass
+            """, (table, table))
+            print(f"  Size of '{table}': {cur.fetchone()[0] / 1024 / 1024:.1f} MB")
+        
+        for name, query in shapes:
+            before = table_statio(cur, tables)
+            start_time = time.time()
+            for entry in entries:
+                cur.execute(query, (entry,))
+                cur.fetchall()
+            elapsed = time.time() - start_time
+            conn.commit()
+            after = table_statio(cur, tables)
+            heap, idx, toast = (a - b for a, b in zip(after, before))
+            n = max(len(entries), 1)
+            print(f"  {name}:")
+            print(f"    Pages per lookup: heap {heap / n:.2f}, index {idx / n:.2f}, toast {toast / n:.2f}, "
+                  f"total {(heap + idx + toast) / n:.2f}")
+            print(f"    Mean latency: {elapsed / n * 1000:.3f} ms")
+        conn.commit()
+
 # --- Main Execution ---
 if __name__ == "__main__":
-    import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Load UniProt proteins and identifiers into PostgreSQL")
+    parser.add_argument("command", nargs="?", choices=["identifiers", "indexes", "split", "benchmark"],
+                       help="Only repopulate identifiers, create indexes, split the detail columns "
+                            "out of an existing proteins table, or benchmark protein lookups")
+    parser.add_argument("--input", nargs="+", default=INPUT_FILES,
+                       help="UniProt TSV exports to load, e.g. one per organism. "
+                            "Entries in several exports are loaded from the first one only")
+    parser.add_argument("--workers", type=int, default=PARSE_WORKERS,
+                       help="Number of processes parsing the input files")
+    parser.add_argument("--connections", type=int, default=COPY_CONNECTIONS,
+                       help="Number of connections writing parsed chunks")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                       help="Bytes of input parsed per worker task")
+    parser.add_argument("--resume", action="store_true",
+                       help="Continue an interrupted load from its last committed chunks")
+    parser.add_argument("--sequence-compression", choices=["pglz", "lz4"],
+                       help="TOAST compression for the sequence column")
+    parser.add_argument("--samples", type=int, default=BENCHMARK_SAMPLES,
+                       help="Number of random accessions looked up by the benchmark")
+    
+    args = parser.parse_args()
+    check_environment()
     
-    # Check for command line arguments
-    if len(sys.argv) > 1:
-        command = sys.argv[1]
+    if args.command:
+        command = args.command
         
         db_conn = None
         try:
@@ -424,21 +1144,16 @@ if __name__ == "__main__":
                     print("Recreating identifiers table with new schema...")
                     with db_conn.cursor() as cur:
                         cur.execute(sql.SQL("DROP TABLE IF EXISTS {} CASCADE;").format(sql.Identifier(IDENTIFIERS_TABLE)))
-                        cur.execute(sql.SQL("""
-                            CREATE TABLE {} (
-                                id SERIAL PRIMARY KEY,
-                                protein_id INTEGER REFERENCES {} (id) ON DELETE CASCADE,
-                                uniprot_accession VARCHAR(30) NOT NULL,
-                                identifier_value TEXT NOT NULL,
-                                identifier_type VARCHAR(50) NOT NULL,
-                                taxon_id TEXT
-                            );
-                        """).format(sql.Identifier(IDENTIFIERS_TABLE), sql.Identifier(PROTEINS_TABLE)))
+                        create_identifiers_table(cur)
+                        cur.execute(sql.SQL("SELECT DISTINCT organism_id FROM {}").format(sql.Identifier(PROTEINS_TABLE)))
+                        for (taxon,) in cur.fetchall():
+                            create_partitions(cur, taxon, tables=(IDENTIFIERS_TABLE,))
                         db_conn.commit()
                         print("Identifiers table recreated.")
                     
-                    # Populate identifiers using SQL
+                    # Populate identifiers from the loaded proteins
                     populate_identifiers(db_conn)
+                    compute_identifier_ambiguity(db_conn)
                     
                     print("\n" + "=" * 50)
                     print("Identifiers repopulated!")
@@ -452,9 +1167,16 @@ if __name__ == "__main__":
                     print("Indexes created!")
                     print("=" * 50)
                 
-                else:
-                    print(f"Unknown command: {command}")
-                    print("Available commands: identifiers, indexes")
+                elif command == "split":
+                    # Migrate an existing wide proteins table
+                    split_protein_details(db_conn, args.sequence_compression)
+                    
+                    print("\n" + "=" * 50)
+                    print("Protein details split!")
+                    print("=" * 50)
+                
+                elif command == "benchmark":
+                    benchmark_protein_reads(db_conn, args.samples)
                     
         finally:
             if db_conn:
@@ -467,22 +1189,30 @@ if __name__ == "__main__":
         try:
             db_conn = get_db_connection()
             if db_conn:
-                # 1. Setup database tables (without indexes)
-                setup_database(db_conn)
-                
-                # Optional: Truncate tables before loading for a clean slate
-                print(f"Warning: Truncating tables before loading...")
-                with db_conn.cursor() as cur:
-                    cur.execute(sql.SQL("TRUNCATE TABLE {} CASCADE;").format(sql.Identifier(IDENTIFIERS_TABLE)))
-                    cur.execute(sql.SQL("TRUNCATE TABLE {} CASCADE;").format(sql.Identifier(PROTEINS_TABLE)))
-                    db_conn.commit()
-                    print("Tables truncated.")
+                if args.resume:
+                    # Keep the tables and continue after the checkpointed chunks
+                    with db_conn.cursor() as cur:
+                        create_checkpoints_table(cur)
+                        db_conn.commit()
+                else:
+                    # 1. Setup database tables (without indexes)
+                    setup_database(db_conn, args.sequence_compression)
+                    
+                    # Optional: Truncate tables before loading for a clean slate
+                    print(f"Warning: Truncating tables before loading...")
+                    with db_conn.cursor() as cur:
+                        cur.execute(sql.SQL("TRUNCATE TABLE {} CASCADE;").format(sql.Identifier(IDENTIFIERS_TABLE)))
+                        cur.execute(sql.SQL("TRUNCATE TABLE {} CASCADE;").format(sql.Identifier(DETAILS_TABLE)))
+                        cur.execute(sql.SQL("TRUNCATE TABLE {} CASCADE;").format(sql.Identifier(PROTEINS_TABLE)))
+                        cur.execute(sql.SQL("TRUNCATE TABLE {};").format(sql.Identifier(CHECKPOINTS_TABLE)))
+                        db_conn.commit()
+                        print("Tables truncated.")
                 
-                # 2. Load protein data
-                ingest_proteins(db_conn)
+                # 2. Load protein data and identifiers in parallel
+                ingest_proteins(db_conn, args.input, args.workers, args.connections, args.chunk_size, args.resume)
                 
-                # 3. Populate identifiers using SQL
-                populate_identifiers(db_conn)
+                # 3. Count accessions per identifier value
+                compute_identifier_ambiguity(db_conn)
                 
                 # 4. Create indexes after data is loaded
                 create_indexes(db_conn)
@@ -494,4 +1224,4 @@ if __name__ == "__main__":
         finally:
             if db_conn:
                 db_conn.close()
-                print("Database connection closed.")
\ No newline at end of file
+                print("Database connection closed.")
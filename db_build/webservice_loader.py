@@ -5,6 +5,8 @@ import psycopg2
 from psycopg2 import sql
 from dotenv import load_dotenv
 from urllib.parse import urlparse
+from resource_names import ResourceNameResolver
+from row_taps import TapReader
 
 # --- Configuration ---
 load_dotenv()  # Load variables from .env file
@@ -29,6 +31,85 @@ else:
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "omnipath_latest_build")
 
+# CSR adjacency arrays built from the interactions TSV during COPY, see interaction_graph.py
+GRAPH_DIR = os.path.join(DATA_DIR, "interactions_csr")
+
+# Per-substrate sorted site arrays built from the enz_sub TSV during COPY, see enz_sub_sites.py
+SITES_DIR = os.path.join(DATA_DIR, "enz_sub_sites")
+
+# Parquet copies of the tables written during COPY with --parquet, see parquet_export.py
+PARQUET_DIR = os.path.join(DATA_DIR, "parquet")
+
+# Builders fed with the rows of a table during COPY (see row_taps.py), by the name used in TABLE_CONFIG "taps".
+# A factory returns None to skip its tap, e.g. when an optional dependency is missing.
+def graph_tap(columns, config):
+    try:
+        from interaction_graph import CSRBuilder
+    except ImportError:
+        print("NumPy is not installed, skipping the CSR graph of the interactions.")
+        return None
+    return CSRBuilder(columns, GRAPH_DIR, {"source_file": config["file"]})
+
+def sites_tap(columns, config):
+    from enz_sub_sites import SiteIndexBuilder
+    return SiteIndexBuilder(columns, SITES_DIR, {"source_file": config["file"]})
+
+def complex_members_tap(columns, config):
+    from complex_members import ComplexMembersBuilder
+    return ComplexMembersBuilder(columns)
+
+def protein_summary_tap(columns, config):
+    from protein_summary import ProteinSummaryTap
+    return ProteinSummaryTap(columns, config["table"])
+
+def parquet_tap(columns, config):
+    from parquet_export import ParquetTap
+    parquet = config.get("parquet", {})
+    return ParquetTap(columns, config["table"], config["schema"], PARQUET_DIR,
+                      parquet.get("partition"), parquet.get("statistics", ()))
+
+TAPS = {
+    "graph": graph_tap,
+    "protein_summary": protein_summary_tap,
+    "sites": sites_tap,
+    "complex_members": complex_members_tap,
+    "parquet": parquet_tap,
+}
+
+# Source label -> canonical resource id lookup, filled from the "source" column of each table
+RESOURCE_NAMES_TABLE = "resource_names"
+
+# Duration and row count of the last refresh of each materialized view
+VIEW_REFRESHES_TABLE = "materialized_view_refreshes"
+
+def source_counts_view(table, column="sources", separator=";", record_column=None):
+    """
+    Materialized view of the record count of each source label of a table.
+
+    Without `separator` the column holds a single label. Records are rows, or
+    the distinct values of `record_column` when a record spans several rows.
+    """
+    view = f"{table}_source_counts"
+    label = f"unnest(string_to_array({column}, '{separator}'))" if separator else column
+    records = "COUNT(DISTINCT s.record)" if record_column else "COUNT(*)"
+    return {
+        "name": view,
+        "query": f"""
+            SELECT s.source, n.resource_id, {records}::int AS records
+            FROM (
+                SELECT {label} AS source{f", {record_column} AS record" if record_column else ""}
+                FROM {table}
+                WHERE {column} IS NOT NULL
+            ) s
+            LEFT JOIN {RESOURCE_NAMES_TABLE} n ON n.source_label = s.source
+            WHERE s.source != ''
+            GROUP BY s.source, n.resource_id
+        """,
+        "indexes": [
+            f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{view}_source ON {view} (source);",
+        ],
+    }
+
 # Table configurations - file to table mapping
 TABLE_CONFIG = {
     "annotations": {
@@ -44,12 +125,34 @@ TABLE_CONFIG = {
             value TEXT,
             record_id BIGINT
         """,
+        "source": {"column": "source"},
+        "taps": ["protein_summary"],
+        "parquet": {"partition": "source", "statistics": ["uniprot", "genesymbol", "record_id"]},
         "indexes": [
             "CREATE INDEX IF NOT EXISTS idx_annotations_uniprot ON annotations (uniprot);",
             "CREATE INDEX IF NOT EXISTS idx_annotations_genesymbol ON annotations (genesymbol);",
             "CREATE INDEX IF NOT EXISTS idx_annotations_source ON annotations (source);",
             "CREATE INDEX IF NOT EXISTS idx_annotations_label ON annotations (label);"
-        ]
+        ],
+        # Aggregates for the filter sidebars, created again after every load of the table
+        "materialized_views": [
+            source_counts_view("annotations", "source", None, record_column="record_id"),
+            {
+                "name": "annotations_label_facets",
+                "query": """
+                    SELECT source, COALESCE(label, '') AS label,
+                           COUNT(DISTINCT record_id)::int AS records,
+                           COUNT(DISTINCT uniprot)::int AS proteins,
+                           COUNT(DISTINCT value)::int AS distinct_values
+                    FROM annotations
+                    WHERE source IS NOT NULL
+                    GROUP BY source, COALESCE(label, '')
+                """,
+                "indexes": [
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_annotations_label_facets_source_label ON annotations_label_facets (source, label);",
+                ],
+            },
+        ],
     },
     "complexes": {
         "file": "omnipath_webservice_complexes.tsv",
@@ -62,12 +165,20 @@ TABLE_CONFIG = {
             stoichiometry TEXT,
             sources TEXT,
             "references" TEXT,
-            identifiers TEXT
+            identifiers TEXT,
+            resource_ids TEXT[],
+            component_hash BIGINT
         """,
+        "source": {"column": "sources", "separator": ";"},
+        "taps": ["complex_members", "protein_summary"],
+        "parquet": {"statistics": ["name", "components", "components_genesymbols"]},
         "indexes": [
             "CREATE INDEX IF NOT EXISTS idx_complexes_name ON complexes (name);",
-            "CREATE INDEX IF NOT EXISTS idx_complexes_sources ON complexes (sources);"
-        ]
+            "CREATE INDEX IF NOT EXISTS idx_complexes_component_hash ON complexes (component_hash);",
+            "CREATE INDEX IF NOT EXISTS idx_complexes_sources ON complexes (sources);",
+            "CREATE INDEX IF NOT EXISTS idx_complexes_resource_ids ON complexes USING GIN (resource_ids);"
+        ],
+        "materialized_views": [source_counts_view("complexes")],
     },
     "enz_sub": {
         "file": "omnipath_webservice_enz_sub.tsv",
@@ -85,14 +196,21 @@ TABLE_CONFIG = {
             sources TEXT,
             "references" TEXT,
             curation_effort INTEGER,
-            ncbi_tax_id INTEGER
+            ncbi_tax_id INTEGER,
+            resource_ids TEXT[]
         """,
+        "source": {"column": "sources", "separator": ";"},
+        "taps": ["sites", "protein_summary"],
+        "parquet": {"statistics": ["enzyme", "enzyme_genesymbol", "substrate", "substrate_genesymbol"]},
         "indexes": [
             "CREATE INDEX IF NOT EXISTS idx_enz_sub_enzyme ON enz_sub (enzyme);",
-            "CREATE INDEX IF NOT EXISTS idx_enz_sub_substrate ON enz_sub (substrate);",
+            # Also serves substrate-only lookups
+            "CREATE INDEX IF NOT EXISTS idx_enz_sub_site ON enz_sub (substrate, residue_type, residue_offset, modification);",
             "CREATE INDEX IF NOT EXISTS idx_enz_sub_enzyme_genesymbol ON enz_sub (enzyme_genesymbol);",
-            "CREATE INDEX IF NOT EXISTS idx_enz_sub_substrate_genesymbol ON enz_sub (substrate_genesymbol);"
-        ]
+            "CREATE INDEX IF NOT EXISTS idx_enz_sub_substrate_genesymbol ON enz_sub (substrate_genesymbol);",
+            "CREATE INDEX IF NOT EXISTS idx_enz_sub_resource_ids ON enz_sub USING GIN (resource_ids);"
+        ],
+        "materialized_views": [source_counts_view("enz_sub")],
     },
     "interactions": {
         "file": "omnipath_webservice_interactions.tsv",
@@ -134,8 +252,12 @@ TABLE_CONFIG = {
             ncbi_tax_id_source INTEGER,
             entity_type_source VARCHAR(50),
             ncbi_tax_id_target INTEGER,
-            entity_type_target VARCHAR(50)
+            entity_type_target VARCHAR(50),
+            resource_ids TEXT[]
         """,
+        "source": {"column": "sources", "separator": ";"},
+        "taps": ["graph", "protein_summary"],
+        "parquet": {"partition": "type", "statistics": ["source", "target", "source_genesymbol", "target_genesymbol"]},
         "indexes": [
             "CREATE INDEX IF NOT EXISTS idx_interactions_source ON interactions (source);",
             "CREATE INDEX IF NOT EXISTS idx_interactions_target ON interactions (target);",
@@ -143,8 +265,10 @@ TABLE_CONFIG = {
             "CREATE INDEX IF NOT EXISTS idx_interactions_target_genesymbol ON interactions (target_genesymbol);",
             "CREATE INDEX IF NOT EXISTS idx_interactions_pair ON interactions (source, target);",
             "CREATE INDEX IF NOT EXISTS idx_interactions_sources ON interactions (sources);",
-            "CREATE INDEX IF NOT EXISTS idx_interactions_type ON interactions (\"type\");"
-        ]
+            "CREATE INDEX IF NOT EXISTS idx_interactions_type ON interactions (\"type\");",
+            "CREATE INDEX IF NOT EXISTS idx_interactions_resource_ids ON interactions USING GIN (resource_ids);"
+        ],
+        "materialized_views": [source_counts_view("interactions")],
     },
     "intercell": {
         "file": "omnipath_webservice_intercell.tsv",
@@ -167,23 +291,80 @@ TABLE_CONFIG = {
             plasma_membrane_transmembrane BOOLEAN,
             plasma_membrane_peripheral BOOLEAN
         """,
+        "source": {"column": "database"},
+        "taps": ["protein_summary"],
+        "parquet": {"statistics": ["uniprot", "genesymbol", "category"]},
         "indexes": [
             "CREATE INDEX IF NOT EXISTS idx_intercell_uniprot ON intercell (uniprot);",
             "CREATE INDEX IF NOT EXISTS idx_intercell_genesymbol ON intercell (genesymbol);",
             "CREATE INDEX IF NOT EXISTS idx_intercell_category ON intercell (category);",
             "CREATE INDEX IF NOT EXISTS idx_intercell_database ON intercell (database);"
-        ]
+        ],
+        "materialized_views": [
+            source_counts_view("intercell", "database", None),
+            {
+                "name": "intercell_category_rollup",
+                "query": """
+                    SELECT COALESCE(category, '') AS category, COALESCE(parent, '') AS parent,
+                           COALESCE(database, '') AS database, COALESCE(aspect, '') AS aspect,
+                           COALESCE(scope, '') AS scope,
+                           COUNT(*)::int AS records,
+                           COUNT(DISTINCT uniprot)::int AS proteins,
+                           (COUNT(*) FILTER (WHERE transmitter))::int AS transmitter,
+                           (COUNT(*) FILTER (WHERE receiver))::int AS receiver,
+                           (COUNT(*) FILTER (WHERE secreted))::int AS secreted,
+                           (COUNT(*) FILTER (WHERE plasma_membrane_transmembrane))::int AS plasma_membrane_transmembrane,
+                           (COUNT(*) FILTER (WHERE plasma_membrane_peripheral))::int AS plasma_membrane_peripheral
+                    FROM intercell
+                    GROUP BY 1, 2, 3, 4, 5
+                """,
+                "indexes": [
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_intercell_category_rollup_key "
+                    "ON intercell_category_rollup (category, parent, database, aspect, scope);",
+                    "CREATE INDEX IF NOT EXISTS idx_intercell_category_rollup_parent ON intercell_category_rollup (parent);",
+                ],
+            },
+        ],
     }
 }
 
+# Tables computed from the loaded tables in "requires", built after a full load
+def ligand_receptor_pairs(conn):
+    from ligand_receptor import build_pairs_table, export_pairs_parquet
+    build_pairs_table(conn)
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print("pyarrow is not installed, skipping the Parquet export of the ligand-receptor pairs.")
+        return
+    export_pairs_parquet(conn)
+
+def protein_summary(conn):
+    from protein_summary import build_protein_summary
+    build_protein_summary(conn)
+
+DERIVED_TABLES = {
+    "protein_summary": {
+        # From the counts saved by the "protein_summary" taps
+        "requires": ["annotations", "complexes", "enz_sub", "interactions", "intercell"],
+        "build": protein_summary,
+    },
+    "ligand_receptor_pairs": {
+        "requires": ["interactions", "intercell"],
+        "build": ligand_receptor_pairs,
+    },
+}
+
 # --- Check Environment Variables ---
-if not DATABASE_URL:
-    print(f"Error: DATABASE_URL{'_PROD' if NODE_ENV == 'production' else '_DEV'} is not set in .env file.")
-    print(f"Current NODE_ENV: {NODE_ENV}")
-    sys.exit(1)
+# Called by the commands connecting to the database, so the configuration can be imported without one
+def check_environment():
+    if not DATABASE_URL:
+        print(f"Error: DATABASE_URL{'_PROD' if NODE_ENV == 'production' else '_DEV'} is not set in .env file.")
+        print(f"Current NODE_ENV: {NODE_ENV}")
+        sys.exit(1)
 
-print(f"Environment: {NODE_ENV}")
-print(f"Connecting to: {DB_HOST}:{DB_PORT}/{DB_NAME} as {DB_USER}")
+    print(f"Environment: {NODE_ENV}")
+    print(f"Connecting to: {DB_HOST}:{DB_PORT}/{DB_NAME} as {DB_USER}")
 
 # --- Database Operations ---
 
@@ -223,8 +404,13 @@ def create_table(conn, table_name, table_config):
             conn.rollback()
             raise
 
-def load_data_with_copy(conn, table_name, file_path):
-    """Loads data using PostgreSQL COPY command for maximum performance."""
+def load_data_with_copy(conn, table_name, file_path, config=None, taps=()):
+    """
+    Loads data using PostgreSQL COPY command for maximum performance.
+
+    The `TAPS` named in `taps` are fed from the same read of the file and
+    store their results once COPY succeeds.
+    """
     print(f"Loading data into '{table_name}' from '{os.path.basename(file_path)}'...")
     start_time = time.time()
     
@@ -243,14 +429,24 @@ def load_data_with_copy(conn, table_name, file_path):
             # Create column list for COPY command
             column_list = ', '.join([sql.Identifier(col).as_string(cur) for col in columns])
             
+            builders = [builder for builder in (TAPS[name](columns, config) for name in taps) if builder is not None]
+
+            def feed(data):
+                for builder in builders:
+                    builder.feed(data)
+
             # Use COPY command for bulk loading
             with open(file_path, 'r', encoding='utf-8') as f:
                 # Skip header line and copy data
                 next(f)  # Skip header
                 copy_sql = f"COPY {table_name} ({column_list}) FROM STDIN WITH CSV DELIMITER E'\\t' NULL AS ''"
-                cur.copy_expert(copy_sql, f)
+                cur.copy_expert(copy_sql, TapReader(f, feed) if builders else f)
             
             conn.commit()
+
+            for builder in builders:
+                builder.finish()
+                builder.store(conn)
             
             # Get row count
             cur.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(table_name)))
@@ -289,8 +485,156 @@ def create_indexes(conn, table_name, indexes):
             conn.rollback()
             raise
 
-def process_table(conn, config, skip_indexes=False):
-    """Process a single table: create, load data, and optionally create indexes."""
+def resolve_source_labels(conn, table_name, source_config, resolver):
+    """Adds the distinct source labels of a table to the resource names lookup."""
+    print(f"Resolving source labels of '{table_name}'...")
+    start_time = time.time()
+    column = sql.Identifier(source_config["column"])
+    if source_config.get("separator"):
+        labels_query = sql.SQL(
+            "SELECT DISTINCT unnest(string_to_array({column}, %s)) FROM {table} WHERE {column} IS NOT NULL"
+        ).format(column=column, table=sql.Identifier(table_name))
+        params = (source_config["separator"],)
+    else:
+        labels_query = sql.SQL(
+            "SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL"
+        ).format(column=column, table=sql.Identifier(table_name))
+        params = ()
+
+    with conn.cursor() as cur:
+        try:
+            cur.execute(f"""
+                CREATE TABLE IF NOT EXISTS {RESOURCE_NAMES_TABLE} (
+                    source_label TEXT PRIMARY KEY,
+                    resource_id TEXT NOT NULL,
+                    description_key TEXT
+                )
+            """)
+            cur.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{RESOURCE_NAMES_TABLE}_resource_id "
+                f"ON {RESOURCE_NAMES_TABLE} (resource_id);"
+            )
+            cur.execute(labels_query, params)
+            labels = [label for (label,) in cur.fetchall() if label]
+            rows = [(label, *resolver.resolve(label)) for label in labels]
+            # Re-resolved on every load, so alias changes take effect
+            cur.executemany(f"""
+                INSERT INTO {RESOURCE_NAMES_TABLE} (source_label, resource_id, description_key)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (source_label) DO UPDATE
+                SET resource_id = EXCLUDED.resource_id, description_key = EXCLUDED.description_key
+            """, rows)
+            conn.commit()
+        except psycopg2.Error as e:
+            print(f"Error resolving source labels of '{table_name}': {e}")
+            conn.rollback()
+            raise
+
+    described = sum(key is not None for _, _, key in rows)
+    print(f"Resolved {len(rows)} source labels of '{table_name}' ({described} with descriptions) "
+          f"in {time.time() - start_time:.2f} seconds")
+
+def add_resource_ids(conn, table_name, source_config):
+    """Fills the canonical resource id array of a table with multi-resource source strings."""
+    print(f"Filling resource ids of '{table_name}'...")
+    start_time = time.time()
+    update_query = sql.SQL("""
+        UPDATE {table} t
+        SET resource_ids = ARRAY(
+            SELECT DISTINCT n.resource_id
+            FROM unnest(string_to_array(t.{column}, %s)) AS s(label)
+            JOIN {names} n ON n.source_label = s.label
+            ORDER BY n.resource_id
+        )
+        WHERE t.{column} IS NOT NULL
+    """).format(
+        table=sql.Identifier(table_name),
+        column=sql.Identifier(source_config["column"]),
+        names=sql.Identifier(RESOURCE_NAMES_TABLE),
+    )
+
+    with conn.cursor() as cur:
+        try:
+            # Tables loaded before the column was added to the schema
+            cur.execute(sql.SQL("ALTER TABLE {} ADD COLUMN IF NOT EXISTS resource_ids TEXT[]").format(
+                sql.Identifier(table_name)))
+            cur.execute(update_query, (source_config["separator"],))
+            updated = cur.rowcount
+            conn.commit()
+        except psycopg2.Error as e:
+            print(f"Error filling resource ids of '{table_name}': {e}")
+            conn.rollback()
+            raise
+
+    print(f"Filled resource ids of {updated:,} rows in '{table_name}' in {time.time() - start_time:.2f} seconds")
+
+def normalize_sources(conn, config, resolver):
+    """Resolves the source labels of a table and fills its resource id column, if it has one."""
+    source_config = config.get("source")
+    if not source_config:
+        return
+    resolve_source_labels(conn, config["table"], source_config, resolver)
+    if source_config.get("separator"):
+        add_resource_ids(conn, config["table"], source_config)
+
+def refresh_materialized_views(conn, config):
+    """
+    Creates the materialized views of a table, or refreshes the existing ones concurrently.
+
+    A load drops the table with its views, so after a load the views are
+    created again, not refreshed. Only --refresh-views and --names-only find
+    the views in place and refresh them concurrently, which keeps them
+    readable and needs one of their indexes to be unique. Timings are
+    recorded in `VIEW_REFRESHES_TABLE`.
+    """
+    for view in config.get("materialized_views", []):
+        name = view["name"]
+        start_time = time.time()
+
+        with conn.cursor() as cur:
+            try:
+                cur.execute("SELECT to_regclass(%s) IS NOT NULL", (name,))
+                if cur.fetchone()[0]:
+                    mode = "refresh"
+                    cur.execute(sql.SQL("REFRESH MATERIALIZED VIEW CONCURRENTLY {}").format(sql.Identifier(name)))
+                else:
+                    mode = "create"
+                    cur.execute(f"CREATE MATERIALIZED VIEW {name} AS {view['query']}")
+                    for index_sql in view.get("indexes", []):
+                        cur.execute(index_sql)
+                cur.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(name)))
+                cur.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(name)))
+                row_count = cur.fetchone()[0]
+                duration_ms = int((time.time() - start_time) * 1000)
+
+                cur.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {VIEW_REFRESHES_TABLE} (
+                        view_name TEXT PRIMARY KEY,
+                        table_name TEXT NOT NULL,
+                        mode TEXT NOT NULL,
+                        duration_ms INTEGER NOT NULL,
+                        row_count INTEGER NOT NULL,
+                        refreshed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                    )
+                """)
+                cur.execute(f"""
+                    INSERT INTO {VIEW_REFRESHES_TABLE} (view_name, table_name, mode, duration_ms, row_count)
+                    VALUES (%s, %s, %s, %s, %s)
+                    ON CONFLICT (view_name) DO UPDATE
+                    SET table_name = EXCLUDED.table_name, mode = EXCLUDED.mode, duration_ms = EXCLUDED.duration_ms,
+                        row_count = EXCLUDED.row_count, refreshed_at = now()
+                """, (name, config["table"], mode, duration_ms, row_count))
+                conn.commit()
+            except psycopg2.Error as e:
+                print(f"Error refreshing materialized view '{name}': {e}")
+                conn.rollback()
+                raise
+
+        print(f"Materialized view '{name}' {'refreshed' if mode == 'refresh' else 'created'} "
+              f"with {row_count:,} rows in {duration_ms / 1000:.2f} seconds")
+
+def process_table(conn, config, skip_indexes=False, resolver=None, skip_taps=(), extra_taps=()):
+    """Process a single table: create, load data, resolve sources, optionally create indexes, and build its views."""
     table_name = config["table"]
     file_path = os.path.join(DATA_DIR, config["file"])
     
@@ -303,15 +647,28 @@ def process_table(conn, config, skip_indexes=False):
     create_table(conn, table_name, config)
     
     # Load data
-    if load_data_with_copy(conn, table_name, file_path):
+    taps = [name for name in [*config.get("taps", []), *extra_taps] if name not in skip_taps]
+    if load_data_with_copy(conn, table_name, file_path, config, taps):
+        normalize_sources(conn, config, resolver or ResourceNameResolver())
+
         # Create indexes if requested
         if not skip_indexes and config.get("indexes"):
             create_indexes(conn, table_name, config["indexes"])
+
+        refresh_materialized_views(conn, config)
         
         return True
     
     return False
 
+def build_derived_tables(conn):
+    """Builds the `DERIVED_TABLES` from the loaded tables."""
+    for name, derived in DERIVED_TABLES.items():
+        print(f"\n{'='*60}")
+        print(f"Building derived table: {name} (from {', '.join(derived['requires'])})")
+        print(f"{'='*60}")
+        derived["build"](conn)
+
 def main():
     """Main execution function."""
     import argparse
@@ -323,8 +680,25 @@ def main():
                        help="Skip creating indexes (for faster loading)")
     parser.add_argument("--indexes-only", action="store_true", 
                        help="Only create indexes for existing tables")
+    parser.add_argument("--skip-graph", action="store_true",
+                       help="Don't build the CSR adjacency arrays of the interactions (skipped anyway without NumPy)")
+    parser.add_argument("--skip-taps", nargs="+", default=[], choices=list(TAPS),
+                       help="Don't build these artifacts derived from the loaded rows")
+    parser.add_argument("--parquet", action="store_true",
+                       help=f"Also write the tables as Parquet into '{PARQUET_DIR}' (needs pyarrow)")
+    parser.add_argument("--names-only", action="store_true",
+                       help="Only resolve source labels and fill resource ids for existing tables")
+    parser.add_argument("--refresh-views", action="store_true",
+                       help="Only refresh the materialized views of existing tables")
+    parser.add_argument("--derived-only", action="store_true",
+                       help="Only build the derived tables from existing tables")
+    parser.add_argument("--skip-derived", action="store_true",
+                       help="Don't build the derived tables after a full load")
     
     args = parser.parse_args()
+    check_environment()
+    skip_taps = set(args.skip_taps) | ({"graph"} if args.skip_graph else set())
+    extra_taps = ["parquet"] if args.parquet else []
     
     conn = None
     try:
@@ -338,12 +712,32 @@ def main():
                 if config.get("indexes"):
                     create_indexes(conn, config["table"], config["indexes"])
             print("\nAll indexes created successfully!")
+
+        elif args.names_only:
+            # Only (re)build the resource names lookup and resource id columns
+            resolver = ResourceNameResolver()
+            selected = [args.table] if args.table else list(TABLE_CONFIG)
+            for table_key in selected:
+                normalize_sources(conn, TABLE_CONFIG[table_key], resolver)
+                # The source counts carry the resolved resource ids
+                refresh_materialized_views(conn, TABLE_CONFIG[table_key])
+            print("\nSource labels resolved successfully!")
+
+        elif args.refresh_views:
+            selected = [args.table] if args.table else list(TABLE_CONFIG)
+            for table_key in selected:
+                refresh_materialized_views(conn, TABLE_CONFIG[table_key])
+            print("\nMaterialized views refreshed successfully!")
+
+        elif args.derived_only:
+            build_derived_tables(conn)
+            print("\nDerived tables built successfully!")
             
         elif args.table:
             # Process single table
             if args.table in TABLE_CONFIG:
                 config = TABLE_CONFIG[args.table]
-                success = process_table(conn, config, args.skip_indexes)
+                success = process_table(conn, config, args.skip_indexes, skip_taps=skip_taps, extra_taps=extra_taps)
                 if success:
                     print(f"\nTable '{args.table}' processed successfully!")
                 else:
@@ -369,15 +763,19 @@ def main():
             
             total_start_time = time.time()
             successful_tables = 0
+            resolver = ResourceNameResolver()
             
             for table_key in table_order:
                 if table_key in TABLE_CONFIG:
                     config = TABLE_CONFIG[table_key]
-                    if process_table(conn, config, args.skip_indexes):
+                    if process_table(conn, config, args.skip_indexes, resolver, skip_taps, extra_taps):
                         successful_tables += 1
                     else:
                         print(f"Failed to process table '{table_key}', stopping.")
                         sys.exit(1)
+
+            if not args.skip_derived:
+                build_derived_tables(conn)
             
             total_end_time = time.time()
             
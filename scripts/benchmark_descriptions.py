@@ -0,0 +1,149 @@
+"""Benchmarks for src/data/descriptions.py.
+
+Usage:
+    python scripts/benchmark_descriptions.py html [--factors 1 2 4 8 16]
+    python scripts/benchmark_descriptions.py import [--module-dir DIR]
+    python scripts/benchmark_descriptions.py registry
+"""
+import os
+import sys
+import time
+import copy
+import argparse
+import statistics
+import subprocess
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "data")
+sys.path.insert(0, DATA_DIR)
+
+IMPORT_PROBE = """
+import sys, time
+start_time = time.perf_counter()
+import descriptions
+elapsed = time.perf_counter() - start_time
+heavy = sorted(m for m in ('bs4', 'future', 'pypath') if m in sys.modules)
+print(elapsed, len(sys.modules), ','.join(heavy))
+"""
+
+REGISTRY_PROBE = """
+import time
+start_time = time.perf_counter()
+if {compiled}:
+    import registry
+    r = registry.load_registry()
+    hits = registry.facet(r, 'commercial_use', True)
+else:
+    import descriptions
+    hits = [
+        k for k, v in descriptions.descriptions.items()
+        if (v.get('license') or {{}}).get('commercial_use') is True
+    ]
+print(time.perf_counter() - start_time, len(hits))
+"""
+
+
+def grow_registry(descriptions, factor):
+    """Returns a registry `factor` times larger, made of renamed copies of the entries."""
+    grown = {}
+    for i in range(factor):
+        for key, entry in descriptions.items():
+            grown[key if i == 0 else f"{key}_{i}"] = copy.deepcopy(entry)
+    return grown
+
+
+def benchmark_html(factors, repeat):
+    """Times gen_html on growing registries, uncached and cached."""
+    import descriptions as desc
+
+    original = desc.descriptions
+    print(f"{'resources':>10} {'uncached ms':>12} {'us/resource':>12} {'cached ms':>10} {'size KB':>9}")
+    try:
+        for factor in factors:
+            desc.descriptions = grow_registry(original, factor)
+            n = len(desc.descriptions)
+
+            uncached = []
+            for _ in range(repeat):
+                desc._html_cache.clear()
+                start_time = time.perf_counter()
+                html = desc.gen_html()
+                uncached.append(time.perf_counter() - start_time)
+
+            start_time = time.perf_counter()
+            for _ in range(repeat):
+                desc.gen_html()
+            cached = (time.perf_counter() - start_time) / repeat
+
+            best = min(uncached)
+            print(f"{n:>10} {best * 1000:>12.2f} {best / n * 1e6:>12.2f} {cached * 1000:>10.3f} {len(html) / 1024:>9.0f}")
+    finally:
+        desc.descriptions = original
+        desc._html_cache.clear()
+
+
+def benchmark_import(module_dir, repeat):
+    """Times `import descriptions` in fresh interpreters.
+
+    Point `module_dir` at a checkout of an older revision to compare.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        [module_dir] + [p for p in os.environ.get("PYTHONPATH", "").split(os.pathsep) if p]
+    ))
+    timings = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", IMPORT_PROBE],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        timings.append(float(out[0]))
+    n_modules = out[1]
+    heavy = out[2] if len(out) > 2 else "-"
+    print(f"Module: {os.path.join(module_dir, 'descriptions.py')}")
+    print(f"  import time: median {statistics.median(timings) * 1000:.1f} ms, "
+          f"min {min(timings) * 1000:.1f} ms over {repeat} runs")
+    print(f"  modules loaded: {n_modules}, heavy dependencies imported: {heavy}")
+
+
+def benchmark_registry(repeat):
+    """Startup plus one facet query: compiled artifact vs importing the module."""
+    for label, compiled in (("import descriptions + scan", False), ("load_registry + facet", True)):
+        timings = []
+        for _ in range(repeat):
+            out = subprocess.run(
+                [sys.executable, "-c", REGISTRY_PROBE.format(compiled=compiled)],
+                cwd=DATA_DIR, capture_output=True, text=True, check=True,
+            ).stdout.split()
+            timings.append(float(out[0]))
+        print(f"{label:<28} median {statistics.median(timings) * 1000:7.2f} ms, "
+              f"{out[1]} commercial-use resources")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for the resource descriptions module")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    html = subparsers.add_parser("html", help="Scaling of gen_html with the registry size")
+    html.add_argument("--factors", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                      help="Registry size multipliers")
+    html.add_argument("--repeat", type=int, default=5, help="Runs per size")
+
+    imp = subparsers.add_parser("import", help="Cost of importing the module")
+    imp.add_argument("--module-dir", default=DATA_DIR,
+                     help="Directory containing the descriptions.py to import")
+    imp.add_argument("--repeat", type=int, default=10, help="Number of fresh interpreters")
+
+    reg = subparsers.add_parser("registry", help="Compiled registry artifact vs module import")
+    reg.add_argument("--repeat", type=int, default=10, help="Number of fresh interpreters")
+
+    args = parser.parse_args()
+
+    if args.benchmark == "html":
+        benchmark_html(args.factors, args.repeat)
+    elif args.benchmark == "import":
+        benchmark_import(os.path.abspath(args.module_dir), args.repeat)
+    elif args.benchmark == "registry":
+        benchmark_registry(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
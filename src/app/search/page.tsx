@@ -1,4 +1,4 @@
-import { SearchIdentifiersResponse } from "@/db/queries"
+import { getProteinSummaries, GetProteinSummariesResponse, SearchIdentifiersResponse } from "@/db/queries"
 import { searchProteinNeighbors } from "@/features/interactions-browser/api/queries"
 import { getProteinAnnotations } from "@/features/annotations-browser/api/queries"
 import { getIntercellData } from "@/features/intercell-browser/api/queries"
@@ -24,6 +24,7 @@ export default async function SearchPage({ searchParams }: SearchPageProps) {
 
   const identifierResults: Record<string, SearchIdentifiersResponse> = {}
   let initialTabData: unknown = null
+  let proteinSummaries: GetProteinSummariesResponse = []
 
   if (query) {
     try {
@@ -34,6 +35,14 @@ export default async function SearchPage({ searchParams }: SearchPageProps) {
       Object.assign(identifierResults, resolvedIdentifierResults)
 
       if (resolvedIdentifiers.length > 0) {
+        // Counts for the tab badges and protein cards, one primary key lookup
+        // instead of a request per table
+        const summariesRequest = getProteinSummaries(resolvedIdentifiers.map(result => result.uniprotAccession))
+          .catch(error => {
+            console.error('Error fetching protein summaries:', error)
+            return []
+          })
+
         // Fetch initial tab data on server
         switch (activeTab) {
           case 'interactions':
@@ -52,6 +61,7 @@ export default async function SearchPage({ searchParams }: SearchPageProps) {
             initialTabData = await getEnzSubData(resolvedIdentifiers)
             break
         }
+        proteinSummaries = await summariesRequest
       }
     } catch (error) {
       console.error('Error fetching initial data:', error)
@@ -64,6 +74,7 @@ export default async function SearchPage({ searchParams }: SearchPageProps) {
       <div className="sticky top-0 bg-background z-10 min-w-0">
         <SearchHeader
           identifierResults={identifierResults}
+          proteinSummaries={proteinSummaries}
           activeTab={activeTab}
           selectedSpecies={selectedSpecies}
         />
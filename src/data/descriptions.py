@@ -17,29 +17,64 @@
 #  Website: https://pypath.omnipathdb.org/
 #
 
+import os
 import sys
-from future.utils import iteritems
+import json
+import builtins
+import pickle
+import hashlib
+import collections
 
-import codecs
-import bs4
-import textwrap
+# `pypath` modules are imported in the functions using them, so reading
+# the `descriptions` dict doesn't pull in the whole `pypath` import graph
 
-import pypath.omnipath.server._html as _html
-import pypath.resources.data_formats as data_formats
-import pypath.resources.urls as urls
-import pypath.share.session as session_mod
+__all__ = [
+    'descriptions',
+    'gen_html',
+    'iter_html',
+    'write_html',
+    'iter_page',
+    'compile_registry',
+    'ResourceRegistry',
+    'validate',
+]
 
-__all__ = ['descriptions', 'gen_html', 'write_html']
-
-if 'long' not in __builtins__:
+if not hasattr(builtins, 'long'):
     long = int
 
-if 'unicode' not in __builtins__:
+if not hasattr(builtins, 'unicode'):
     unicode = str
 
 
-_logger = session_mod.Logger(name = 'descriptions')
-_log = _logger._log
+_logger = None
+
+
+def _log(msg, *args, **kwargs):
+    '''
+    Logs through the `pypath` session logger, created on first use.
+    Without `pypath` (metadata-only tooling like `compile`), or if its
+    session can't be set up, the message goes to stderr instead.
+    '''
+    global _logger
+
+    if _logger is None:
+
+        try:
+
+            import pypath.share.session as session_mod
+            _logger = session_mod.Logger(name = 'descriptions')
+
+        except Exception:
+
+            _logger = False
+
+    if _logger:
+
+        _logger._log(msg, *args, **kwargs)
+
+    else:
+
+        sys.stderr.write('[descriptions] %s\n' % msg)
 
 
 descriptions = {
@@ -3056,200 +3091,830 @@ pypath_methods = {
 }
 
 
-def gen_html():
+_HTML_TITLE = 'Metadata about signaling pathway resources'
+
+_HTML_INTRO = (
+    '<div class="yellowbox box">\n'
+    '<p>\n'
+        '<em>\n'
+        'Information on this page has been last revised in Nov 2016.\n'
+        'As of Oct 2019 we are working on updating and extending this\n'
+        'page and will publish the new version soon.\n'
+        'About updates of the OmniPath database content please refer to\n'
+        '<a href="http://archive.omnipathdb.org/README.txt">\n'
+            'our archive.\n'
+        '</a>\n'
+        '</em>\n'
+    '</p>\n'
+    '</div>\n'
+    '<p>This collection was created during the construction '
+    'of OmniPath when we considered more than 50 resources and '
+    'selected the ones containing literature curation effort. '
+    'OmniPath is a network '
+    'of signaling pathways intending to '
+    'combine all high quality, manually curated efforts. The '
+    'descriptions here cite the relevant sentences '
+    'about the curation protocols from the original articles and webpages. '
+    'URLs pointing to the articles and the webpages, and some '
+    'additional metadata are provided where available. '
+    'The resources with green title are included by default in '
+    'OmniPath. <span class="code">pypath</span> methods are listed '
+    ' where available, to know more please look at <a '
+    'target="_blank" href="http://pypath.omnipathdb.org/">'
+    'pypath documentation.</a> This list is only about network '
+    'resources. <span class="code">pypath</span> is able to '
+    'process and integrate many other resources, please see '
+    'the paper and the documentation to know more.</p>'
+    '<p class="small">We searched for license information '
+    'in the main, About, Download and FAQ sections of the webpages, '
+    'and run Google searches for the database name and license. '
+    'Where we could not find anything about licensing, we assumed '
+    'no license. Unfortunately due to todays restrictive copyright '
+    'legislations, users don\'t have the freedom to use, modify and '
+    'redistribute the data without a license explicitely granting '
+    'these to them. Despite the clear intention from the authors to '
+    'make their data public, and statements on the webpage like '
+    '"free to use" or "available for download".</p>\n'
+)
+
+# fingerprint of `descriptions` -> rendered page
+_html_cache = {}
+
+
+def _fingerprint(obj):
     '''
-    Generates a HTML page from the `descriptions` array.
-    This HTML is provided by the webservice under `/info`,
-    or can be saved locally with `write_html()`.
+    Returns a hash of a registry object, used as cache key.
+    Pickling is several times faster than `repr` on these structures.
     '''
-    # Header
-    title = 'Metadata about signaling pathway resources'
-    doc = (
-        '<div class="yellowbox box">\n'
-        '<p>\n'
-            '<em>\n'
-            'Information on this page has been last revised in Nov 2016.\n'
-            'As of Oct 2019 we are working on updating and extending this\n'
-            'page and will publish the new version soon.\n'
-            'About updates of the OmniPath database content please refer to\n'
-            '<a href="http://archive.omnipathdb.org/README.txt">\n'
-                'our archive.\n'
-            '</a>\n'
-            '</em>\n'
-        '</p>\n'
-        '</div>\n'
-        '<p>This collection was created during the construction '
-        'of OmniPath when we considered more than 50 resources and '
-        'selected the ones containing literature curation effort. '
-        'OmniPath is a network '
-        'of signaling pathways intending to '
-        'combine all high quality, manually curated efforts. The '
-        'descriptions here cite the relevant sentences '
-        'about the curation protocols from the original articles and webpages. '
-        'URLs pointing to the articles and the webpages, and some '
-        'additional metadata are provided where available. '
-        'The resources with green title are included by default in '
-        'OmniPath. <span class="code">pypath</span> methods are listed '
-        ' where available, to know more please look at <a '
-        'target="_blank" href="http://pypath.omnipathdb.org/">'
-        'pypath documentation.</a> This list is only about network '
-        'resources. <span class="code">pypath</span> is able to '
-        'process and integrate many other resources, please see '
-        'the paper and the documentation to know more.</p>'
-        '<p class="small">We searched for license information '
-        'in the main, About, Download and FAQ sections of the webpages, '
-        'and run Google searches for the database name and license. '
-        'Where we could not find anything about licensing, we assumed '
-        'no license. Unfortunately due to todays restrictive copyright '
-        'legislations, users don\'t have the freedom to use, modify and '
-        'redistribute the data without a license explicitely granting '
-        'these to them. Despite the clear intention from the authors to '
-        'make their data public, and statements on the webpage like '
-        '"free to use" or "available for download".</p>\n'
-    )
-    doc += '\t<h2>Contents</h2>\n'
-    doc += '\t<ul>\n'
-    # Table of Content
-    for k, v in sorted(descriptions.items(), key=lambda x: x[0].lower()):
-        doc += '\t\t\t<li><a href="#%s" class="%s">%s</a></li>\n' % \
-            (k, 'omnipath' if 'omnipath' in v and v['omnipath'] else 'base',
-             v['label'] if 'label' in v else k)
-    doc += '\t</ul>\n'
-    # Sections
-    for k, v in sorted(descriptions.items(), key=lambda x: x[0].lower()):
-        doc += u'\t\t<br>\n\t\t<h2 id="%s" class="%s">%s%s</h2>\n' % \
-            (k, 'omnipath' if 'omnipath' in v and v['omnipath'] else 'base',
-             v['label'] if 'label' in v else k,
-             (u' – %s' % (v['full_name'],)) if 'full_name' in v else '')
-        doc += '\t\t\t<p><b>Category || Subcategory &gt;&gt;&gt;</b> %s || %s</p>\n' % \
-            (v['type'].capitalize() if 'type' in v else 'Undefined',
-                v['subtype'].capitalize() if 'subtype' in v else 'Undefined')
-        if 'year' in v:
-            doc += '\t\t\t<h3>Last released: %u<\h3>\n' % v['year']
-        if 'releases' in v:
-            doc += '\t\t\t<p><b>Released in years: </b>%s</p>\n' % \
-                ', '.join(['%u' % y for y in v['releases']])
-        if 'authors' in v and v['authors'] is not None:
-            doc += '\t\t\t<p><b>Created by </b>%s</p>\n' % ', '.join(v[
-                'authors'])
-        if 'emails' in v and v['emails'] is not None:
-            doc += '\t\t\t<p><b>Contact: </b></p>\n\n\t\t\t\t<ul>\n%s\n' % \
-                ''.join(['\t\t\t\t<li><a href="mailto:%s">%s &lt;%s&gt;</li>\n' %
-                         (em[0], em[1], em[0]) for em in v['emails']])
-            doc += '\t\t\t\t</ul>\n'
-        if 'license' in v:
-            try:
-                doc += '\t\t\t<p><b>License:</b> %s%s%s</p>\n' % (
-                    ('<a href="%s" target="_blank">' % v['license']['url']) if
-                    'url' in v['license'] else '', v['license']['name'], '</a>'
-                    if 'url' in v['license'] else '')
-            except KeyError:
-                _log('Wrong license format for `%s`.' % k)
-        if 'urls' in v:
-            for uk, uv in iteritems(v['urls']):
-                if len(uv) > 0 and uk != 'omictools':
-                    try:
-                        doc += '\t\t\t<h3>%s</h3>\n' % (uk.capitalize())
-                        doc += '\t\t\t<ul>\n'
-                        for a in uv:
-                            doc += (
-                                '\t\t\t\t<li><a href="%s" '
-                                'target="_blank">%s</a></li>\n' % (
-                                    a, a
-                                )
+    return hashlib.sha1(pickle.dumps(obj, protocol = 4)).hexdigest()
+
+
+def sorted_descriptions():
+    '''
+    Returns the `descriptions` items sorted case-insensitively by key,
+    the order in which every output lists the resources.
+    '''
+    return sorted(descriptions.items(), key = lambda x: x[0].lower())
+
+
+def _resource_html(k, v):
+    '''
+    Generates the HTML section about one resource.
+    '''
+    doc = []
+    add = doc.append
+    add(u'\t\t<br>\n\t\t<h2 id="%s" class="%s">%s%s</h2>\n' % \
+        (k, 'omnipath' if 'omnipath' in v and v['omnipath'] else 'base',
+         v['label'] if 'label' in v else k,
+         (u' – %s' % (v['full_name'],)) if 'full_name' in v else ''))
+    add('\t\t\t<p><b>Category || Subcategory &gt;&gt;&gt;</b> %s || %s</p>\n' % \
+        (v['type'].capitalize() if 'type' in v else 'Undefined',
+            v['subtype'].capitalize() if 'subtype' in v else 'Undefined'))
+    if 'year' in v:
+        add('\t\t\t<h3>Last released: %u<\h3>\n' % v['year'])
+    if 'releases' in v:
+        add('\t\t\t<p><b>Released in years: </b>%s</p>\n' % \
+            ', '.join(['%u' % y for y in v['releases']]))
+    if 'authors' in v and v['authors'] is not None:
+        add('\t\t\t<p><b>Created by </b>%s</p>\n' % ', '.join(v[
+            'authors']))
+    if 'emails' in v and v['emails'] is not None:
+        add('\t\t\t<p><b>Contact: </b></p>\n\n\t\t\t\t<ul>\n%s\n' % \
+            ''.join(['\t\t\t\t<li><a href="mailto:%s">%s &lt;%s&gt;</li>\n' %
+                     (em[0], em[1], em[0]) for em in v['emails']]))
+        add('\t\t\t\t</ul>\n')
+    if 'license' in v:
+        try:
+            add('\t\t\t<p><b>License:</b> %s%s%s</p>\n' % (
+                ('<a href="%s" target="_blank">' % v['license']['url']) if
+                'url' in v['license'] else '', v['license']['name'], '</a>'
+                if 'url' in v['license'] else ''))
+        except KeyError:
+            _log('Wrong license format for `%s`.' % k)
+    if 'urls' in v:
+        for uk, uv in v['urls'].items():
+            if len(uv) > 0 and uk != 'omictools':
+                try:
+                    add('\t\t\t<h3>%s</h3>\n' % (uk.capitalize()))
+                    add('\t\t\t<ul>\n')
+                    for a in uv:
+                        add(
+                            '\t\t\t\t<li><a href="%s" '
+                            'target="_blank">%s</a></li>\n' % (
+                                a, a
                             )
-                        doc += '\t\t\t</ul>\n'
-                    except UnicodeDecodeError:
-                        sys.stdout.write('UnicdeDecodeError at %s\n' % k)
-                        sys.stdout.flush()
-        if 'pubmeds' in v:
-            doc += '\t\t\t<h3>PubMed</h3>\n'
-            doc += '\t\t\t<ul>\n'
-            for pmid in v['pubmeds']:
-                doc += '\t\t\t\t<li><a href="%s" '\
-                    'target="_blank">%s</a></li>\n' % (
-                        'http://www.ncbi.nlm.nih.gov/pubmed/%u' % pmid,
-                        'http://www.ncbi.nlm.nih.gov/pubmed/%u' % pmid
-                    )
-            doc += '\t\t\t</ul>\n'
-        if ('urls' in v and 'omictools' in v['urls']) or 'pathguide' in v:
-            doc += '\t\t\t<h3>Collections</h3>\n\t\t\t<ul>'
-            if 'omictools' in v['urls']:
-                doc += '\t\t\t<li><a href="%s" target="_blank">OmicTools</a></li>\n' % \
-                    v['urls']['omictools'][0]
-            if 'pathguide' in v:
-                doc += '\t\t\t<li><a href="%s" target="_blank">PathGuide</a></li>\n' % \
-                    (urls.urls['pathguide']['url'] % v['pathguide'])
-            doc += '\t\t\t</ul>\n'
-        if 'taxons' in v:
-            doc += '<p><b>Taxons: </b><em>%s</em></p>' % \
-                ', '.join(['%s%s' % (t[0].upper(), t[1:])
-                           for t in v['taxons']])
-        if 'size' in v and type(v['size']) is dict and \
-                v['size']['nodes'] is not None and v['size']['edges'] is not None:
-            doc += '<p><b>Nodes: </b>%s, <b>Edges:</b>%s</p>' % (
-                v['size']['nodes'], v['size']['edges'])
-        if 'data_import' in v:
-            doc += '\t\t\t<p><b>Direct data import from: </b>%s</p>\n' % \
-                ', '.join(v['data_import'])
-        if 'includes' in v:
-            doc += '\t\t\t<p><b>Includes data from: </b>%s</p>\n' % \
-                ', '.join(v['includes'])
-        if 'descriptions' in v or 'notes' in v:
-            doc += '\t\t\t<h3>Quotes</h3>\n'
-            if 'descriptions' in v:
-                doc += '\t\t\t\t<div class="quotebox box">\n'
-                pars = v['descriptions'][0].split('\n')
-                for p in pars:
-                    p = p.strip()
-                    if len(p) > 0:
-                        doc += '\t\t\t\t<p>%s</p>\n' % p
-                doc += '\t\t\t\t</div>\n'
-            if 'notes' in v:
-                doc += '\t\t\t\t<div class="quotebox box">\n'
-                pars = v['notes'][0].split('\n')
+                        )
+                    add('\t\t\t</ul>\n')
+                except UnicodeDecodeError:
+                    sys.stdout.write('UnicdeDecodeError at %s\n' % k)
+                    sys.stdout.flush()
+    if 'pubmeds' in v:
+        add('\t\t\t<h3>PubMed</h3>\n')
+        add('\t\t\t<ul>\n')
+        for pmid in v['pubmeds']:
+            add('\t\t\t\t<li><a href="%s" '\
+                'target="_blank">%s</a></li>\n' % (
+                    'http://www.ncbi.nlm.nih.gov/pubmed/%u' % pmid,
+                    'http://www.ncbi.nlm.nih.gov/pubmed/%u' % pmid
+                ))
+        add('\t\t\t</ul>\n')
+    if ('urls' in v and 'omictools' in v['urls']) or 'pathguide' in v:
+        add('\t\t\t<h3>Collections</h3>\n\t\t\t<ul>')
+        if 'omictools' in v['urls']:
+            add('\t\t\t<li><a href="%s" target="_blank">OmicTools</a></li>\n' % \
+                v['urls']['omictools'][0])
+        if 'pathguide' in v:
+            import pypath.resources.urls as urls
+            add('\t\t\t<li><a href="%s" target="_blank">PathGuide</a></li>\n' % \
+                (urls.urls['pathguide']['url'] % v['pathguide']))
+        add('\t\t\t</ul>\n')
+    if 'taxons' in v:
+        add('<p><b>Taxons: </b><em>%s</em></p>' % \
+            ', '.join(['%s%s' % (t[0].upper(), t[1:])
+                       for t in v['taxons']]))
+    if 'size' in v and type(v['size']) is dict and \
+            v['size']['nodes'] is not None and v['size']['edges'] is not None:
+        add('<p><b>Nodes: </b>%s, <b>Edges:</b>%s</p>' % (
+            v['size']['nodes'], v['size']['edges']))
+    if 'data_import' in v:
+        add('\t\t\t<p><b>Direct data import from: </b>%s</p>\n' % \
+            ', '.join(v['data_import']))
+    if 'includes' in v:
+        add('\t\t\t<p><b>Includes data from: </b>%s</p>\n' % \
+            ', '.join(v['includes']))
+    if 'descriptions' in v or 'notes' in v:
+        add('\t\t\t<h3>Quotes</h3>\n')
+        for key in ('descriptions', 'notes'):
+            if key in v:
+                add('\t\t\t\t<div class="quotebox box">\n')
+                pars = v[key][0].split('\n')
                 for p in pars:
                     p = p.strip()
                     if len(p) > 0:
-                        doc += '\t\t\t\t<p>%s</p>\n' % p
-                doc += '\t\t\t\t</div>\n'
-        if 'data_integration' in v:
-            doc += '\t\t\t<p><b>Data integration in '\
-                '<span class="code">pypath:</span></b> %s</p>' % \
-                v['data_integration']
-        if 'pypath' in v:
-            doc += '\t\t\t<h3>Methods in <span class="code">pypath'\
-                '</span></h3>\n'
-            doc += '\t\t\t\t<div class="codebox box">\n'
-            for cat in sorted(pypath_methods.keys()):
-                name = pypath_methods[cat]
-                if cat in v['pypath']:
-                    doc += '\t\t\t\t\t<p>%s</p>\n\t\t\t\t\t<ul>\n' % name
-                    for met in v['pypath'][cat]:
-                        doc += '\t\t\t\t\t\t<li><span class="code">%s'\
-                            '</span></li>\n' % met
-                    doc += '\t\t\t\t\t</ul>\n'
-            doc += '\t\t\t\t</div>\n'
-
-    return _html.default_template(doc, title, title)
-
-
-def write_html(filename='resources.html'):
+                        add('\t\t\t\t<p>%s</p>\n' % p)
+                add('\t\t\t\t</div>\n')
+    if 'data_integration' in v:
+        add('\t\t\t<p><b>Data integration in '\
+            '<span class="code">pypath:</span></b> %s</p>' % \
+            v['data_integration'])
+    if 'pypath' in v:
+        add('\t\t\t<h3>Methods in <span class="code">pypath'\
+            '</span></h3>\n')
+        add('\t\t\t\t<div class="codebox box">\n')
+        for cat in sorted(pypath_methods.keys()):
+            name = pypath_methods[cat]
+            if cat in v['pypath']:
+                add('\t\t\t\t\t<p>%s</p>\n\t\t\t\t\t<ul>\n' % name)
+                for met in v['pypath'][cat]:
+                    add('\t\t\t\t\t\t<li><span class="code">%s'\
+                        '</span></li>\n' % met)
+                add('\t\t\t\t\t</ul>\n')
+        add('\t\t\t\t</div>\n')
+
+    return ''.join(doc)
+
+
+def _html_toc(k, v):
+    '''
+    The table of contents item of one resource.
+    '''
+    return '\t\t\t<li><a href="#%s" class="%s">%s</a></li>\n' % (
+        k, 'omnipath' if 'omnipath' in v and v['omnipath'] else 'base',
+        v['label'] if 'label' in v else k
+    )
+
+
+def iter_html(resources = None):
+    '''
+    Yields the body of the resources page in chunks: the introduction,
+    the table of contents and one section per resource.
+
+    Args
+        resources (list): Sorted `(key, entry)` pairs, by default all
+            of `descriptions`.
+    '''
+    resources = sorted_descriptions() if resources is None else resources
+    yield _HTML_INTRO
+    # Table of Content
+    yield '\t<h2>Contents</h2>\n\t<ul>\n%s\t</ul>\n' % ''.join(
+        _html_toc(k, v) for k, v in resources
+    )
+    # Sections
+    for k, v in resources:
+        yield _resource_html(k, v)
+
+
+def gen_html():
+    '''
+    Generates a HTML page from the `descriptions` array.
+    This HTML is provided by the webservice under `/info`,
+    or can be saved locally with `write_html()`.
+
+    The page is cached and only regenerated when `descriptions`
+    or `pypath_methods` change.
+    '''
+    key = _fingerprint((descriptions, pypath_methods))
+
+    if key not in _html_cache:
+        import pypath.omnipath.server._html as _html
+        _html_cache.clear()
+        _html_cache[key] = _html.default_template(
+            ''.join(iter_html()),
+            _HTML_TITLE,
+            _HTML_TITLE,
+        )
+
+    return _html_cache[key]
+
+
+_HTML_BODY_MARK = '\x00resources-body\x00'
+
+
+def _html_frame():
+    '''
+    The page template split around the body, so the sections can be
+    streamed between the two parts. `None` if the template doesn't
+    include the body exactly once.
+    '''
+    import pypath.omnipath.server._html as _html
+
+    page = _html.default_template(_HTML_BODY_MARK, _HTML_TITLE, _HTML_TITLE)
+
+    if page.count(_HTML_BODY_MARK) == 1:
+
+        return tuple(page.split(_HTML_BODY_MARK))
+
+
+def iter_page():
+    '''
+    Yields the complete resources page in chunks, the same content as
+    `gen_html()`, without building it in memory.
+    '''
+    frame = _html_frame()
+
+    if frame is None:
+
+        yield gen_html()
+        return
+
+    yield frame[0]
+
+    for chunk in iter_html():
+
+        yield chunk
+
+    yield frame[1]
+
+
+def write_html(filename = 'resources.html', compress = ('gz', 'br')):
     '''
     Saves the HTML descriptions to custom local file.
+
+    The page is streamed into the file and, chunk by chunk, into
+    precompressed siblings (`resources.html.gz`, `resources.html.br`),
+    so the web server can serve them as static files. Memory use
+    doesn't grow with the page.
+
+    Args
+        filename (str): Path to the HTML file.
+        compress (tuple): Compressed siblings to write, "gz" and/or
+            "br". The latter needs the `brotli` module, it is skipped
+            if that is not available.
     '''
-    html = gen_html()
-    # with codecs.open(filename, encoding = 'utf-8', mode = 'w') as f:
-    with open(filename, 'w') as f:
-        f.write(html)
+    import gzip
 
+    compress = set(compress or ())
+    brotli = None
 
-def resource_list_latex(filename='resource-list.tex',
-                        latex_hdr=True,
-                        fontsize=8,
-                        font='HelveticaNeueLTStd-LtCn'):
+    if 'br' in compress:
+
+        try:
+
+            import brotli
+
+        except ImportError:
+
+            _log('Module `brotli` not available, skipping `%s.br`.' % filename)
+
+    with open(filename, 'wb') as f:
+
+        gz = (
+            # `mtime = 0` keeps the output identical between builds
+            gzip.GzipFile('%s.gz' % filename, 'wb', 9, mtime = 0)
+                if 'gz' in compress else
+            None
+        )
+        br = open('%s.br' % filename, 'wb') if brotli else None
+        br_compressor = brotli.Compressor(quality = 11) if brotli else None
+
+        try:
+
+            for chunk in iter_page():
+
+                data = chunk.encode('utf-8')
+                f.write(data)
+
+                if gz:
+
+                    gz.write(data)
+
+                if br:
+
+                    br.write(br_compressor.process(data))
+
+            if br:
+
+                br.write(br_compressor.finish())
+
+        finally:
+
+            if gz:
+
+                gz.close()
+
+            if br:
+
+                br.close()
+
+
+Problem = collections.namedtuple(
+    'Problem',
+    ['resource', 'field', 'message', 'severity'],
+)
+Problem.__new__.__defaults__ = ('error',)
+
+
+def _expect(*types):
     '''
-    Generates Supplementary Table 3 (The list of the 52 resources considered) for the article.
+    Check of a value's type. Returns the message, or `None` if it passes.
+    '''
+    names = ' or '.join(
+        'None' if t is type(None) else t.__name__
+        for t in types
+    )
+
+    def check(value):
+
+        if not isinstance(value, types) or (
+            # `bool` is a subclass of `int`
+            isinstance(value, bool) and bool not in types
+        ):
+
+            return 'expected %s, got %s' % (names, type(value).__name__)
+
+    return check
+
+
+def _expect_list(*types, nullable = False, non_empty = False):
+    '''
+    Check of a list or tuple with elements of the given types.
+    '''
+    item = _expect(*types)
+
+    def check(value):
+
+        if value is None and nullable:
+
+            return
+
+        if not isinstance(value, (list, tuple)):
+
+            return 'expected list, got %s' % type(value).__name__
+
+        if non_empty and not value:
+
+            return 'expected non empty list'
+
+        for i, elem in enumerate(value):
+
+            msg = item(elem)
+
+            if msg:
+
+                return 'item %u: %s' % (i, msg)
+
+    return check
+
+
+def _expect_dict(checks, required = (), values = None):
+    '''
+    Check of a dict, with per key checks and the checks of the other
+    keys' values in `values`.
+    '''
+    def check(value):
+
+        if not isinstance(value, dict):
+
+            return 'expected dict, got %s' % type(value).__name__
+
+        missing = [key for key in required if key not in value]
+
+        if missing:
+
+            return 'missing %s' % ', '.join(missing)
+
+        for key, elem in value.items():
+
+            elem_check = checks.get(key, values)
+
+            if elem_check is None:
+
+                return 'unknown key `%s`' % key
+
+            msg = elem_check(elem)
+
+            if msg:
+
+                return '`%s`: %s' % (key, msg)
+
+    return check
+
+
+def _expect_emails(value):
+
+    msg = _expect_list(tuple, list)(value)
+
+    if msg:
+
+        return msg
+
+    for i, email in enumerate(value):
+
+        if len(email) != 2 or not all(isinstance(e, str) for e in email):
+
+            return 'item %u: expected (address, name) pair' % i
+
+
+def _expect_size(value):
+
+    if isinstance(value, dict):
+
+        return _expect_dict(
+            {
+                'nodes': _expect(int, type(None)),
+                'edges': _expect(int, type(None)),
+            },
+            required = ('nodes', 'edges'),
+        )(value)
+
+    return _expect(int, type(None))(value)
+
+
+_str_list = _expect_list(str)
+
+# field -> check, built once and reused for all entries
+_FIELD_CHECKS = {
+    'label': _expect(str),
+    'full_name': _expect(str),
+    'recommend': _expect(str),
+    'type': _expect(str),
+    'subtype': _expect(str),
+    'data_integration': _expect(str),
+    'color': _expect(str, type(None)),
+    'year': _expect(int),
+    'releases': _expect_list(int),
+    'pubmeds': _expect_list(int),
+    'pathguide': _expect(int),
+    'omnipath': _expect(bool),
+    'dorothea': _expect(bool),
+    'authors': _expect_list(str, nullable = True),
+    'emails': _expect_emails,
+    'urls': _expect_dict({}, values = _str_list),
+    'license': _expect_dict(
+        {
+            'name': _expect(str),
+            'url': _expect(str),
+            'commercial_use': _expect(bool),
+        },
+        required = ('name',),
+    ),
+    'descriptions': _expect_list(str, non_empty = True),
+    'notes': _expect_list(str, non_empty = True),
+    'taxons': _str_list,
+    'annot': _str_list,
+    'data_import': _str_list,
+    'includes': _str_list,
+    'contains': _str_list,
+    'identifiers': _str_list,
+    'omictools': _str_list,
+    'pypath': _expect_dict({}, values = _str_list),
+    'size': _expect_size,
+    'nodes': _expect(int, type(None)),
+    'edges': _expect(int, type(None)),
+    'files': _expect(dict),
+}
+
+_MISSPELLED_FIELDS = {
+    'relases': 'releases',
+    'descritpions': 'descriptions',
+}
+
+
+def validate(resources = None):
+    '''
+    Checks the structure of the resource entries in one pass, reporting
+    all problems instead of stopping at the first one.
+
+    Problems with severity "error" would break or corrupt the outputs,
+    "warning" marks fields that are ignored by them.
+
+    Args
+        resources (dict): By default `descriptions`.
+
+    Returns
+        (list): `Problem` tuples.
+    '''
+    resources = descriptions if resources is None else resources
+    problems = []
+    add = problems.append
+    checks = _FIELD_CHECKS
+
+    for k, v in resources.items():
+
+        if not isinstance(v, dict):
+
+            add(Problem(k, None, 'entry is not a dict'))
+            continue
+
+        for field, value in v.items():
+
+            check = checks.get(field)
+
+            if check is None:
+
+                add(Problem(
+                    k,
+                    field,
+                    'misspelled field, should be `%s`' %
+                    _MISSPELLED_FIELDS[field]
+                        if field in _MISSPELLED_FIELDS else
+                    'unknown field',
+                    'warning',
+                ))
+                continue
+
+            msg = check(value)
+
+            if msg:
+
+                add(Problem(k, field, msg))
+
+        for cat in v.get('pypath') or ():
+
+            if cat not in pypath_methods:
+
+                add(Problem(
+                    k,
+                    'pypath',
+                    'category `%s` not in `pypath_methods`' % cat,
+                    'warning',
+                ))
+
+    return problems
+
+
+_DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+REGISTRY_FILE = os.path.join(_DATA_DIR, 'resources-registry.json')
+MAINTENANCE_FILE = os.path.join(
+    _DATA_DIR,
+    'resources_by_maintenance_category.json',
+)
+
+
+def _facet_value(value):
+    '''
+    Turns a facet value into a JSON object key.
+    '''
+    if value is None:
+        return 'unknown'
+    elif isinstance(value, bool):
+        return 'true' if value else 'false'
+    else:
+        return '%s' % value
+
+
+class ResourceRegistry(object):
+    '''
+    Inverted indexes over `descriptions`, built once, answering facet
+    queries with set intersections instead of scanning every resource.
+
+    Facets of single valued fields (license, type, year, etc.) also
+    index the resources missing the field, under the value `None`.
+
+    Example
+        >>> reg = ResourceRegistry()
+        >>> reg.query(type = 'high-throughput', subtype = 'yeast 2 hybrid')
+        ['HuRI', 'HuRI Lit-BM']
+        >>> reg.query(includes = 'BioGRID')
+        ['Laudanna', 'PathwayCommons']
+        >>> reg.query(omnipath = True, taxons = ['human', 'mammalia'])
+    '''
+
+    FACETS = (
+        'commercial_use',
+        'license',
+        'type',
+        'subtype',
+        'year',
+        'omnipath',
+        'taxons',
+        'includes',
+        'pubmeds',
+    )
+
+    def __init__(self, resources = None):
+
+        self.resources = descriptions if resources is None else resources
+        self.reload()
+
+
+    def reload(self):
+        '''
+        Builds the indexes, call it after modifying `resources`.
+        '''
+        self.order = [
+            k for k, _ in
+            sorted(self.resources.items(), key = lambda x: x[0].lower())
+        ]
+        self._position = {k: i for i, k in enumerate(self.order)}
+        self.indexes = {facet: {} for facet in self.FACETS}
+
+        for k, v in self.resources.items():
+
+            for facet, values in self._facet_values(v):
+
+                for value in values:
+
+                    self.indexes[facet].setdefault(value, set()).add(k)
+
+
+    @staticmethod
+    def _facet_values(v):
+
+        license = v.get('license') or {}
+
+        return (
+            ('commercial_use', (license.get('commercial_use'),)),
+            ('license', (license.get('name'),)),
+            ('type', (v.get('type'),)),
+            ('subtype', (v.get('subtype'),)),
+            ('year', (v.get('year'),)),
+            ('omnipath', (v.get('omnipath'),)),
+            ('taxons', v.get('taxons') or ()),
+            (
+                'includes',
+                (v.get('includes') or []) + (v.get('data_import') or []),
+            ),
+            ('pubmeds', v.get('pubmeds') or ()),
+        )
+
+
+    def keys(self, facet, value):
+        '''
+        The set of resource keys with `value` in `facet`.
+        '''
+        return self.indexes[facet].get(value, set())
+
+
+    def values(self, facet):
+        '''
+        The values of a facet, with the number of resources for each.
+        '''
+        return {
+            value: len(keys)
+            for value, keys in self.indexes[facet].items()
+        }
+
+
+    def select(self, **criteria):
+        '''
+        The set of resource keys matching all criteria. A criterion is
+        a facet name with a value, or a list, set or tuple of values of
+        which any may match.
+        '''
+        sets = []
+
+        for facet, value in criteria.items():
+
+            if facet not in self.indexes:
+
+                raise ValueError('Unknown facet: `%s`.' % facet)
+
+            if isinstance(value, (list, set, tuple)):
+
+                sets.append(
+                    set().union(*(self.keys(facet, v) for v in value))
+                )
+
+            else:
+
+                sets.append(self.keys(facet, value))
+
+        if not sets:
+
+            return set(self.resources)
+
+        sets.sort(key = len)
+
+        return sets[0].intersection(*sets[1:])
+
+
+    def query(self, **criteria):
+        '''
+        Like `select()`, but returns the resource keys in display order.
+        '''
+        return self.sorted(self.select(**criteria))
+
+
+    def sorted(self, keys):
+        '''
+        Sorts resource keys in display order.
+        '''
+        return sorted(keys, key = self._position.__getitem__)
+
+
+def _facet_indexes(registry, maintenance = None):
+    '''
+    Converts the indexes of a `ResourceRegistry` to JSON compatible
+    facet -> value -> resource keys mappings, keys in display order.
+    '''
+    indexes = {
+        facet: {
+            _facet_value(value): registry.sorted(keys)
+            for value, keys in index.items()
+        }
+        for facet, index in registry.indexes.items()
+    }
+
+    # the maintenance categories are curated outside of `descriptions`,
+    # under the resource labels of the web service
+    indexes['maintenance'] = dict(maintenance or {})
+
+    return indexes
+
+
+def compile_registry(outfile = None, maintenance_file = None):
+    '''
+    Compiles `descriptions` into a single JSON artifact holding the
+    resources in display order, the facet indexes and the fingerprint
+    of the source. Read it back with `registry.load_registry()`, which
+    doesn't need to import this module.
+
+    Args
+        outfile (str): Path to the artifact, by default
+            `resources-registry.json` next to this module.
+        maintenance_file (str): JSON with resource names by maintenance
+            category. Skipped if it doesn't exist.
+    '''
+    outfile = outfile or REGISTRY_FILE
+    maintenance_file = maintenance_file or MAINTENANCE_FILE
+    maintenance = {}
+
+    if os.path.exists(maintenance_file):
+
+        with open(maintenance_file, 'r', encoding = 'utf-8') as fp:
+
+            maintenance = json.load(fp)
+
+    registry = ResourceRegistry()
+    artifact = {
+        'fingerprint': _fingerprint(descriptions),
+        'order': registry.order,
+        'resources': {k: descriptions[k] for k in registry.order},
+        'indexes': _facet_indexes(registry, maintenance),
+    }
+
+    with open(outfile, 'w', encoding = 'utf-8') as fp:
+
+        json.dump(
+            artifact,
+            fp,
+            ensure_ascii = False,
+            separators = (',', ':'),
+        )
+
+    _log(
+        'Compiled %u resources into `%s`.' % (len(registry.order), outfile)
+    )
+
+    return outfile
+
+
+def _latex_row(k, v):
+    '''
+    The label and class cells of one resource in the LaTeX table.
+    '''
+    return (
+        v['label'] if 'label' in v else k,
+        '%s, %s' % (v['type'].capitalize(), v['subtype'].capitalize())
+        if 'type' in v and 'subtype' in v else '',
+    )
+
+
+def _latex_table(rows, latex_hdr = True, fontsize = 8,
+                 font = 'HelveticaNeueLTStd-LtCn'):
+    '''
+    Assembles the LaTeX document from the rows created by `_latex_row`.
     '''
     _latex_hdr = r'''\documentclass[a4paper,%upt]{extarticle}
         \usepackage{fontspec}
@@ -3281,12 +3946,7 @@ def resource_list_latex(filename='resource-list.tex',
     Resource name & Class, subclass & Resource name & Class, subclass \\
     \midrule
     '''
-    res = sorted(
-        [(v['label'] if 'label' in v else k,
-          '%s, %s' % (v['type'].capitalize(), v['subtype'].capitalize())
-          if 'type' in v and 'subtype' in v else '')
-         for k, v in iteritems(descriptions)],
-        key=lambda x: x[0].lower())
+    res = sorted(rows, key=lambda x: x[0].lower())
     if len(res) % 2 != 0:
         res.append('')
     res2 = zip(res[:int(len(res) / 2)], res[int(len(res) / 2):])
@@ -3299,45 +3959,457 @@ def resource_list_latex(filename='resource-list.tex',
         ) + '\n'
     tex += r'\bottomrule' + '\n'
     tex += r'\end{tabularx}' + '\n'
-    with open(filename, 'w') as f:
-        f.write('%s%s%s' % (_latex_hdr if latex_hdr else '', tex, _latex_end
-                            if latex_hdr else ''))
+
+    return '%s%s%s' % (_latex_hdr if latex_hdr else '', tex, _latex_end
+                       if latex_hdr else '')
+
+
+def resource_list_latex(filename='resource-list.tex',
+                        latex_hdr=True,
+                        fontsize=8,
+                        font='HelveticaNeueLTStd-LtCn'):
+    '''
+    Generates Supplementary Table 3 (The list of the 52 resources considered) for the article.
+    '''
+    export_resources(LatexSink(
+        filename,
+        latex_hdr = latex_hdr,
+        fontsize = fontsize,
+        font = font,
+    ))
+
+
+_LICENSES_HEADER = [
+    'Name',
+    'License',
+    'License URL',
+    'Contact',
+]
+
+
+def _license_row(k, v):
+    '''
+    One line of the license table, without the line break.
+    '''
+    name = v['label'] if 'label' in v else k
+    license_name = v['license']['name'] if 'license' in v else ''
+    license_url = (
+        v['license']['url']
+            if 'license' in v and 'url' in v['license'] else
+        ''
+    )
+    emails = (
+        ','.join('%s <%s>' % tuple(reversed(e)) for e in v['emails'])
+        if 'emails' in v else ''
+    )
+
+    return '\t'.join([
+        name,
+        license_name,
+        license_url,
+        emails,
+    ])
 
 
 def export_licenses(outfile = 'licenses.tsv'):
 
-    hdr = [
-        'Name',
-        'License',
-        'License URL',
-        'Contact',
-    ]
-    rows = []
+    export_resources(LicensesSink(outfile))
+
+
+# (output format, resource key) -> (entry fingerprint, fragment);
+# shared by the calls of `export_resources`
+_fragment_cache = {}
+
+# buffer size of the export sinks
+_EXPORT_BUFFER = 1 << 16
+
+
+def _html_page(fragments):
+    '''
+    Assembles the resources page from `(TOC line, section)` fragments
+    in display order, the same page `gen_html()` produces.
+    '''
+    import pypath.omnipath.server._html as _html
+
+    body = '%s\t<h2>Contents</h2>\n\t<ul>\n%s\t</ul>\n%s' % (
+        _HTML_INTRO,
+        ''.join(toc for toc, _ in fragments),
+        ''.join(section for _, section in fragments),
+    )
+
+    return _html.default_template(body, _HTML_TITLE, _HTML_TITLE)
+
+
+def _html_fragment(k, v):
+
+    return _html_toc(k, v), _resource_html(k, v)
+
+
+class ResourceSink(object):
+    '''
+    Base class of the outputs of `export_resources`. A sink turns each
+    resource into a fragment, which is cached by the fingerprint of the
+    entry, and writes the fragments into its file at the end of the
+    traversal.
+
+    Subclasses implement `fragment` and `write`, and set `format`, the
+    namespace of their fragments in the cache.
+    '''
+
+    format = None
+    binary = False
+
+    def __init__(self, path):
+
+        self.path = path
+
+
+    def salt(self):
+        '''
+        Fingerprint of data besides the entry the fragments depend on.
+        '''
+        return ''
+
+
+    def fragment(self, k, v):
+
+        raise NotImplementedError
+
+
+    def write(self, fp, records):
+        '''
+        Args
+            fp: Buffered file object opened for the sink.
+            records (list): `(key, fragment)` pairs in the order of
+                `descriptions`.
+        '''
+        raise NotImplementedError
 
-    for k, v in iteritems(descriptions):
 
-        name = v['label'] if 'label' in v else k
-        license_name = v['license']['name'] if 'license' in v else ''
-        license_url = (
-            v['license']['url']
-                if 'license' in v and 'url' in v['license'] else
-            ''
+class HtmlSink(ResourceSink):
+    '''
+    The resources page, as served under `/info`.
+    '''
+
+    format = 'html'
+
+    def salt(self):
+
+        return _fingerprint(pypath_methods)
+
+
+    def fragment(self, k, v):
+
+        return _html_fragment(k, v)
+
+
+    def write(self, fp, records):
+
+        records = sorted(records, key = lambda x: x[0].lower())
+        fp.write(_html_page([fragment for _, fragment in records]))
+
+
+class LatexSink(ResourceSink):
+    '''
+    The resource table of the article, see `resource_list_latex`.
+    '''
+
+    format = 'latex'
+
+    def __init__(self, path, latex_hdr = True, fontsize = 8,
+                 font = 'HelveticaNeueLTStd-LtCn'):
+
+        ResourceSink.__init__(self, path)
+        self.latex_hdr = latex_hdr
+        self.fontsize = fontsize
+        self.font = font
+
+
+    def fragment(self, k, v):
+
+        return _latex_row(k, v)
+
+
+    def write(self, fp, records):
+
+        fp.write(_latex_table(
+            [row for _, row in records],
+            latex_hdr = self.latex_hdr,
+            fontsize = self.fontsize,
+            font = self.font,
+        ))
+
+
+class LicensesSink(ResourceSink):
+    '''
+    The license table, see `export_licenses`.
+    '''
+
+    format = 'licenses'
+
+    def fragment(self, k, v):
+
+        return _license_row(k, v)
+
+
+    def write(self, fp, records):
+
+        fp.write('\t'.join(_LICENSES_HEADER) + '\n')
+
+        for i, (_, row) in enumerate(records):
+
+            if i:
+
+                fp.write('\n')
+
+            fp.write(row)
+
+
+class JsonSink(ResourceSink):
+    '''
+    The entries of `descriptions` as one JSON object.
+    '''
+
+    format = 'json'
+
+    def fragment(self, k, v):
+
+        return '%s:%s' % (
+            json.dumps(k, ensure_ascii = False),
+            json.dumps(v, ensure_ascii = False),
         )
-        emails = (
-            ','.join('%s <%s>' % tuple(reversed(e)) for e in v['emails'])
-            if 'emails' in v else ''
+
+
+    def write(self, fp, records):
+
+        fp.write('{')
+
+        for i, (_, fragment) in enumerate(records):
+
+            if i:
+
+                fp.write(',\n')
+
+            fp.write(fragment)
+
+        fp.write('}\n')
+
+
+class ParquetSink(ResourceSink):
+    '''
+    One row per resource with the tabular fields of the entries.
+    Requires `pyarrow`.
+    '''
+
+    format = 'parquet'
+    binary = True
+
+    def fragment(self, k, v):
+
+        license = v.get('license') or {}
+
+        return {
+            'key': k,
+            'label': v.get('label', k),
+            'full_name': v.get('full_name'),
+            'type': v.get('type'),
+            'subtype': v.get('subtype'),
+            'year': v.get('year'),
+            'omnipath': v.get('omnipath'),
+            'license': license.get('name'),
+            'license_url': license.get('url'),
+            'commercial_use': license.get('commercial_use'),
+            'taxons': list(v.get('taxons') or ()),
+            'pubmeds': list(v.get('pubmeds') or ()),
+            'includes': list(v.get('includes') or ()),
+            'data_import': list(v.get('data_import') or ()),
+        }
+
+
+    def write(self, fp, records):
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pylist([row for _, row in records])
+        pq.write_table(table, fp)
+
+
+def export_resources(*sinks, cache_file = None):
+    '''
+    Exports the resources into all `sinks` in a single traversal of
+    `descriptions`. Each entry is fingerprinted, and only the fragments
+    of new or changed entries are generated, the rest are spliced in
+    from the cache. Files with unchanged contents are not rewritten,
+    the others are written through buffered I/O.
+
+    Args
+        sinks (ResourceSink): The outputs.
+        cache_file (str): Pickle to persist the fragment cache between
+            processes. By default it is kept only in memory.
+
+    Returns
+        (dict): Number of regenerated entries by output path.
+    '''
+    if cache_file and not _fragment_cache and os.path.exists(cache_file):
+
+        with open(cache_file, 'rb') as fp:
+
+            _fragment_cache.update(pickle.load(fp))
+
+    salts = [sink.salt() for sink in sinks]
+    records = [[] for _ in sinks]
+    fingerprints = [[] for _ in sinks]
+    regenerated = {sink.path: 0 for sink in sinks}
+
+    for k, v in descriptions.items():
+
+        entry_fp = _fingerprint((k, v))
+
+        for i, sink in enumerate(sinks):
+
+            key = (sink.format, k)
+            fp = entry_fp + salts[i]
+            cached = _fragment_cache.get(key)
+
+            if cached is None or cached[0] != fp:
+
+                cached = (fp, sink.fragment(k, v))
+                _fragment_cache[key] = cached
+                regenerated[sink.path] += 1
+
+            records[i].append((k, cached[1]))
+            fingerprints[i].append(cached[0])
+
+    for sink, sink_records, sink_fps in zip(sinks, records, fingerprints):
+
+        file_key = ('file', sink.path)
+        file_fp = _fingerprint((
+            type(sink).__name__,
+            sorted(vars(sink).items()),
+            sink_fps,
+        ))
+
+        if (
+            _fragment_cache.get(file_key) == file_fp and
+            os.path.exists(sink.path)
+        ):
+
+            continue
+
+        with (
+            open(sink.path, 'wb', buffering = _EXPORT_BUFFER)
+                if sink.binary else
+            open(
+                sink.path,
+                'w',
+                buffering = _EXPORT_BUFFER,
+                encoding = 'utf-8',
+            )
+        ) as fp:
+
+            sink.write(fp, sink_records)
+
+        _fragment_cache[file_key] = file_fp
+
+    # drop the fragments of removed entries
+    for key in list(_fragment_cache):
+
+        if key[0] != 'file' and key[1] not in descriptions:
+
+            del _fragment_cache[key]
+
+    if cache_file:
+
+        with open(cache_file, 'wb') as fp:
+
+            pickle.dump(_fragment_cache, fp, protocol = 4)
+
+    _log(
+        'Resources exported, regenerated entries: %s.' % (
+            ', '.join('%s: %u' % i for i in regenerated.items())
         )
+    )
+
+    return regenerated
+
+
+def build_outputs(
+        html = 'resources.html',
+        latex = 'resource-list.tex',
+        licenses = 'licenses.tsv',
+        cache_file = None,
+    ):
+    '''
+    Builds the resources page, the LaTeX resource list and the license
+    table incrementally, see `export_resources`.
+
+    Args
+        html, latex, licenses (str): Output paths, `None` to skip
+            a format.
+        cache_file (str): Pickle to persist the fragment cache between
+            processes.
+
+    Returns
+        (dict): Number of regenerated entries by format.
+    '''
+    sinks = [
+        sink(path)
+        for sink, path in (
+            (HtmlSink, html),
+            (LatexSink, latex),
+            (LicensesSink, licenses),
+        )
+        if path
+    ]
+    regenerated = export_resources(*sinks, cache_file = cache_file)
 
-        rows.append([
-            name,
-            license_name,
-            license_url,
-            emails,
-        ])
+    return {sink.format: regenerated[sink.path] for sink in sinks}
 
-    with open(outfile, 'w') as fp:
 
-        _ = fp.write('\t'.join(hdr) + '\n')
-        _ = fp.write('\n'.join(
-            '\t'.join(row) for row in rows
+def main(argv = None):
+    '''
+    Command line entry point:
+
+        python descriptions.py [compile] [OUTFILE]
+        python descriptions.py validate
+
+    `validate` prints all problems and exits with 1 if any is an error,
+    to be used as a pre-commit or build gate.
+    '''
+    argv = sys.argv[1:] if argv is None else argv
+
+    if argv[:1] == ['validate']:
+
+        problems = validate()
+
+        for p in problems:
+
+            sys.stderr.write('%s: %s: %s: %s\n' % (
+                p.severity,
+                p.resource,
+                p.field,
+                p.message,
+            ))
+
+        errors = sum(p.severity == 'error' for p in problems)
+        sys.stderr.write('%u resources, %u errors, %u warnings.\n' % (
+            len(descriptions),
+            errors,
+            len(problems) - errors,
         ))
+
+        return 1 if errors else 0
+
+    if argv[:1] == ['compile']:
+
+        argv = argv[1:]
+
+    compile_registry(*argv[:1])
+
+    return 0
+
+
+if __name__ == '__main__':
+
+    sys.exit(main())
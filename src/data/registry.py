@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#
+#  Loader for the compiled resource registry, see
+#  `descriptions.compile_registry()`.
+#
+#  Build the artifact with:
+#      python src/data/descriptions.py
+#
+
+import os
+import json
+
+__all__ = ['REGISTRY_FILE', 'load_registry', 'facet', 'facets']
+
+REGISTRY_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    'resources-registry.json',
+)
+
+
+def load_registry(path = None):
+    '''
+    Reads the compiled registry with a single read call. Doesn't import
+    `descriptions`, so it is cheap enough to call at startup.
+
+    Returns
+        (dict): With keys `fingerprint`, `order` (resource keys in
+        display order), `resources` (key -> description) and `indexes`
+        (facet -> value -> resource keys).
+    '''
+    with open(path or REGISTRY_FILE, 'rb') as fp:
+
+        return json.loads(fp.read())
+
+
+def facet(registry, name, value):
+    '''
+    Resource keys with `value` in facet `name`. Booleans and missing
+    values are keyed as "true", "false" and "unknown".
+    '''
+    if isinstance(value, bool):
+
+        value = 'true' if value else 'false'
+
+    return registry['indexes'][name].get(
+        'unknown' if value is None else '%s' % value,
+        [],
+    )
+
+
+def facets(registry):
+    '''
+    The available facets with their values.
+    '''
+    return {
+        name: sorted(values)
+        for name, values in registry['indexes'].items()
+    }
@@ -1,5 +1,5 @@
 import { relations } from "drizzle-orm/relations";
-import { uniprotProteins, uniprotIdentifiers } from "./schema";
+import { uniprotProteins, uniprotIdentifiers, uniprotProteinDetails } from "./schema";
 
 export const uniprotIdentifiersRelations = relations(uniprotIdentifiers, ({one}) => ({
 	uniprotProtein: one(uniprotProteins, {
@@ -8,6 +8,14 @@ export const uniprotIdentifiersRelations = relations(uniprotIdentifiers, ({one})
 	}),
 }));
 
-export const uniprotProteinsRelations = relations(uniprotProteins, ({many}) => ({
+export const uniprotProteinsRelations = relations(uniprotProteins, ({one, many}) => ({
 	uniprotIdentifiers: many(uniprotIdentifiers),
+	uniprotProteinDetail: one(uniprotProteinDetails),
+}));
+
+export const uniprotProteinDetailsRelations = relations(uniprotProteinDetails, ({one}) => ({
+	uniprotProtein: one(uniprotProteins, {
+		fields: [uniprotProteinDetails.organismId, uniprotProteinDetails.proteinId],
+		references: [uniprotProteins.organismId, uniprotProteins.id]
+	}),
 }));
\ No newline at end of file
@@ -1,35 +1,49 @@
-import { pgTable, index, foreignKey, serial, integer, varchar, text, unique, boolean, jsonb, bigint } from "drizzle-orm/pg-core"
+import { pgTable, pgMaterializedView, index, foreignKey, primaryKey, serial, integer, smallint, varchar, text, unique, boolean, jsonb, bigint, timestamp } from "drizzle-orm/pg-core"
+import { sql } from "drizzle-orm"
 
 
 export const uniprotIdentifiers = pgTable("uniprot_identifiers", {
-	id: serial().primaryKey().notNull(),
-	proteinId: integer("protein_id"),
+	id: serial().notNull(),
+	proteinId: integer("protein_id").notNull(),
 	uniprotAccession: varchar("uniprot_accession", { length: 30 }).notNull(),
 	identifierValue: text("identifier_value").notNull(),
 	identifierType: varchar("identifier_type", { length: 50 }).notNull(),
-	taxonId: text("taxon_id"),
+	taxonId: integer("taxon_id").notNull(),
+	ambiguity: integer().default(1).notNull(),
 }, (table) => [
 	index("idx_uniprot_identifiers_protein_id").using("btree", table.proteinId.asc().nullsLast().op("int4_ops")),
 	index("idx_uniprot_identifiers_value_prefix").using("btree", table.identifierValue.asc().nullsLast().op("text_pattern_ops")),
 	index("idx_uniprot_identifiers_value_trgm").using("gin", table.identifierValue.asc().nullsLast().op("gin_trgm_ops")),
+	primaryKey({ columns: [table.taxonId, table.id], name: "uniprot_identifiers_pkey"}),
 	foreignKey({
-			columns: [table.proteinId],
-			foreignColumns: [uniprotProteins.id],
-			name: "uniprot_identifiers_protein_id_fkey"
+			columns: [table.taxonId, table.proteinId],
+			foreignColumns: [uniprotProteins.organismId, uniprotProteins.id],
+			name: "uniprot_identifiers_taxon_id_protein_id_fkey"
 		}).onDelete("cascade"),
 ]);
 
 export const uniprotProteins = pgTable("uniprot_proteins", {
-	id: serial().primaryKey().notNull(),
+	id: serial().notNull(),
 	entry: varchar({ length: 30 }).notNull(),
 	entryName: text("entry_name"),
 	proteinNames: text("protein_names"),
 	length: integer(),
 	mass: integer(),
-	sequence: text(),
 	geneNamesPrimary: text("gene_names_primary"),
 	geneNamesSynonym: text("gene_names_synonym"),
-	organismId: text("organism_id"),
+	organismId: integer("organism_id").notNull(),
+	ecNumber: text("ec_number"),
+	alphafolddb: varchar({ length: 30 }),
+}, (table) => [
+	index("idx_uniprot_proteins_entry").using("btree", table.entry.asc().nullsLast().op("text_ops")),
+	primaryKey({ columns: [table.organismId, table.id], name: "uniprot_proteins_pkey"}),
+	unique("uniprot_proteins_organism_id_entry_key").on(table.organismId, table.entry),
+]);
+
+export const uniprotProteinDetails = pgTable("uniprot_protein_details", {
+	proteinId: integer("protein_id").notNull(),
+	organismId: integer("organism_id").notNull(),
+	sequence: text(),
 	involvementInDisease: text("involvement_in_disease"),
 	mutagenesis: text(),
 	subcellularLocation: text("subcellular_location"),
@@ -41,12 +55,10 @@ export const uniprotProteins = pgTable("uniprot_proteins", {
 	pathway: text(),
 	activityRegulation: text("activity_regulation"),
 	keywords: text(),
-	ecNumber: text("ec_number"),
 	geneOntology: text("gene_ontology"),
 	transmembrane: text(),
 	proteinFamilies: text("protein_families"),
 	refseq: text(),
-	alphafolddb: varchar({ length: 30 }),
 	pdb: text(),
 	chembl: text(),
 	phosphositeplus: text(),
@@ -56,8 +68,12 @@ export const uniprotProteins = pgTable("uniprot_proteins", {
 	biogrid: text(),
 	complexportal: text(),
 }, (table) => [
-	index("idx_uniprot_proteins_entry").using("btree", table.entry.asc().nullsLast().op("text_ops")),
-	unique("uniprot_proteins_entry_key").on(table.entry),
+	primaryKey({ columns: [table.organismId, table.proteinId], name: "uniprot_protein_details_pkey"}),
+	foreignKey({
+			columns: [table.organismId, table.proteinId],
+			foreignColumns: [uniprotProteins.organismId, uniprotProteins.id],
+			name: "uniprot_protein_details_organism_id_protein_id_fkey"
+		}).onDelete("cascade"),
 ]);
 
 export const complexes = pgTable("complexes", {
@@ -69,11 +85,28 @@ export const complexes = pgTable("complexes", {
 	sources: text(),
 	references: text(),
 	identifiers: text(),
+	resourceIds: text("resource_ids").array(),
+	// Order-independent hash of components, see db_build/complex_members.py
+	componentHash: bigint("component_hash", { mode: "bigint" }),
 }, (table) => [
+	index("idx_complexes_component_hash").using("btree", table.componentHash.asc().nullsLast().op("int8_ops")),
 	index("idx_complexes_name").using("btree", table.name.asc().nullsLast().op("text_ops")),
+	index("idx_complexes_resource_ids").using("gin", table.resourceIds.asc().nullsLast().op("array_ops")),
 	index("idx_complexes_sources").using("btree", table.sources.asc().nullsLast().op("text_ops")),
 ]);
 
+export const complexMembers = pgTable("complex_members", {
+	complexId: integer("complex_id").notNull(),
+	position: smallint().notNull(),
+	uniprot: text().notNull(),
+	genesymbol: text(),
+	stoichiometry: integer(),
+}, (table) => [
+	index("idx_complex_members_complex_id").using("btree", table.complexId.asc().nullsLast().op("int4_ops")),
+	index("idx_complex_members_genesymbol_upper").using("btree", sql`upper(genesymbol)`),
+	index("idx_complex_members_uniprot").using("btree", table.uniprot.asc().nullsLast().op("text_ops")),
+]);
+
 export const enzSub = pgTable("enz_sub", {
 	id: serial().primaryKey().notNull(),
 	enzyme: text(),
@@ -88,10 +121,12 @@ export const enzSub = pgTable("enz_sub", {
 	references: text(),
 	curationEffort: integer("curation_effort"),
 	ncbiTaxId: integer("ncbi_tax_id"),
+	resourceIds: text("resource_ids").array(),
 }, (table) => [
 	index("idx_enz_sub_enzyme").using("btree", table.enzyme.asc().nullsLast().op("text_ops")),
 	index("idx_enz_sub_enzyme_genesymbol").using("btree", table.enzymeGenesymbol.asc().nullsLast().op("text_ops")),
-	index("idx_enz_sub_substrate").using("btree", table.substrate.asc().nullsLast().op("text_ops")),
+	index("idx_enz_sub_resource_ids").using("gin", table.resourceIds.asc().nullsLast().op("array_ops")),
+	index("idx_enz_sub_site").using("btree", table.substrate.asc().nullsLast().op("text_ops"), table.residueType.asc().nullsLast().op("text_ops"), table.residueOffset.asc().nullsLast().op("int4_ops"), table.modification.asc().nullsLast().op("text_ops")),
 	index("idx_enz_sub_substrate_genesymbol").using("btree", table.substrateGenesymbol.asc().nullsLast().op("text_ops")),
 ]);
 
@@ -157,8 +192,10 @@ export const interactions = pgTable("interactions", {
 	entityTypeSource: varchar("entity_type_source", { length: 50 }),
 	ncbiTaxIdTarget: integer("ncbi_tax_id_target"),
 	entityTypeTarget: varchar("entity_type_target", { length: 50 }),
+	resourceIds: text("resource_ids").array(),
 }, (table) => [
 	index("idx_interactions_pair").using("btree", table.source.asc().nullsLast().op("text_ops"), table.target.asc().nullsLast().op("text_ops")),
+	index("idx_interactions_resource_ids").using("gin", table.resourceIds.asc().nullsLast().op("array_ops")),
 	index("idx_interactions_source").using("btree", table.source.asc().nullsLast().op("text_ops")),
 	index("idx_interactions_source_genesymbol").using("btree", table.sourceGenesymbol.asc().nullsLast().op("text_ops")),
 	index("idx_interactions_sources").using("btree", table.sources.asc().nullsLast().op("text_ops")),
@@ -183,3 +220,144 @@ export const annotations = pgTable("annotations", {
 	index("idx_annotations_source").using("btree", table.source.asc().nullsLast().op("text_ops")),
 	index("idx_annotations_uniprot").using("btree", table.uniprot.asc().nullsLast().op("text_ops")),
 ]);
+
+export const resourceSummary = pgTable("resource_summary", {
+	resourceId: text("resource_id").primaryKey().notNull(),
+	label: text().notNull(),
+	descriptionKey: text("description_key"),
+	fullName: text("full_name"),
+	type: text(),
+	subtype: text(),
+	license: text(),
+	licenseUrl: text("license_url"),
+	commercialUse: boolean("commercial_use"),
+	licenseCategory: text("license_category"),
+	maintenance: text(),
+	interactionsRecords: integer("interactions_records").default(0).notNull(),
+	enzSubRecords: integer("enz_sub_records").default(0).notNull(),
+	complexesRecords: integer("complexes_records").default(0).notNull(),
+	annotationsRecords: integer("annotations_records").default(0).notNull(),
+	intercellRecords: integer("intercell_records").default(0).notNull(),
+	// You can use { mode: "bigint" } if numbers are exceeding js number limitations
+	totalRecords: bigint("total_records", { mode: "number" }).default(0).notNull(),
+	sourceLabels: text("source_labels").array().notNull(),
+});
+
+export const resourceNames = pgTable("resource_names", {
+	sourceLabel: text("source_label").primaryKey().notNull(),
+	resourceId: text("resource_id").notNull(),
+	descriptionKey: text("description_key"),
+}, (table) => [
+	index("idx_resource_names_resource_id").using("btree", table.resourceId.asc().nullsLast().op("text_ops")),
+]);
+
+export const ligandReceptorPairs = pgTable("ligand_receptor_pairs", {
+	interactionId: integer("interaction_id"),
+	ligand: text(),
+	ligandGenesymbol: text("ligand_genesymbol"),
+	receptor: text(),
+	receptorGenesymbol: text("receptor_genesymbol"),
+	ligandCategories: text("ligand_categories").array(),
+	receptorCategories: text("receptor_categories").array(),
+	ligandConsensusScore: integer("ligand_consensus_score"),
+	receptorConsensusScore: integer("receptor_consensus_score"),
+	isDirected: boolean("is_directed"),
+	isStimulation: boolean("is_stimulation"),
+	isInhibition: boolean("is_inhibition"),
+	sources: text(),
+	resourceIds: text("resource_ids").array(),
+	curationEffort: integer("curation_effort"),
+	omnipath: boolean(),
+	ligrecextra: boolean(),
+}, (table) => [
+	index("idx_ligand_receptor_pairs_interaction_id").using("btree", table.interactionId.asc().nullsLast().op("int4_ops")),
+	index("idx_ligand_receptor_pairs_ligand").using("btree", table.ligand.asc().nullsLast().op("text_ops")),
+	index("idx_ligand_receptor_pairs_ligand_categories").using("gin", table.ligandCategories.asc().nullsLast().op("array_ops")),
+	index("idx_ligand_receptor_pairs_ligand_genesymbol").using("btree", table.ligandGenesymbol.asc().nullsLast().op("text_ops")),
+	index("idx_ligand_receptor_pairs_receptor").using("btree", table.receptor.asc().nullsLast().op("text_ops")),
+	index("idx_ligand_receptor_pairs_receptor_categories").using("gin", table.receptorCategories.asc().nullsLast().op("array_ops")),
+	index("idx_ligand_receptor_pairs_receptor_genesymbol").using("btree", table.receptorGenesymbol.asc().nullsLast().op("text_ops")),
+]);
+
+export const proteinSummary = pgTable("protein_summary", {
+	uniprot: text().primaryKey().notNull(),
+	genesymbol: text(),
+	interactions: integer().default(0).notNull(),
+	interactionsOut: integer("interactions_out").default(0).notNull(),
+	interactionsIn: integer("interactions_in").default(0).notNull(),
+	interactionsOutByDataset: jsonb("interactions_out_by_dataset").default({}).notNull(),
+	interactionsInByDataset: jsonb("interactions_in_by_dataset").default({}).notNull(),
+	annotations: integer().default(0).notNull(),
+	annotationsByResource: jsonb("annotations_by_resource").default({}).notNull(),
+	complexes: integer().default(0).notNull(),
+	enzsub: integer().default(0).notNull(),
+	enzsubAsEnzyme: integer("enzsub_as_enzyme").default(0).notNull(),
+	enzsubAsSubstrate: integer("enzsub_as_substrate").default(0).notNull(),
+	intercell: integer().default(0).notNull(),
+	intercellCategories: text("intercell_categories").array().default(sql`'{}'`).notNull(),
+}, (table) => [
+	index("idx_protein_summary_genesymbol").using("btree", table.genesymbol.asc().nullsLast().op("text_ops")),
+]);
+
+// Facet counts for the filter sidebars, materialized views built by the loader
+export const interactionsSourceCounts = pgMaterializedView("interactions_source_counts", {
+	source: text().notNull(),
+	resourceId: text("resource_id"),
+	records: integer().notNull(),
+}).existing();
+
+export const enzSubSourceCounts = pgMaterializedView("enz_sub_source_counts", {
+	source: text().notNull(),
+	resourceId: text("resource_id"),
+	records: integer().notNull(),
+}).existing();
+
+export const complexesSourceCounts = pgMaterializedView("complexes_source_counts", {
+	source: text().notNull(),
+	resourceId: text("resource_id"),
+	records: integer().notNull(),
+}).existing();
+
+export const annotationsSourceCounts = pgMaterializedView("annotations_source_counts", {
+	source: text().notNull(),
+	resourceId: text("resource_id"),
+	records: integer().notNull(),
+}).existing();
+
+export const intercellSourceCounts = pgMaterializedView("intercell_source_counts", {
+	source: text().notNull(),
+	resourceId: text("resource_id"),
+	records: integer().notNull(),
+}).existing();
+
+export const annotationsLabelFacets = pgMaterializedView("annotations_label_facets", {
+	source: text().notNull(),
+	label: text().notNull(),
+	records: integer().notNull(),
+	proteins: integer().notNull(),
+	distinctValues: integer("distinct_values").notNull(),
+}).existing();
+
+export const intercellCategoryRollup = pgMaterializedView("intercell_category_rollup", {
+	category: text().notNull(),
+	parent: text().notNull(),
+	database: text().notNull(),
+	aspect: text().notNull(),
+	scope: text().notNull(),
+	records: integer().notNull(),
+	proteins: integer().notNull(),
+	transmitter: integer().notNull(),
+	receiver: integer().notNull(),
+	secreted: integer().notNull(),
+	plasmaMembraneTransmembrane: integer("plasma_membrane_transmembrane").notNull(),
+	plasmaMembranePeripheral: integer("plasma_membrane_peripheral").notNull(),
+}).existing();
+
+export const materializedViewRefreshes = pgTable("materialized_view_refreshes", {
+	viewName: text("view_name").primaryKey().notNull(),
+	tableName: text("table_name").notNull(),
+	mode: text().notNull(),
+	durationMs: integer("duration_ms").notNull(),
+	rowCount: integer("row_count").notNull(),
+	refreshedAt: timestamp("refreshed_at", { withTimezone: true, mode: 'string' }).defaultNow().notNull(),
+});
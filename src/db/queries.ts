@@ -1,14 +1,20 @@
 "use server"
 
 import { db } from ".";
-import { uniprotIdentifiers    } from "./drizzle/schema";
-import { sql } from "drizzle-orm";
+import {
+  uniprotIdentifiers,
+  proteinSummary,
+  enzSubSourceCounts,
+  complexesSourceCounts,
+} from "./drizzle/schema";
+import { desc, inArray, sql } from "drizzle-orm";
 
 export async function searchIdentifiers(query: string, limit: number = 1, taxonId?: string) {
   let whereCondition = sql`${uniprotIdentifiers.identifierValue} ILIKE ${query + '%'}`;
   
-  if (taxonId) {
-    whereCondition = sql`${whereCondition} AND ${uniprotIdentifiers.taxonId} = ${taxonId}`;
+  // taxon_id is the partition key, an integer comparison prunes to one organism
+  if (taxonId && /^\d+$/.test(taxonId)) {
+    whereCondition = sql`${whereCondition} AND ${uniprotIdentifiers.taxonId} = ${Number(taxonId)}`;
   }
 
   const results = await db
@@ -17,6 +23,7 @@ export async function searchIdentifiers(query: string, limit: number = 1, taxonI
       identifierValue: uniprotIdentifiers.identifierValue,
       identifierType: uniprotIdentifiers.identifierType,
       taxonId: uniprotIdentifiers.taxonId,
+      ambiguity: uniprotIdentifiers.ambiguity,
     })
     .from(uniprotIdentifiers)
     .where(whereCondition)
@@ -25,6 +32,8 @@ export async function searchIdentifiers(query: string, limit: number = 1, taxonI
         WHEN ${uniprotIdentifiers.identifierValue} ILIKE ${query} THEN 1 
         ELSE 2 
       END`,
+      // Values shared by fewer accessions are the more specific match
+      sql`${uniprotIdentifiers.ambiguity} ASC NULLS LAST`,
       uniprotIdentifiers.identifierValue
     )
     .limit(limit);
@@ -48,6 +57,30 @@ export async function searchMultipleIdentifiers(queries: string[], limit: number
   return allResults;
 }
 
+// Record counts of the proteins in all tables, precomputed by the loader, for tab badges and summary cards
+export async function getProteinSummaries(uniprotAccessions: string[]) {
+  if (uniprotAccessions.length === 0) {
+    return [];
+  }
+
+  return db
+    .select()
+    .from(proteinSummary)
+    .where(inArray(proteinSummary.uniprot, [...new Set(uniprotAccessions)]));
+}
+
+export type GetProteinSummariesResponse = Awaited<ReturnType<typeof getProteinSummaries>>;
+
+const sourceCountViews = {
+  enz_sub: enzSubSourceCounts,
+  complexes: complexesSourceCounts,
+};
+
+// Database-wide source counts for the filter sidebars, materialized views built by the loader
+export async function getSourceCounts(table: keyof typeof sourceCountViews) {
+  const view = sourceCountViews[table];
+  return db.select().from(view).orderBy(desc(view.records));
+}
 
 export async function executeReadOnlyQuery(query: string): Promise<Record<string, unknown>[]> {
   const trimmedQuery = query.trim().toUpperCase();
@@ -1,8 +1,8 @@
 "use server";
 
 import { db } from "@/db";
-import { annotations, uniprotProteins } from "@/db/drizzle/schema";
-import { eq, or, inArray } from "drizzle-orm";
+import { annotations, uniprotProteins, uniprotProteinDetails } from "@/db/drizzle/schema";
+import { and, eq, or, inArray } from "drizzle-orm";
 import { SearchIdentifiersResponse } from "@/db/queries";
 
 
@@ -68,6 +68,8 @@ export async function getProteinInformation(identifierResults: SearchIdentifiers
   // Get the first (best match) UniProt accession
   const primaryAccession = identifierResults[0].uniprotAccession;
   
+  // Names and IDs come from the narrow proteins table, the long text
+  // fields from the details table
   const result = await db
     .select({
       entry: uniprotProteins.entry,
@@ -78,25 +80,29 @@ export async function getProteinInformation(identifierResults: SearchIdentifiers
       geneNamesPrimary: uniprotProteins.geneNamesPrimary,
       geneNamesSynonym: uniprotProteins.geneNamesSynonym,
       organismId: uniprotProteins.organismId,
-      functionCc: uniprotProteins.functionCc,
-      subcellularLocation: uniprotProteins.subcellularLocation,
-      keywords: uniprotProteins.keywords,
-      proteinFamilies: uniprotProteins.proteinFamilies,
-      involvementInDisease: uniprotProteins.involvementInDisease,
-      postTranslationalModification: uniprotProteins.postTranslationalModification,
+      functionCc: uniprotProteinDetails.functionCc,
+      subcellularLocation: uniprotProteinDetails.subcellularLocation,
+      keywords: uniprotProteinDetails.keywords,
+      proteinFamilies: uniprotProteinDetails.proteinFamilies,
+      involvementInDisease: uniprotProteinDetails.involvementInDisease,
+      postTranslationalModification: uniprotProteinDetails.postTranslationalModification,
       ecNumber: uniprotProteins.ecNumber,
-      geneOntology: uniprotProteins.geneOntology,
-      transmembrane: uniprotProteins.transmembrane,
-      pathway: uniprotProteins.pathway,
-      activityRegulation: uniprotProteins.activityRegulation,
-      pubmedId: uniprotProteins.pubmedId,
-      ensembl: uniprotProteins.ensembl,
-      kegg: uniprotProteins.kegg,
-      pdb: uniprotProteins.pdb,
-      chembl: uniprotProteins.chembl,
+      geneOntology: uniprotProteinDetails.geneOntology,
+      transmembrane: uniprotProteinDetails.transmembrane,
+      pathway: uniprotProteinDetails.pathway,
+      activityRegulation: uniprotProteinDetails.activityRegulation,
+      pubmedId: uniprotProteinDetails.pubmedId,
+      ensembl: uniprotProteinDetails.ensembl,
+      kegg: uniprotProteinDetails.kegg,
+      pdb: uniprotProteinDetails.pdb,
+      chembl: uniprotProteinDetails.chembl,
       alphafolddb: uniprotProteins.alphafolddb,
     })
     .from(uniprotProteins)
+    .leftJoin(uniprotProteinDetails, and(
+      eq(uniprotProteinDetails.organismId, uniprotProteins.organismId),
+      eq(uniprotProteinDetails.proteinId, uniprotProteins.id)
+    ))
     .where(eq(uniprotProteins.entry, primaryAccession))
     .limit(1);
     
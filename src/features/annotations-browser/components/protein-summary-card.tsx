@@ -4,7 +4,7 @@ import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogTrigger } from "@/components/ui/dialog"
 import { Tooltip, TooltipContent, TooltipProvider, TooltipTrigger } from "@/components/ui/tooltip"
 import { GetProteinInformationResponse, getProteinInformation } from "@/features/annotations-browser/api/queries"
-import { SearchIdentifiersResponse } from "@/db/queries"
+import { GetProteinSummariesResponse, SearchIdentifiersResponse } from "@/db/queries"
 import { getComplexesByComponentSignature, GetComplexesByComponentSignatureResponse } from "@/features/complexes-browser/api/queries"
 import { ComplexDetails } from "@/features/complexes-browser/components/complex-details"
 import {
@@ -35,6 +35,7 @@ interface ProteinSummaryCardProps {
   onClick?: () => void
   entityType?: string
   identifier?: string
+  summary?: GetProteinSummariesResponse[number]
 }
 
 const formatUniprotText = (text: string) => {
@@ -104,7 +105,8 @@ export function ProteinSummaryCard({
   onRemove,
   onClick,
   entityType,
-  identifier
+  identifier,
+  summary
 }: ProteinSummaryCardProps) {
   const [dialogOpen, setDialogOpen] = useState(false)
   const [proteinData, setProteinData] = useState<GetProteinInformationResponse | null>(null)
@@ -230,10 +232,9 @@ export function ProteinSummaryCard({
     return `${(mass / 1000).toFixed(1)} kDa`
   }
 
-  const parseOrganism = (organismId: string | null) => {
+  const parseOrganism = (organismId: number | null) => {
     if (!organismId) return null
-    const match = organismId.match(/\d+/)
-    return match ? `Tax ID: ${match[0]}` : organismId
+    return `Tax ID: ${organismId}`
   }
 
 
@@ -335,6 +336,15 @@ export function ProteinSummaryCard({
     </Card>
   )
 
+  // Record counts across the datasets, precomputed by the loader
+  const summaryCounts = summary ? [
+    { label: 'interactions', count: summary.interactions },
+    { label: 'annotations', count: summary.annotations },
+    { label: 'intercell', count: summary.intercell },
+    { label: 'complexes', count: summary.complexes },
+    { label: 'enzyme-substrate', count: summary.enzsub },
+  ].filter(item => item.count > 0) : []
+
   // Check if identifier couldn't be resolved
   // For non-protein entities, we don't expect identifierResults, so they're not "unresolved"
   const isUnresolved = isProtein && (!identifierResults || identifierResults.length === 0)
@@ -391,7 +401,14 @@ export function ProteinSummaryCard({
               {isUnresolved ? (
                 <p>Identifier &quot;{geneSymbol}&quot; could not be resolved</p>
               ) : (
-                <p>{entityConfig.tooltipText}</p>
+                <>
+                  <p>{entityConfig.tooltipText}</p>
+                  {summaryCounts.length > 0 && (
+                    <p className="text-xs opacity-80">
+                      {summaryCounts.map(item => `${item.count.toLocaleString()} ${item.label}`).join(' · ')}
+                    </p>
+                  )}
+                </>
               )}
             </TooltipContent>
           </Tooltip>
@@ -509,6 +526,11 @@ export function ProteinSummaryCard({
                     {parseOrganism(proteinData.organismId)}
                   </span>
                 )}
+                {summaryCounts.map(item => (
+                  <span key={item.label} className="bg-muted px-1.5 py-0.5 rounded text-xs">
+                    {item.count.toLocaleString()} {item.label}
+                  </span>
+                ))}
               </div>
             </DialogHeader>
 
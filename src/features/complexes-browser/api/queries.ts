@@ -1,54 +1,32 @@
 "use server";
 
 import { db } from "@/db";
-import { complexes } from "@/db/drizzle/schema";
+import { complexes, complexMembers } from "@/db/drizzle/schema";
 import { SearchIdentifiersResponse } from "@/db/queries";
 import { ComplexEntry } from "../types";
-import { eq } from "drizzle-orm";
+import { and, eq, inArray, or, sql } from "drizzle-orm";
+import { createHash } from "crypto";
 
-// In-memory cache for fast access within the same process
-type CachedComplex = {
-  id: number;
-  name: string | null;
-  components: string | null;
-  componentsGenesymbols: string | null;
-  stoichiometry: string | null;
-  sources: string | null;
-  references: string | null;
-  identifiers: string | null;
+const complexColumns = {
+  id: complexes.id,
+  name: complexes.name,
+  components: complexes.components,
+  componentsGenesymbols: complexes.componentsGenesymbols,
+  stoichiometry: complexes.stoichiometry,
+  sources: complexes.sources,
+  references: complexes.references,
+  identifiers: complexes.identifiers,
 };
 
-const memoryCache: {
-  data: CachedComplex[] | null;
-} = {
-  data: null,
-};
-
-// Get all complexes with permanent in-memory caching
-async function getCachedAllComplexes() {
-  // Return cached data if available
-  if (memoryCache.data) {
-    return memoryCache.data;
-  }
-  
-  // Fetch fresh data from database
-  const allComplexes = await db
-    .select({
-      id: complexes.id,
-      name: complexes.name,
-      components: complexes.components,
-      componentsGenesymbols: complexes.componentsGenesymbols,
-      stoichiometry: complexes.stoichiometry,
-      sources: complexes.sources,
-      references: complexes.references,
-      identifiers: complexes.identifiers,
-    })
-    .from(complexes);
-  
-  // Update cache
-  memoryCache.data = allComplexes;
-  
-  return allComplexes;
+// Order-independent hash of a component signature, same as component_hash in db_build/complex_members.py
+function componentHash(componentSignature: string) {
+  const signature = componentSignature
+    .split("_")
+    .map(c => c.trim())
+    .filter(Boolean)
+    .sort()
+    .join("_");
+  return createHash("md5").update(signature, "utf8").digest().readBigInt64BE(0);
 }
 
 export async function getComplexesData(identifierResults: SearchIdentifiersResponse) {
@@ -65,26 +43,23 @@ export async function getComplexesData(identifierResults: SearchIdentifiersRespo
     .map(r => r.identifierValue.toUpperCase())
   )];
   
-  // Get all complexes from cache
-  const allComplexes = await getCachedAllComplexes();
-  
-  // Filter complexes that contain any of the searched proteins
-  const matchingComplexes = allComplexes.filter(complex => {
-    // Parse components and gene symbols
-    const componentsList = complex.components?.split("_").map(c => c.trim()) || [];
-    const geneSymbolsList = complex.componentsGenesymbols?.split("_").map(g => g.trim().toUpperCase()) || [];
-    
-    // Check if any searched protein is in this complex
-    const hasMatchingUniprot = uniprotAccessions.some(acc => 
-      componentsList.includes(acc)
-    );
-    
-    const hasMatchingGene = geneSymbols.some(gene => 
-      geneSymbolsList.includes(gene)
+  // Complexes with any of the searched proteins among their members
+  const memberFilters = [];
+  if (uniprotAccessions.length > 0) {
+    memberFilters.push(inArray(complexMembers.uniprot, uniprotAccessions));
+  }
+  if (geneSymbols.length > 0) {
+    memberFilters.push(inArray(sql`upper(${complexMembers.genesymbol})`, geneSymbols));
+  }
+  const matchingComplexes = await db
+    .select(complexColumns)
+    .from(complexes)
+    .where(
+      inArray(
+        complexes.id,
+        db.selectDistinct({ id: complexMembers.complexId }).from(complexMembers).where(or(...memberFilters))
+      )
     );
-    
-    return hasMatchingUniprot || hasMatchingGene;
-  });
   
   return {
     complexEntries: matchingComplexes as ComplexEntry[],
@@ -101,18 +76,13 @@ export async function getComplexesByComponentSignature(componentSignature: strin
   }
 
   const results = await db
-    .select({
-      id: complexes.id,
-      name: complexes.name,
-      components: complexes.components,
-      componentsGenesymbols: complexes.componentsGenesymbols,
-      stoichiometry: complexes.stoichiometry,
-      sources: complexes.sources,
-      references: complexes.references,
-      identifiers: complexes.identifiers,
-    })
+    .select(complexColumns)
     .from(complexes)
-    .where(eq(complexes.components, componentSignature));
+    // The hash hits the index, the signature keeps the exact match (order and all) and rules out collisions
+    .where(and(
+      eq(complexes.componentHash, componentHash(componentSignature)),
+      eq(complexes.components, componentSignature)
+    ));
 
   return results as ComplexEntry[];
 }
@@ -5,6 +5,7 @@ import { Checkbox } from "@/components/ui/checkbox"
 import { Label } from "@/components/ui/label"
 import { SidebarMenuBadge, SidebarMenu, SidebarMenuItem, SidebarMenuButton, SidebarMenuSub, SidebarMenuSubItem } from "@/components/ui/sidebar"
 import { ComplexesFilters } from "@/features/complexes-browser/types"
+import { useSourceTotals } from "@/hooks/use-source-totals"
 import { X } from "lucide-react"
 
 interface FilterCounts {
@@ -26,6 +27,7 @@ export function ComplexesFilterSidebar({
 }: ComplexesFilterSidebarProps) {
   // Calculate active filter count
   const activeFilterCount = filters.sources.length
+  const sourceTotal = useSourceTotals("complexes")
 
   // Check if there's data to filter
   const hasData = Object.values(filterCounts).some(counts => 
@@ -83,7 +85,15 @@ export function ComplexesFilterSidebar({
                       />
                       {item.value}
                     </Label>
-                    <SidebarMenuBadge className="bg-muted text-muted-foreground font-medium">{item.count}</SidebarMenuBadge>
+                    <SidebarMenuBadge
+                      className="bg-muted text-muted-foreground font-medium"
+                      title="Matching complexes / complexes in the database"
+                    >
+                      {item.count}
+                      {sourceTotal(item.value) !== undefined && (
+                        <span className="opacity-60">/{sourceTotal(item.value)!.toLocaleString()}</span>
+                      )}
+                    </SidebarMenuBadge>
                   </div>
                 </SidebarMenuSubItem>
               ))}
@@ -4,6 +4,7 @@ import { Checkbox } from "@/components/ui/checkbox"
 import { Label } from "@/components/ui/label"
 import { SidebarMenuBadge, SidebarMenu, SidebarMenuItem, SidebarMenuButton, SidebarMenuSub, SidebarMenuSubItem } from "@/components/ui/sidebar"
 import { EnzSubFilters } from "@/features/enzsub-browser/types"
+import { useSourceTotals } from "@/hooks/use-source-totals"
 import { X } from "lucide-react"
 
 interface FilterCounts {
@@ -29,6 +30,8 @@ export function EnzSubFilterSidebar({
   onClearFilters,
   isMultiQuery = false,
 }: EnzSubFilterSidebarProps) {
+  const sourceTotal = useSourceTotals("enz_sub")
+
   // Calculate active filter count
   const activeFilterCount = Object.entries(filters).reduce((count, [, value]) => {
     if (Array.isArray(value)) return count + value.length
@@ -141,7 +144,15 @@ export function EnzSubFilterSidebar({
                         />
                         {source}
                       </Label>
-                      <SidebarMenuBadge className="bg-muted text-muted-foreground font-medium">{count}</SidebarMenuBadge>
+                      <SidebarMenuBadge
+                        className="bg-muted text-muted-foreground font-medium"
+                        title="Matching records / records in the database"
+                      >
+                        {count}
+                        {sourceTotal(source) !== undefined && (
+                          <span className="opacity-60">/{sourceTotal(source)!.toLocaleString()}</span>
+                        )}
+                      </SidebarMenuBadge>
                     </div>
                   </SidebarMenuSubItem>
                 ))}
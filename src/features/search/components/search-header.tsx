@@ -4,9 +4,9 @@ import { Button } from "@/components/ui/button"
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select"
 import { Tabs, TabsList, TabsTrigger } from "@/components/ui/tabs"
 import { AutocompleteInput } from "@/components/ui/autocomplete-input"
-import { searchIdentifiers, SearchIdentifiersResponse } from "@/db/queries"
+import { GetProteinSummariesResponse, searchIdentifiers, SearchIdentifiersResponse } from "@/db/queries"
 import { Search } from "lucide-react"
-import { useState, useCallback, useEffect } from "react"
+import { useState, useCallback, useEffect, useMemo } from "react"
 import { useRouter, useSearchParams } from "next/navigation"
 import { toast } from "sonner"
 import { useSearchStore } from "@/store/search-store"
@@ -19,13 +19,22 @@ function parseQueries(queryString: string): string[] {
     .filter(q => q.length > 0)
 }
 
+const TABS = [
+  { value: "interactions", label: "Interactions" },
+  { value: "annotations", label: "Annotations" },
+  { value: "intercell", label: "Intercell" },
+  { value: "complexes", label: "Complexes" },
+  { value: "enzsub", label: "Enzyme-Substrate" },
+] as const
+
 interface SearchHeaderProps {
   identifierResults: Record<string, SearchIdentifiersResponse>
+  proteinSummaries?: GetProteinSummariesResponse
   activeTab: string
   selectedSpecies?: string
 }
 
-export function SearchHeader({ identifierResults, activeTab, selectedSpecies = "9606" }: SearchHeaderProps) {
+export function SearchHeader({ identifierResults, proteinSummaries = [], activeTab, selectedSpecies = "9606" }: SearchHeaderProps) {
   const router = useRouter()
   const searchParams = useSearchParams()
   const { addToSearchHistory } = useSearchStore()
@@ -42,6 +51,23 @@ export function SearchHeader({ identifierResults, activeTab, selectedSpecies = "
   }, [searchParams])
 
 
+  // Record counts of the searched proteins per tab, summed over the proteins
+  const tabCounts = useMemo(() => {
+    if (proteinSummaries.length === 0) return null
+    const sum = (count: (summary: GetProteinSummariesResponse[number]) => number) =>
+      proteinSummaries.reduce((total, summary) => total + count(summary), 0)
+    return {
+      interactions: sum(summary => summary.interactions),
+      annotations: sum(summary => summary.annotations),
+      intercell: sum(summary => summary.intercell),
+      complexes: sum(summary => summary.complexes),
+      enzsub: sum(summary => summary.enzsub),
+    }
+  }, [proteinSummaries])
+
+  const summaryOf = (results: SearchIdentifiersResponse | undefined) =>
+    proteinSummaries.find(summary => summary.uniprot === results?.[0]?.uniprotAccession)
+
   const handleSearch = async (searchQuery: string, displayTerm?: string) => {
     if (!searchQuery.trim()) return
 
@@ -148,6 +174,7 @@ export function SearchHeader({ identifierResults, activeTab, selectedSpecies = "
                 <ProteinSummaryCard
                   geneSymbol={singleQuery}
                   identifierResults={identifierResults[singleQuery] || []}
+                  summary={summaryOf(identifierResults[singleQuery])}
                 />
               </div>
             )
@@ -267,6 +294,7 @@ export function SearchHeader({ identifierResults, activeTab, selectedSpecies = "
                           <ProteinSummaryCard
                             geneSymbol={term}
                             identifierResults={identifierResults[term] || []}
+                            summary={summaryOf(identifierResults[term])}
                             onRemove={removeHandler}
                           />
                         </div>
@@ -317,21 +345,16 @@ export function SearchHeader({ identifierResults, activeTab, selectedSpecies = "
       <div className="relative rounded-sm overflow-x-auto h-9 bg-muted flex-shrink-0">
         <Tabs value={activeTab} onValueChange={handleTabChange}>
           <TabsList className="absolute flex flex-row justify-stretch w-full min-w-fit">
-            <TabsTrigger value="interactions" className="w-full flex-shrink-0 whitespace-nowrap">
-              Interactions
-            </TabsTrigger>
-            <TabsTrigger value="annotations" className="w-full flex-shrink-0 whitespace-nowrap">
-              Annotations
-            </TabsTrigger>
-            <TabsTrigger value="intercell" className="w-full flex-shrink-0 whitespace-nowrap">
-              Intercell
-            </TabsTrigger>
-            <TabsTrigger value="complexes" className="w-full flex-shrink-0 whitespace-nowrap">
-              Complexes
-            </TabsTrigger>
-            <TabsTrigger value="enzsub" className="w-full flex-shrink-0 whitespace-nowrap">
-              Enzyme-Substrate
-            </TabsTrigger>
+            {TABS.map(tab => (
+              <TabsTrigger key={tab.value} value={tab.value} className="w-full flex-shrink-0 whitespace-nowrap">
+                {tab.label}
+                {tabCounts && (
+                  <span className="ml-1.5 rounded-sm bg-background/60 px-1 text-xs tabular-nums text-muted-foreground">
+                    {tabCounts[tab.value].toLocaleString()}
+                  </span>
+                )}
+              </TabsTrigger>
+            ))}
           </TabsList>
         </Tabs>
       </div>
@@ -0,0 +1,25 @@
+import { useCallback, useMemo } from 'react'
+import useSWR from 'swr'
+import { getSourceCounts } from '@/db/queries'
+
+type SourceCountsTable = Parameters<typeof getSourceCounts>[0]
+
+// Database-wide record count of each source of a table, read from the loader's
+// materialized views. Lookups ignore case, as the filter services differ in it.
+export function useSourceTotals(table: SourceCountsTable) {
+  const { data } = useSWR(['source-counts', table], () => getSourceCounts(table), {
+    revalidateOnFocus: false,
+    dedupingInterval: 300000
+  })
+
+  const totals = useMemo(() => {
+    const bySource: Record<string, number> = {}
+    data?.forEach(row => {
+      const source = row.source.toLowerCase()
+      bySource[source] = (bySource[source] || 0) + row.records
+    })
+    return bySource
+  }, [data])
+
+  return useCallback((source: string): number | undefined => totals[source.toLowerCase()], [totals])
+}
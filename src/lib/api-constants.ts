@@ -3,11 +3,18 @@
 export const DATABASE_SCHEMA_DESCRIPTION = `Execute a read-only SQL query (must start with SELECT) against the database.
 Available tables and their columns:
 - annotations: id, uniprot, genesymbol, entity_type, source, label, value, record_id
-- complexes: id, name, components (array), components_genesymbols (array), stoichiometry, sources (array), references, identifiers
-- enz_sub: id, enzyme, enzyme_genesymbol, substrate, substrate_genesymbol, isoforms, residue_type, residue_offset, modification, sources (array), references, curation_effort, ncbi_tax_id
-- interactions: id, source, target, source_genesymbol, target_genesymbol, is_directed, is_stimulation, is_inhibition, consensus_direction, consensus_stimulation, consensus_inhibition, sources (array), references, omnipath, kinaseextra, ligrecextra, pathwayextra, mirnatarget, dorothea, collectri, tf_target, lncrna_mrna, tf_mirna, small_molecule, dorothea_curated, dorothea_chipseq, dorothea_tfbs, dorothea_coexp, dorothea_level (array), type, curation_effort, extra_attrs (jsonb), evidences (jsonb), ncbi_tax_id_source, entity_type_source, ncbi_tax_id_target, entity_type_target
+- complexes: id, name, components (array), components_genesymbols (array), stoichiometry, sources (array), references, identifiers, resource_ids (text[]), component_hash
+- complex_members: complex_id, position, uniprot, genesymbol, stoichiometry (one row per complex component; complex_id = complexes.id)
+- enz_sub: id, enzyme, enzyme_genesymbol, substrate, substrate_genesymbol, isoforms, residue_type, residue_offset, modification, sources (array), references, curation_effort, ncbi_tax_id, resource_ids (text[])
+- interactions: id, source, target, source_genesymbol, target_genesymbol, is_directed, is_stimulation, is_inhibition, consensus_direction, consensus_stimulation, consensus_inhibition, sources (array), references, omnipath, kinaseextra, ligrecextra, pathwayextra, mirnatarget, dorothea, collectri, tf_target, lncrna_mrna, tf_mirna, small_molecule, dorothea_curated, dorothea_chipseq, dorothea_tfbs, dorothea_coexp, dorothea_level (array), type, curation_effort, extra_attrs (jsonb), evidences (jsonb), ncbi_tax_id_source, entity_type_source, ncbi_tax_id_target, entity_type_target, resource_ids (text[])
 - intercell: id, category, parent, database, scope, aspect, source, uniprot, genesymbol, entity_type, consensus_score, transmitter, receiver, secreted, plasma_membrane_transmembrane, plasma_membrane_peripheral
+- ligand_receptor_pairs: interaction_id, ligand, ligand_genesymbol, receptor, receptor_genesymbol, ligand_categories (text[]), receptor_categories (text[]), ligand_consensus_score, receptor_consensus_score, is_directed, is_stimulation, is_inhibition, sources (array), resource_ids (text[]), curation_effort, omnipath, ligrecextra (post_translational interactions whose source is an intercell transmitter and target a receiver; interaction_id = interactions.id)
+- protein_summary: uniprot (primary key), genesymbol, interactions, interactions_out, interactions_in, interactions_out_by_dataset (jsonb), interactions_in_by_dataset (jsonb), annotations, annotations_by_resource (jsonb), complexes, enzsub, enzsub_as_enzyme, enzsub_as_substrate, intercell, intercell_categories (text[]) (record counts of each protein in the other tables)
 - uniprot_identifiers: id, uniprot_accession, identifier_type, identifier_value
+- resource_names: source_label, resource_id, description_key (maps the labels in sources/source/database to canonical resource ids; resource_ids holds the canonical ids of a record's sources)
+- interactions_source_counts, enz_sub_source_counts, complexes_source_counts, annotations_source_counts, intercell_source_counts: source, resource_id, records (records per source label; annotation records are distinct record_id)
+- annotations_label_facets: source, label, records, proteins, distinct_values (per annotation resource and label)
+- intercell_category_rollup: category, parent, database, aspect, scope, records, proteins, transmitter, receiver, secreted, plasma_membrane_transmembrane, plasma_membrane_peripheral (counts per category combination)
 
 Example queries:
 • Canonical pathways for a protein:
@@ -19,6 +26,9 @@ Example queries:
 • Find TF suppressors (inhibitors):
   SELECT * FROM interactions WHERE collectri AND (target = '<uniprot_accession>' OR target_genesymbol = '<genesymbol>') AND is_inhibition = TRUE
 
+• Receptors of a ligand:
+  SELECT receptor_genesymbol, receptor_categories, sources FROM ligand_receptor_pairs WHERE ligand_genesymbol = '<genesymbol>'
+
 • Check if protein is a transcription factor:
   SELECT * FROM annotations WHERE source = 'TFcensus' AND value = 'a' AND (uniprot = '<uniprot_accession>' OR genesymbol = '<genesymbol>')
 
@@ -1,4 +1,4 @@
-import { searchMultipleIdentifiers, SearchIdentifiersResponse } from "@/db/queries"
+import { searchIdentifiers, SearchIdentifiersResponse } from "@/db/queries"
 
 export function parseQueries(queryString: string): string[] {
   return queryString
@@ -31,20 +31,16 @@ export async function resolveIdentifiers(query: string, species: string = '9606'
     }
   })
   
-  // Handle search terms normally
-  let results: SearchIdentifiersResponse = []
-  if (searchTerms.length > 0) {
-    results = await searchMultipleIdentifiers(searchTerms, 1, species)
-  }
+  // Handle search terms normally, the best ranked match (exact and least
+  // ambiguous first) is resolved per term by the database
+  const termResults = await Promise.all(
+    searchTerms.map(protein => searchIdentifiers(protein.trim(), 1, species))
+  )
   
   // Group search results by protein
   const identifierResults: Record<string, SearchIdentifiersResponse> = {}
-  searchTerms.forEach((protein) => {
-    const proteinResults = results.filter(result => 
-      result.identifierValue.toLowerCase().includes(protein.trim().toLowerCase()) ||
-      protein.trim().toLowerCase().includes(result.identifierValue.toLowerCase())
-    )
-    identifierResults[protein] = proteinResults
+  searchTerms.forEach((protein, index) => {
+    identifierResults[protein] = termResults[index]
   })
   
   // Create direct results for entity type prefixed identifiers
@@ -54,7 +50,8 @@ export async function resolveIdentifiers(query: string, species: string = '9606'
       uniprotAccession: value, // Use the value as identifier
       identifierValue: value,
       identifierType: entityType, // Use entity type as identifier type
-      taxonId: species
+      taxonId: Number(species),
+      ambiguity: 1
     }]
   })
 